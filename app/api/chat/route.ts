@@ -2,96 +2,134 @@ import { NextRequest } from 'next/server';
 import Anthropic from '@anthropic-ai/sdk';
 import fs from 'fs';
 import path from 'path';
+import { TranscriptMentions, formatTimestamp, reviewerMoments } from '@/lib/transcriptMentions';
 
-// Build condensed knowledge base at module load time (cached)
-function buildKnowledgeBase(): string {
+// Condensed knowledge base, precompiled by scripts/build-chat-context.py
+// (chat-knowledge-base.json: text + hash + token count)
+function loadKnowledgeBase(): string {
   try {
-    const dataDir = path.join(process.cwd(), 'public', 'data');
-    const knowledge = JSON.parse(fs.readFileSync(path.join(dataDir, 'axis-knowledge.json'), 'utf8'));
-    const catalog = JSON.parse(fs.readFileSync(path.join(dataDir, 'shopify-catalog.json'), 'utf8'));
-
-    const lines: string[] = [];
-
-    // Product families
-    lines.push('=== AXIS FOILS PRODUCT FAMILIES ===');
-    const series = knowledge.series || {};
-    for (const [key, v] of Object.entries(series) as [string, any][]) {
-      lines.push(`\n${key} - ${v.tagline || ''}`);
-      lines.push(`  ${(v.character || '').substring(0, 200)}`);
-      lines.push(`  Best for: ${v.who_its_for || ''}`);
-      lines.push(`  Disciplines: ${(v.disciplines || []).join(', ')}`);
-      lines.push(`  Fuselage series: ${v.fuselage || ''}`);
-      const models = v.models || {};
-      const modelStr = Object.entries(models)
-        .slice(0, 10)
-        .map(([m, info]: [string, any]) => `${m}: ${(info.highlight || '').substring(0, 70)}`)
-        .join(' | ');
-      if (modelStr) lines.push(`  Models: ${modelStr}`);
-      const quotes = (v.expert_quotes || []).slice(0, 1);
-      if (quotes.length) {
-        lines.push(`  Expert tip (${quotes[0].expert}): "${(quotes[0].quote || '').substring(0, 180)}"`);
-      }
-    }
+    const file = path.join(process.cwd(), 'public', 'data', 'chat-knowledge-base.json');
+    return JSON.parse(fs.readFileSync(file, 'utf8')).text;
+  } catch (err) {
+    console.error('Failed to load knowledge base:', err);
+    return '(Knowledge base unavailable)';
+  }
+}
 
-    // Fuselage guide
-    lines.push('\n=== FUSELAGE GUIDE ===');
-    const fg = knowledge.fuselage_guide || {};
-    lines.push(fg.overview || '');
-    const redSizes = Object.entries(fg.red_series?.sizes || {})
-      .map(([k, v]) => `${k}: ${v}`)
-      .join(' | ');
-    lines.push(`RED Series sizes: ${redSizes}`);
-    const blkSizes = Object.entries(fg.black_series?.sizes || {})
-      .map(([k, v]) => `${k}: ${v}`)
-      .join(' | ');
-    lines.push(`BLACK Series sizes: ${blkSizes}`);
-
-    // Mast guide
-    lines.push('\n=== MAST GUIDE ===');
-    const mg = knowledge.mast_guide || {};
-    for (const [, v] of Object.entries(mg) as [string, any][]) {
-      if (!v || typeof v !== 'object') continue;
-      const warn = v.warning ? ` | ⚠️ WARNING: ${(v.warning as string).substring(0, 150)}` : '';
-      lines.push(`${v.name || ''}: ${(v.character || '').substring(0, 130)} | For: ${(v.who_its_for || '').substring(0, 80)}${warn}`);
-    }
+// Cache knowledge base at module load time
+const KNOWLEDGE_BASE = loadKnowledgeBase();
 
-    // Products (available only, skip hidden/merch)
-    lines.push('\n=== AVAILABLE PRODUCTS (with links) ===');
-    const skipTypes = new Set(['OPTIONS_HIDDEN_PRODUCT', 'OPTIONS_HIDDEN_PRODUCTS', 'Merch', 'Gear Bag', 'Board Leash', 'Strap', 'Screw', 'Mount', 'Adapter']);
-    const available = (catalog as any[]).filter((p: any) => p.available && !skipTypes.has(p.product_type || ''));
+// Prebuilt per-topic context packs (scripts/build-chat-context.py)
+interface ContextPack {
+  title: string;
+  text: string;
+  tokens: number;
+}
 
-    const byType: Record<string, any[]> = {};
-    for (const p of available) {
-      const pt = p.product_type || 'Other';
-      if (!byType[pt]) byType[pt] = [];
-      byType[pt].push(p);
-    }
+interface ContextPacks {
+  packs: Record<string, ContextPack>;
+  lookup: {
+    series_aliases: Record<string, string>;
+    foils: Record<string, string[]>;
+    keywords: Record<string, string[]>;
+  };
+}
 
-    const typeOrder = ['Foil Complete', 'Foil Wing', 'Mast', 'Fuselage', 'Foil Board', 'Other'];
-    const sortedTypes = [
-      ...typeOrder.filter(t => byType[t]),
-      ...Object.keys(byType).filter(t => !typeOrder.includes(t))
-    ];
-
-    for (const pt of sortedTypes) {
-      const prods = byType[pt] || [];
-      lines.push(`\n${pt}:`);
-      for (const p of prods) {
-        lines.push(`  ${p.title}: ${p.url}`);
-      }
-    }
+function loadContextPacks(): ContextPacks | null {
+  try {
+    const file = path.join(process.cwd(), 'public', 'data', 'chat-context.json');
+    return JSON.parse(fs.readFileSync(file, 'utf8'));
+  } catch (err) {
+    console.error('Failed to load chat context packs:', err);
+    return null;
+  }
+}
+
+const CONTEXT_PACKS = loadContextPacks();
+const CONTEXT_TOKEN_BUDGET = 4000;
 
-    return lines.join('\n');
+// Reviewer moments per foil (scripts/build-transcript-index.py)
+function loadTranscriptMentions(): TranscriptMentions | null {
+  try {
+    const file = path.join(process.cwd(), 'public', 'data', 'transcript-mentions.json');
+    return JSON.parse(fs.readFileSync(file, 'utf8'));
   } catch (err) {
-    console.error('Failed to build knowledge base:', err);
-    return '(Knowledge base unavailable)';
+    console.error('Failed to load transcript mentions:', err);
+    return null;
   }
 }
 
-// Cache knowledge base at module load time
-const KNOWLEDGE_BASE = buildKnowledgeBase();
+const TRANSCRIPT_MENTIONS = loadTranscriptMentions();
+const MOMENTS_PER_FOIL = 2;
+
+// "Fireball 1750", "FB1750", "ART v2 999", "PNG 1300 v2", "Spit fire 960"
+const FOIL_MENTION_RE = /\b([a-z]+(?:\s*-?\s*(?:pro|fire))?)\s*-?\s*(v\s*[12])?\s*(\d{3,4})\s*(v\s*[12])?/g;
+
+// Assemble a small context from the packs matching the recent user messages.
+// Returns null when nothing matches, so the caller falls back to the full knowledge base.
+function selectContext(messages: { role: string; content: string }[]): string | null {
+  if (!CONTEXT_PACKS) return null;
+  const { packs, lookup } = CONTEXT_PACKS;
+  const text = messages
+    .filter(m => m.role === 'user')
+    .slice(-3)
+    .map(m => m.content)
+    .join('\n')
+    .toLowerCase();
+
+  const selected: string[] = [];
+  const mentionedFoils: string[] = [];
+  const add = (ids?: string[]) => {
+    for (const id of ids || []) {
+      if (packs[id] && !selected.includes(id)) selected.push(id);
+    }
+  };
+
+  FOIL_MENTION_RE.lastIndex = 0;
+  let m: RegExpExecArray | null;
+  while ((m = FOIL_MENTION_RE.exec(text)) !== null) {
+    const slug = lookup.series_aliases[m[1].replace(/[\s-]/g, '')];
+    if (!slug) continue;
+    const v2 = (m[2] || m[4] || '').replace(/\s/g, '') === 'v2';
+    const candidates = v2
+      ? [`${slug}-v2-${m[3]}`, `${slug}-${m[3]}`]
+      : [`${slug}-${m[3]}`, `${slug}-v2-${m[3]}`];
+    const foilId = candidates.find(c => lookup.foils[c]);
+    if (foilId) {
+      add(lookup.foils[foilId]);
+      if (!mentionedFoils.includes(foilId)) mentionedFoils.push(foilId);
+    }
+  }
+
+  const words = text.match(/[a-z0-9]+/g) || [];
+  for (let i = 0; i < words.length; i++) {
+    add(lookup.keywords[words[i]]);
+    if (i + 1 < words.length) add(lookup.keywords[words[i] + words[i + 1]]);
+  }
+  if (selected.length === 0) return null;
+
+  const core = packs['core'];
+  const parts = core ? [core.text] : [];
+  let used = core ? core.tokens : 0;
+  for (const id of selected) {
+    const pack = packs[id];
+    if (used + pack.tokens > CONTEXT_TOKEN_BUDGET) continue;
+    parts.push(pack.text);
+    used += pack.tokens;
+  }
+
+  const moments = TRANSCRIPT_MENTIONS
+    ? mentionedFoils.flatMap(id => reviewerMoments(TRANSCRIPT_MENTIONS, id, MOMENTS_PER_FOIL)).map(m =>
+        `- ${m.title}${m.t !== null ? ` @ ${formatTimestamp(m.t)}` : ''}${m.url ? ` (${m.url})` : ''}: "${m.snippet}"`)
+    : [];
+  if (moments.length > 0) {
+    const block = ['=== REVIEWER MOMENTS (YouTube transcripts) ===', ...moments].join('\n');
+    if (used + Math.ceil(block.length / 4) <= CONTEXT_TOKEN_BUDGET) parts.push(block);
+  }
+  return parts.join('\n\n');
+}
 
-const SYSTEM_PROMPT = `You are the AXIS Foiling Guide — a knowledgeable, friendly expert assistant for AXIS Foils (axisfoils.com). You help riders find the perfect foil setup for their riding style, skill level, and conditions.
+const SYSTEM_PROMPT_BASE = `You are the AXIS Foiling Guide — a knowledgeable, friendly expert assistant for AXIS Foils (axisfoils.com). You help riders find the perfect foil setup for their riding style, skill level, and conditions.
 
 ## YOUR IDENTITY
 - Name: AXIS Foiling Guide
@@ -145,7 +183,7 @@ const SYSTEM_PROMPT = `You are the AXIS Foiling Guide — a knowledgeable, frien
 4. Tempo / ART Pro (advanced racing)
 
 ## KNOWLEDGE BASE
-${KNOWLEDGE_BASE}`;
+`;
 
 // Simple in-memory rate limiting (per deployment instance)
 const requestCounts = new Map<string, { count: number; resetAt: number }>();
@@ -217,7 +255,7 @@ export async function POST(request: NextRequest) {
     const stream = await client.messages.stream({
       model: 'claude-sonnet-4-20250514',
       max_tokens: 1024,
-      system: SYSTEM_PROMPT,
+      system: SYSTEM_PROMPT_BASE + (selectContext(validMessages) ?? KNOWLEDGE_BASE),
       messages: validMessages,
     });
 
@@ -18,7 +18,7 @@ export default function BrowsePage() {
   const [allData, setAllData] = useState<any>({});
 
   useEffect(() => {
-    fetch('/data/axis-products.json')
+    fetch('/data/pages/browse/axis-products.json')
       .then(res => res.json())
       .then(data => {
         const foils = data.collections['front-wings'].products;
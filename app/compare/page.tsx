@@ -3,6 +3,8 @@
 import { useState, useEffect } from 'react';
 import Header from '../components/Header';
 import RadarChart from '../components/RadarChart';
+import { TranscriptMentions, formatTimestamp, reviewerMoments } from '@/lib/transcriptMentions';
+import { FeedbackPost, FeedbackShardManifest, loadFeedbackShard, loadShardManifest } from '@/lib/feedbackShards';
 
 interface Product {
   id: number;
@@ -23,13 +25,6 @@ interface Product {
   };
 }
 
-interface FBPost {
-  text: string;
-  foils_mentioned: string[];
-  rider_weight: number | null;
-  use_case: string | null;
-}
-
 // Generate AI-style analysis for a foil
 function generateAnalysis(foil: Product, isReference: boolean): string {
   const series = foil.specs.series || '';
@@ -58,7 +53,7 @@ function generateAnalysis(foil: Product, isReference: boolean): string {
 }
 
 // Match FB feedback to a foil
-function matchFBFeedback(fbData: FBPost[], foilName: string): string[] {
+function matchFBFeedback(fbData: FeedbackPost[], foilName: string): string[] {
   const feedback: string[] = [];
   const normalized = foilName.toUpperCase().replace(/\s+/g, ' ');
   const areaMatch = foilName.match(/\d{3,4}/);
@@ -154,15 +149,17 @@ function matchYvonFeedback(yvonData: YvonPost[], foilName: string): string[] {
 
 export default function ComparePage() {
   const [products, setProducts] = useState<Product[]>([]);
-  const [fbData, setFbData] = useState<FBPost[]>([]);
+  const [shardManifest, setShardManifest] = useState<FeedbackShardManifest | null>(null);
+  const [fbShards, setFbShards] = useState<Record<number, FeedbackPost[]>>({});
   const [yvonData, setYvonData] = useState<YvonPost[]>([]);
   const [evanSpecs, setEvanSpecs] = useState<EvanSpec[]>([]);
+  const [mentions, setMentions] = useState<TranscriptMentions | null>(null);
   const [primaryFoil, setPrimaryFoil] = useState<Product | null>(null);
   const [referenceFoil, setReferenceFoil] = useState<Product | null>(null);
   const [showComparison, setShowComparison] = useState(false);
 
   useEffect(() => {
-    fetch('/data/axis-products.json')
+    fetch('/data/pages/compare/axis-products.json')
       .then(r => r.json())
       .then(data => {
         const frontWings = data.collections['front-wings'].products;
@@ -170,22 +167,37 @@ export default function ComparePage() {
       })
       .catch(err => console.error('Failed to load products:', err));
 
-    fetch('/data/facebook-riders-feedback.json')
-      .then(r => r.json())
-      .then(data => setFbData(data.posts || []))
-      .catch(err => console.warn('FB data not available:', err));
+    loadShardManifest()
+      .then(setShardManifest)
+      .catch(err => console.warn('FB feedback shards not available:', err));
 
-    fetch('/data/yvon-feedback.json')
+    fetch('/data/pages/compare/yvon-feedback.json')
       .then(r => r.json())
       .then(data => setYvonData(data.posts || []))
       .catch(err => console.warn('Yvon data not available:', err));
 
-    fetch('/data/evan-tech-specs.json')
+    fetch('/data/pages/compare/evan-tech-specs.json')
       .then(r => r.json())
       .then(data => setEvanSpecs(data.front_wings || []))
       .catch(err => console.warn('Evan specs not available:', err));
+
+    fetch('/data/transcript-mentions.json')
+      .then(r => r.json())
+      .then(data => setMentions(data))
+      .catch(err => console.warn('Transcript mentions not available:', err));
   }, []);
 
+  // Fetch community feedback only for the two selected foils, once the manifest
+  // can map them to shards (before that every foil would cache as empty)
+  useEffect(() => {
+    if (!shardManifest) return;
+    for (const foil of [primaryFoil, referenceFoil]) {
+      if (!foil || foil.id in fbShards) continue;
+      loadFeedbackShard(shardManifest, foil.id)
+        .then(posts => setFbShards(prev => ({ ...prev, [foil.id]: posts })));
+    }
+  }, [shardManifest, primaryFoil, referenceFoil]);
+
   // Look up Evan's measured specs for a foil
   const getEvanSpec = (foil: Product): EvanSpec | null => {
     if (!evanSpecs.length) return null;
@@ -200,6 +212,12 @@ export default function ComparePage() {
     }) || evanSpecs.find(s => s.span_mm === area) || null;
   };
 
+  // Timestamped YouTube reviewer moments for a foil
+  const getMoments = (foil: Product) => {
+    const foilId = mentions?.products[String(foil.id)];
+    return mentions && foilId ? reviewerMoments(mentions, foilId, 2) : [];
+  };
+
   const handleCompare = () => {
     if (primaryFoil && referenceFoil) {
       setShowComparison(true);
@@ -487,8 +505,9 @@ export default function ComparePage() {
                 {(() => {
                   const foilName = `${primaryFoil.specs.series} ${primaryFoil.specs.modelNumber || primaryFoil.specs.area}`;
                   const expertFb = matchYvonFeedback(yvonData, foilName);
-                  const communityFb = matchFBFeedback(fbData, foilName);
-                  if (expertFb.length === 0 && communityFb.length === 0) return null;
+                  const communityFb = matchFBFeedback(fbShards[primaryFoil.id] || [], foilName);
+                  const moments = getMoments(primaryFoil);
+                  if (expertFb.length === 0 && communityFb.length === 0 && moments.length === 0) return null;
                   return (
                     <div className="mt-4 pt-4 border-t border-gray-100">
                       {expertFb.length > 0 && (
@@ -515,6 +534,21 @@ export default function ComparePage() {
                           ))}
                         </>
                       )}
+                      {moments.length > 0 && (
+                        <>
+                          <h5 className={`text-xs font-bold text-blue-600 uppercase tracking-wider mb-2 ${expertFb.length > 0 || communityFb.length > 0 ? 'mt-3' : ''}`}>
+                            ▶️ Reviewer Moments
+                          </h5>
+                          {moments.map((m, i) => (
+                            <p key={i} className="text-sm text-gray-600 mb-2">
+                              <a href={m.url || undefined} target="_blank" rel="noopener noreferrer" className="font-semibold text-gray-800 hover:underline">
+                                {m.title}{m.t !== null ? ` @ ${formatTimestamp(m.t)}` : ''}
+                              </a>
+                              {' '}— <span className="italic">{m.snippet}</span>
+                            </p>
+                          ))}
+                        </>
+                      )}
                     </div>
                   );
                 })()}
@@ -536,8 +570,9 @@ export default function ComparePage() {
                 {(() => {
                   const foilName = `${referenceFoil.specs.series} ${referenceFoil.specs.modelNumber || referenceFoil.specs.area}`;
                   const expertFb = matchYvonFeedback(yvonData, foilName);
-                  const communityFb = matchFBFeedback(fbData, foilName);
-                  if (expertFb.length === 0 && communityFb.length === 0) return null;
+                  const communityFb = matchFBFeedback(fbShards[referenceFoil.id] || [], foilName);
+                  const moments = getMoments(referenceFoil);
+                  if (expertFb.length === 0 && communityFb.length === 0 && moments.length === 0) return null;
                   return (
                     <div className="mt-4 pt-4 border-t border-gray-100">
                       {expertFb.length > 0 && (
@@ -564,6 +599,21 @@ export default function ComparePage() {
                           ))}
                         </>
                       )}
+                      {moments.length > 0 && (
+                        <>
+                          <h5 className={`text-xs font-bold text-orange-500 uppercase tracking-wider mb-2 ${expertFb.length > 0 || communityFb.length > 0 ? 'mt-3' : ''}`}>
+                            ▶️ Reviewer Moments
+                          </h5>
+                          {moments.map((m, i) => (
+                            <p key={i} className="text-sm text-gray-600 mb-2">
+                              <a href={m.url || undefined} target="_blank" rel="noopener noreferrer" className="font-semibold text-gray-800 hover:underline">
+                                {m.title}{m.t !== null ? ` @ ${formatTimestamp(m.t)}` : ''}
+                              </a>
+                              {' '}— <span className="italic">{m.snippet}</span>
+                            </p>
+                          ))}
+                        </>
+                      )}
                     </div>
                   );
                 })()}
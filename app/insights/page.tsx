@@ -2,6 +2,7 @@
 
 import { useEffect, useState } from 'react';
 import Header from '../components/Header';
+import { SurveyCube, breakdown } from '@/lib/surveyCube';
 
 interface KnowledgeData {
   series: Record<string, SeriesKnowledge>;
@@ -81,7 +82,23 @@ const SERIES_COLORS: Record<string, { bg: string; border: string; badge: string;
   Surge: { bg: 'bg-teal-50', border: 'border-teal-200', badge: 'bg-teal-100 text-teal-800', text: 'text-teal-700' },
 };
 
-type Tab = 'series' | 'progression' | 'setups' | 'pitfalls' | 'experts' | 'survey' | 'youtube';
+type Tab = 'series' | 'progression' | 'setups' | 'pitfalls' | 'experts' | 'survey' | 'explore' | 'youtube';
+
+// Setup Explorer: cube dims to filter on, and dims to break down by
+const CUBE_FILTERS: { dim: string; label: string }[] = [
+  { dim: 'discipline', label: 'All Disciplines' },
+  { dim: 'weight', label: 'All Weights' },
+  { dim: 'experience', label: 'All Experience' },
+  { dim: 'age', label: 'All Ages' },
+];
+const CUBE_GROUPS: { dim: string; label: string }[] = [
+  { dim: 'front_wing', label: 'Front Wing' },
+  { dim: 'rear_wing', label: 'Rear Wing' },
+  { dim: 'mast', label: 'Mast' },
+  { dim: 'discipline', label: 'Discipline' },
+  { dim: 'weight', label: 'Rider Weight' },
+  { dim: 'experience', label: 'Experience' },
+];
 
 interface SurveyData {
   meta: { source: string; title: string; total_responses: number; date_captured: string; platform: string };
@@ -95,6 +112,14 @@ interface SurveyData {
   product_demand_signals: string[];
 }
 
+interface SetupsSummary {
+  setup_count: number;
+  rider_count: number;
+  setups_by_discipline: Record<string, number>;
+  top_front_wings: { id: string; label: string; count: number }[];
+  top_front_wings_by_discipline: Record<string, { id: string; label: string; count: number }[]>;
+}
+
 interface YouTubePost {
   id: string;
   source: string;
@@ -131,6 +156,11 @@ export default function InsightsPage() {
   const [knowledge, setKnowledge] = useState<KnowledgeData | null>(null);
   const [survey, setSurvey] = useState<SurveyData | null>(null);
   const [youtube, setYoutube] = useState<YouTubeData | null>(null);
+  const [cube, setCube] = useState<SurveyCube | null>(null);
+  const [setupsSummary, setSetupsSummary] = useState<SetupsSummary | null>(null);
+  const [setupsDiscipline, setSetupsDiscipline] = useState<string>('all');
+  const [cubeFilters, setCubeFilters] = useState<Record<string, string>>({});
+  const [cubeGroup, setCubeGroup] = useState<string>('front_wing');
   const [activeTab, setActiveTab] = useState<Tab>('series');
   const [activeSeries, setActiveSeries] = useState<string>('Surge');
   const [ytSeriesFilter, setYtSeriesFilter] = useState<string>('all');
@@ -149,6 +179,14 @@ export default function InsightsPage() {
       .then(r => r.json())
       .then(setYoutube)
       .catch(console.error);
+    fetch('/data/survey-cube.json')
+      .then(r => r.json())
+      .then(setCube)
+      .catch(console.error);
+    fetch('/data/community-setups-summary.json')
+      .then(r => r.json())
+      .then(setSetupsSummary)
+      .catch(console.error);
   }, []);
 
   if (!knowledge) {
@@ -172,6 +210,7 @@ export default function InsightsPage() {
     { key: 'pitfalls', label: 'Common Pitfalls', icon: '⚠️' },
     { key: 'experts', label: 'Expert Insights', icon: '🎯' },
     { key: 'survey', label: 'Community Survey', icon: '📊' },
+    { key: 'explore', label: 'Setup Explorer', icon: '🧊' },
     { key: 'youtube', label: 'YouTube Reviews', icon: '🎬' },
   ];
 
@@ -474,7 +513,48 @@ export default function InsightsPage() {
         {activeTab === 'setups' && (
           <div className="space-y-6">
             <p className="text-gray-600">Complete setup recommendations from the AXIS community and experts.</p>
-            
+
+            {/* What riders actually run, from the community setups table */}
+            {setupsSummary && (() => {
+              const wings = setupsDiscipline === 'all'
+                ? setupsSummary.top_front_wings
+                : setupsSummary.top_front_wings_by_discipline[setupsDiscipline] || [];
+              const max = Math.max(1, ...wings.map(w => w.count));
+              return (
+                <div className="bg-white border border-gray-200 rounded-xl p-6">
+                  <div className="flex flex-wrap items-center justify-between gap-3 mb-4">
+                    <div>
+                      <h3 className="font-black text-gray-900 text-xl">🏄 What Riders Actually Run</h3>
+                      <p className="text-gray-500 text-sm">
+                        Most posted front wings across {setupsSummary.setup_count} shared setups from {setupsSummary.rider_count} riders
+                      </p>
+                    </div>
+                    <select
+                      value={setupsDiscipline}
+                      onChange={e => setSetupsDiscipline(e.target.value)}
+                      className="px-3 py-2 rounded-lg border border-gray-200 bg-white text-sm text-gray-700"
+                    >
+                      <option value="all">All Disciplines</option>
+                      {Object.entries(setupsSummary.setups_by_discipline).map(([d, n]) => (
+                        <option key={d} value={d}>{d.replace(/_/g, ' ')} ({n})</option>
+                      ))}
+                    </select>
+                  </div>
+                  {wings.map(w => (
+                    <div key={w.id} className="mb-3">
+                      <div className="flex justify-between text-sm mb-1">
+                        <span className="text-gray-600">{w.label}</span>
+                        <span className="font-semibold text-gray-800">{w.count}</span>
+                      </div>
+                      <div className="h-3 bg-gray-100 rounded-full overflow-hidden">
+                        <div className="h-full bg-blue-500 rounded-full transition-all" style={{ width: `${Math.round((w.count / max) * 100)}%` }} />
+                      </div>
+                    </div>
+                  ))}
+                </div>
+              );
+            })()}
+
             <div className="grid sm:grid-cols-2 gap-6">
               {Object.entries(knowledge.setup_guides).map(([key, guide]) => (
                 <div key={key} className="bg-white border border-gray-200 rounded-xl p-6">
@@ -900,6 +980,86 @@ export default function InsightsPage() {
             </div>
           </div>
         )}
+        {/* ─── TAB: Setup Explorer ──────────────────────────────── */}
+        {activeTab === 'explore' && cube && (() => {
+          const where = Object.fromEntries(
+            Object.entries(cubeFilters).filter(([, v]) => v !== 'all').map(([dim, v]) => [dim, [v]])
+          );
+          const rows = breakdown(cube, cubeGroup, where);
+          const total = rows.reduce((n, [, count]) => n + count, 0);
+          const groupLabel = CUBE_GROUPS.find(g => g.dim === cubeGroup)?.label;
+          // Only offer values some setup has; a dim nobody answered (no age in the
+          // setups table) gets no select at all
+          const filterOptions = CUBE_FILTERS.map(f => {
+            const present = new Set(breakdown(cube, f.dim).map(([value]) => value));
+            const values = cube.dims.find(d => d.name === f.dim)?.values.filter(v => present.has(v)) ?? [];
+            return { ...f, values };
+          }).filter(f => f.values.some(v => v !== 'Not answered'));
+          return (
+            <div className="space-y-6">
+              <div className="rounded-2xl bg-gray-900 text-white p-6">
+                <div className="flex items-center gap-3">
+                  <span className="text-3xl">🧊</span>
+                  <div>
+                    <h2 className="text-2xl font-bold">Setup Explorer</h2>
+                    <p className="text-gray-400 text-sm">
+                      Filter {cube.meta.facts} survey setups by discipline and rider, then break them down by gear. A setup listing several disciplines or wings counts once for each.
+                    </p>
+                  </div>
+                </div>
+              </div>
+
+              {/* Filters */}
+              <div className="flex flex-wrap gap-3">
+                {filterOptions.map(({ dim, label, values }) => (
+                  <select
+                    key={dim}
+                    value={cubeFilters[dim] || 'all'}
+                    onChange={e => setCubeFilters({ ...cubeFilters, [dim]: e.target.value })}
+                    className="px-3 py-2 rounded-lg border border-gray-200 bg-white text-sm text-gray-700"
+                  >
+                    <option value="all">{label}</option>
+                    {values.map(v => (
+                      <option key={v} value={v}>{v}</option>
+                    ))}
+                  </select>
+                ))}
+                <select
+                  value={cubeGroup}
+                  onChange={e => setCubeGroup(e.target.value)}
+                  className="px-3 py-2 rounded-lg border border-gray-200 bg-white text-sm font-semibold text-gray-900"
+                >
+                  {CUBE_GROUPS.map(g => (
+                    <option key={g.dim} value={g.dim}>By {g.label}</option>
+                  ))}
+                </select>
+              </div>
+
+              <div className="rounded-2xl bg-white border border-gray-100 p-6 shadow-sm">
+                <h3 className="text-lg font-bold text-gray-900 mb-4">
+                  {groupLabel} <span className="text-gray-400 font-normal text-sm">({total} setups)</span>
+                </h3>
+                {rows.length === 0 && (
+                  <p className="text-gray-500 text-sm">No survey setups match these filters.</p>
+                )}
+                {rows.map(([value, count]) => {
+                  const pct = Math.round((count / total) * 100);
+                  return (
+                    <div key={value} className="mb-3">
+                      <div className="flex justify-between text-sm mb-1">
+                        <span className={value === 'Not answered' ? 'text-gray-400' : 'text-gray-600'}>{value}</span>
+                        <span className="font-semibold text-gray-800">{count} <span className="text-gray-400 font-normal">({pct}%)</span></span>
+                      </div>
+                      <div className="h-3 bg-gray-100 rounded-full overflow-hidden">
+                        <div className="h-full bg-blue-500 rounded-full transition-all" style={{ width: `${pct}%` }} />
+                      </div>
+                    </div>
+                  );
+                })}
+              </div>
+            </div>
+          );
+        })()}
         {/* ─── TAB: YouTube Reviews ─────────────────────────────── */}
         {activeTab === 'youtube' && youtube && (
           <div className="space-y-8">
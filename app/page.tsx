@@ -46,7 +46,7 @@ export default function Home() {
 
   useEffect(() => {
     // Load the data
-    fetch('/data/axis-products.json')
+    fetch('/data/pages/home/axis-products.json')
       .then(res => res.json())
       .then(setData)
       .catch(console.error);
@@ -43,16 +43,22 @@ interface CompatibilityData {
 }
 
 interface CommunityStats {
-  meta: { respondents: number; };
+  meta: { total_responses: number; respondents?: number; };
   disciplines: Record<string, {
     total_setups: number;
     top_front_wings: { wing: string; count: number }[];
     top_rear_wings: { wing: string; count: number }[];
-    top_fuselages: { fuse: string; count: number }[];
-    by_weight: Record<string, { count: number; top_wings: { wing: string; count: number }[] }>;
+    top_fuselages: { wing: string; count: number }[];
+    by_weight?: Record<string, { count: number; top_wings: { wing: string; count: number }[] }>;
   }>;
 }
 
+// Recommender discipline -> survey discipline in community-stats.json
+const COMMUNITY_DISCIPLINES: Record<string, string> = {
+  downwind: 'Downwind SUP Foiling', wing: 'Wing Foiling', prone: 'Prone Foiling (Surf)',
+  kite: 'Kite Foiling', tow: 'Tow-In Foiling', allround: 'Wing Foiling',
+};
+
 type Discipline = 'downwind' | 'wing' | 'prone' | 'kite' | 'tow' | 'allround';
 
 // Discipline-specific score weights
@@ -583,11 +589,7 @@ export default function RecommendPage() {
                         </span>
                         {(() => {
                           if (!communityData) return null;
-                          const discMap: Record<string, string> = {
-                            downwind: 'downwind', wing: 'wing', prone: 'prone',
-                            kite: 'kite', tow: 'tow', allround: 'wing',
-                          };
-                          const cDisc = communityData.disciplines[discMap[discipline]];
+                          const cDisc = communityData.disciplines[COMMUNITY_DISCIPLINES[discipline]];
                           if (!cDisc) return null;
                           const topWings = cDisc.top_front_wings.slice(0, 3).map(w => w.wing.toLowerCase());
                           const wingName = rec.wing.displayName.toLowerCase();
@@ -792,11 +794,7 @@ export default function RecommendPage() {
 
         {/* Community Insights */}
         {communityData && (() => {
-          const discMap: Record<string, string> = {
-            downwind: 'downwind', wing: 'wing', prone: 'prone',
-            kite: 'kite', tow: 'tow', allround: 'wing',
-          };
-          const cDisc = communityData.disciplines[discMap[discipline]];
+          const cDisc = communityData.disciplines[COMMUNITY_DISCIPLINES[discipline]];
           if (!cDisc) return null;
 
           // Find weight bracket for community data
@@ -809,7 +807,7 @@ export default function RecommendPage() {
             return '>105kg';
           };
           const weightKey = getWeightKey(effectiveWeightKg);
-          const weightData = cDisc.by_weight[weightKey];
+          const weightData = cDisc.by_weight?.[weightKey];
 
           return (
             <div className="mt-8 bg-gradient-to-r from-green-950/30 to-gray-900 rounded-xl border border-green-800/30 p-6">
@@ -875,7 +873,7 @@ export default function RecommendPage() {
               </div>
 
               <p className="text-xs text-gray-600 mt-4">
-                Based on {communityData.meta.respondents} anonymous survey responses from AXIS Foil Riders Facebook group
+                Based on {communityData.meta.respondents ?? communityData.meta.total_responses} anonymous survey responses from AXIS Foil Riders Facebook group
               </p>
             </div>
           );
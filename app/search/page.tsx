@@ -78,7 +78,7 @@ export default function SearchPage() {
   });
 
   useEffect(() => {
-    fetch('/data/axis-products.json')
+    fetch('/data/pages/search/axis-products.json')
       .then(res => res.json())
       .then(data => {
         const foils = data.collections['front-wings'].products;
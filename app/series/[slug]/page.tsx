@@ -29,7 +29,7 @@ export default function SeriesPage() {
   const [seriesName, setSeriesName] = useState('');
 
   useEffect(() => {
-    fetch('/data/axis-products.json')
+    fetch('/data/pages/series/axis-products.json')
       .then(res => res.json())
       .then(data => {
         const allFoils = data.collections['front-wings'].products;
@@ -2,6 +2,7 @@
 
 import { useEffect, useState } from 'react';
 import Header from '../components/Header';
+import { PriceIndex, placePrice, priceBand } from '@/lib/priceIndex';
 
 // ─── Types ──────────────────────────────────────────────────────
 type ComponentType = 'wing' | 'mast' | 'setup';
@@ -16,17 +17,6 @@ interface CheckItem {
   result: 'pass' | 'fail' | 'unchecked';
 }
 
-interface Product {
-  title: string;
-  price: string;
-  specs: {
-    series?: string;
-    modelNumber?: number;
-    product_type?: string;
-    area?: number;
-  };
-}
-
 interface ReportForm {
   platform: string;
   url: string;
@@ -333,7 +323,7 @@ export default function VerifyPage() {
   const [checks, setChecks] = useState<CheckItem[]>(
     CHECKLIST_ITEMS.map(item => ({ ...item, result: 'unchecked' as const }))
   );
-  const [products, setProducts] = useState<Product[]>([]);
+  const [priceIndex, setPriceIndex] = useState<PriceIndex | null>(null);
   const [priceInput, setPriceInput] = useState('');
   const [selectedProduct, setSelectedProduct] = useState('');
   const [reportForm, setReportForm] = useState<ReportForm>({
@@ -347,18 +337,9 @@ export default function VerifyPage() {
   const [reportSubmitted, setReportSubmitted] = useState(false);
 
   useEffect(() => {
-    fetch('/data/axis-products.json')
+    fetch('/data/price-index.json')
       .then(res => res.json())
-      .then(data => {
-        const allProducts: Product[] = [];
-        for (const [, collection] of Object.entries(data.collections)) {
-          const col = collection as { products: Product[] };
-          if (col.products) {
-            allProducts.push(...col.products);
-          }
-        }
-        setProducts(allProducts);
-      })
+      .then(setPriceIndex)
       .catch(console.error);
   }, []);
 
@@ -401,38 +382,40 @@ export default function VerifyPage() {
 
   // ─── Price Check Logic ──────────────────────────────────────
   const getSelectedProductData = () => {
-    return products.find(p => p.title === selectedProduct);
+    return priceIndex?.products.find(p => p.handle === selectedProduct);
   };
 
   const getPriceAnalysis = () => {
     const product = getSelectedProductData();
-    if (!product || !priceInput) return null;
+    if (!priceIndex || !product || !priceInput) return null;
 
-    const retailPrice = parseFloat(product.price);
+    const retailPrice = product.price / 100;
     const askingPrice = parseFloat(priceInput);
-    if (isNaN(retailPrice) || isNaN(askingPrice) || retailPrice === 0) return null;
+    if (isNaN(askingPrice)) return null;
 
     const percentOfRetail = (askingPrice / retailPrice) * 100;
     const discount = 100 - percentOfRetail;
+    const risk = priceBand(priceIndex, percentOfRetail) as 'safe' | 'fair' | 'suspicious' | 'scam';
+    const placement = placePrice(priceIndex, product, Math.round(askingPrice * 100));
+    const [retailLow, retailHigh] = product.history;
 
-    let risk: 'safe' | 'fair' | 'suspicious' | 'scam';
     let explanation: string;
 
-    if (percentOfRetail >= 75) {
-      risk = 'safe';
+    if (risk === 'safe') {
       explanation = `At ${percentOfRetail.toFixed(0)}% of retail ($${retailPrice}), this is a fair used market price. Normal for well-maintained secondhand gear.`;
-    } else if (percentOfRetail >= 55) {
-      risk = 'fair';
+    } else if (risk === 'fair') {
       explanation = `At ${percentOfRetail.toFixed(0)}% of retail ($${retailPrice}), this is a good deal but within normal range for older or well-used gear. Check condition carefully.`;
-    } else if (percentOfRetail >= 40) {
-      risk = 'suspicious';
+    } else if (risk === 'suspicious') {
       explanation = `At ${percentOfRetail.toFixed(0)}% of retail ($${retailPrice}), this is ${discount.toFixed(0)}% below retail — significantly cheaper than typical used prices. Request serial number and close-up photos.`;
     } else {
-      risk = 'scam';
       explanation = `At ${percentOfRetail.toFixed(0)}% of retail ($${retailPrice}), this is ${discount.toFixed(0)}% off — far below any realistic used price. This is highly likely a counterfeit. Do NOT buy without in-person verification.`;
     }
 
-    return { retailPrice, askingPrice, percentOfRetail, discount, risk, explanation };
+    const retailRange = retailLow !== retailHigh
+      ? `$${(retailLow / 100).toFixed(0)}–$${(retailHigh / 100).toFixed(0)}`
+      : null;
+
+    return { retailPrice, askingPrice, percentOfRetail, discount, risk, explanation, placement, retailRange };
   };
 
   const priceAnalysis = getPriceAnalysis();
@@ -694,14 +677,11 @@ export default function VerifyPage() {
                     className="w-full border border-gray-300 rounded-lg px-4 py-3 text-gray-900 focus:ring-2 focus:ring-red-500 focus:border-red-500"
                   >
                     <option value="">Choose a product...</option>
-                    {products
-                      .filter(p => parseFloat(p.price) > 0)
-                      .sort((a, b) => a.title.localeCompare(b.title))
-                      .map(p => (
-                        <option key={p.title} value={p.title}>
-                          {p.title} — ${parseFloat(p.price).toFixed(0)} retail
-                        </option>
-                      ))}
+                    {priceIndex?.products.map(p => (
+                      <option key={p.handle} value={p.handle}>
+                        {p.title} — ${(p.price / 100).toFixed(0)} retail
+                      </option>
+                    ))}
                   </select>
                 </div>
                 <div>
@@ -753,6 +733,15 @@ export default function VerifyPage() {
 
                   <p className="text-gray-700">{priceAnalysis.explanation}</p>
 
+                  {priceAnalysis.placement && (
+                    <p className="text-sm text-gray-500 mt-2">
+                      Cheaper than {priceAnalysis.placement.cheaperThan} of {priceAnalysis.placement.n} new {priceAnalysis.placement.group} at
+                      retail (${(priceAnalysis.placement.min / 100).toFixed(0)}–${(priceAnalysis.placement.max / 100).toFixed(0)},
+                      median ${(priceAnalysis.placement.median / 100).toFixed(0)}).
+                      {priceAnalysis.retailRange && ` Official price for this product has ranged ${priceAnalysis.retailRange}.`}
+                    </p>
+                  )}
+
                   {priceAnalysis.risk === 'scam' && (
                     <div className="mt-4 bg-red-100 border border-red-300 rounded-lg p-4">
                       <p className="text-red-800 font-bold text-sm">
@@ -3,6 +3,7 @@
 import { useState, useEffect } from 'react';
 import Header from '../components/Header';
 import { generateProsCons } from '@/lib/geminiService';
+import { FeedbackPost, FeedbackShardManifest, feedbackCount, loadFeedbackShard, loadShardManifest } from '@/lib/feedbackShards';
 
 interface Product {
   id: string;
@@ -30,17 +31,10 @@ interface Recommendation {
   fbFeedback?: string[];
 }
 
-interface FBPost {
-  text: string;
-  foils_mentioned: string[];
-  rider_weight: number | null;
-  use_case: string | null;
-}
-
 export default function WizardPage() {
   const [step, setStep] = useState(1);
   const [products, setProducts] = useState<Product[]>([]);
-  const [fbData, setFbData] = useState<FBPost[]>([]);
+  const [shardManifest, setShardManifest] = useState<FeedbackShardManifest | null>(null);
   const [formData, setFormData] = useState({
     weight: '',
     skillLevel: '',
@@ -58,7 +52,7 @@ export default function WizardPage() {
   const [yvonData, setYvonData] = useState<any[]>([]);
 
   useEffect(() => {
-    fetch('/data/axis-products.json')
+    fetch('/data/pages/wizard/axis-products.json')
       .then(r => r.json())
       .then(data => {
         const frontWings = data.collections['front-wings'].products;
@@ -66,16 +60,13 @@ export default function WizardPage() {
       })
       .catch(err => console.error('Failed to load products:', err));
 
-    // Load FB feedback data
-    fetch('/data/facebook-riders-feedback.json')
-      .then(r => r.json())
-      .then(data => {
-        setFbData(data.posts || []);
-      })
-      .catch(err => console.warn('FB data not available:', err));
+    // FB feedback shard manifest; shards are fetched per recommended foil
+    loadShardManifest()
+      .then(setShardManifest)
+      .catch(err => console.warn('FB feedback shards not available:', err));
 
     // Load Yvon expert feedback
-    fetch('/data/yvon-feedback.json')
+    fetch('/data/pages/wizard/yvon-feedback.json')
       .then(r => r.json())
       .then(data => {
         setYvonData(data.posts || []);
@@ -88,14 +79,14 @@ export default function WizardPage() {
   };
 
   // Match FB feedback to a foil, prioritizing weight-matched riders
-  const matchFBFeedback = (foilName: string, userWeightLbs?: number): string[] => {
+  const matchFBFeedback = (posts: FeedbackPost[], foilName: string, userWeightLbs?: number): string[] => {
     const feedback: string[] = [];
     const normalized = foilName.toUpperCase().replace(/\s+/g, ' ');
     
     // Collect all matching posts with weight info
     const matchingPosts: Array<{post: any, weightMatch: boolean, weight?: number}> = [];
 
-    for (const post of fbData) {
+    for (const post of posts) {
       // Check if this post mentions this foil
       const mentioned = post.foils_mentioned?.some((f: string) => 
         normalized.includes(f.toUpperCase().replace(/\s+/g, ' '))
@@ -393,13 +384,13 @@ export default function WizardPage() {
         // Match expert and community feedback
         const foilName = `${effectiveSeries} ${area}`;
         const expertFeedback = matchYvonFeedback(foilName);
-        const fbFeedback = matchFBFeedback(foilName, weight);
+        const fbCount = feedbackCount(shardManifest, product.id);
         
         // Boost score if there's feedback (expert weighted higher)
         if (expertFeedback.length > 0) {
           score += 8; // Expert review = stronger signal
         }
-        if (fbFeedback.length > 0) {
+        if (fbCount > 0) {
           score += 5;
         }
 
@@ -444,7 +435,6 @@ export default function WizardPage() {
           score: finalScore,
           reasoning,
           expertFeedback: expertFeedback.length > 0 ? expertFeedback : undefined,
-          fbFeedback: fbFeedback.length > 0 ? fbFeedback : undefined,
         };
       })
       .filter(rec => rec.score > 30) // Filter out really bad matches
@@ -458,7 +448,15 @@ export default function WizardPage() {
       return true;
     });
 
-    const topThree = unique.slice(0, 3);
+    // Community feedback: fetch only the shards of the three picks
+    const topThree = await Promise.all(unique.slice(0, 3).map(async rec => {
+      const series = rec.product.specs.series === 'PNG' && rec.product.title.includes('V2')
+        ? 'PNG V2'
+        : rec.product.specs.series;
+      const posts = await loadFeedbackShard(shardManifest, rec.product.id);
+      const fbFeedback = matchFBFeedback(posts, `${series} ${rec.product.specs.area}`, weight);
+      return { ...rec, fbFeedback: fbFeedback.length > 0 ? fbFeedback : undefined };
+    }));
 
     setRecommendations(topThree);
     setStep(4);
@@ -1,78 +1,124 @@
 #!/usr/bin/env python3
-"""Clean VTT subtitle files into readable plain text transcripts."""
-import re
-import sys
-import glob
+"""Clean VTT subtitle files into readable plain text transcripts.
+
+  python3 data-sources/clean-vtt.py                    # every .vtt not cleaned yet
+  python3 data-sources/clean-vtt.py new-video.en.vtt   # just this one (ingest-youtube.sh)
+  python3 data-sources/clean-vtt.py --force -j 8       # re-clean everything, 8 processes
+
+cleaned/manifest.json maps each transcript to the content hash of the VTT it
+was cleaned from, so re-runs skip transcripts whose VTT hasn't changed.
+Bump CLEANER_VERSION when the cleaning output changes to re-clean them all.
+
+Cues are parsed by vtt_cues.py, which merges rolling auto-caption overlap.
+Next to each <name>.txt it writes <name>.times.json, the start time of every
+fifth word, so a position in the transcript can be cited as a video timestamp.
+"""
+import argparse
+import hashlib
+import json
 import os
+import glob
+from concurrent.futures import ProcessPoolExecutor
+
+from vtt_cues import WordTimes, iter_cues, iter_words
+
+CLEANER_VERSION = 3
+WRAP_WIDTH = 100
+
+VTT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'youtube-transcripts')
+OUT_DIR = os.path.join(VTT_DIR, 'cleaned')
+MANIFEST_PATH = os.path.join(OUT_DIR, 'manifest.json')
 
 def clean_vtt(vtt_path):
+    """Transcript words plus their WordTimes, from the streaming cue parser."""
     with open(vtt_path, 'r') as f:
-        content = f.read()
-    
-    # Remove VTT header
-    content = re.sub(r'^WEBVTT\n.*?\n\n', '', content, flags=re.DOTALL)
-    
-    # Remove timestamps and position info
-    lines = content.split('\n')
-    text_lines = []
-    seen = set()
-    
-    for line in lines:
-        line = line.strip()
-        # Skip timestamp lines
-        if re.match(r'\d{2}:\d{2}:\d{2}\.\d{3}\s*-->', line):
-            continue
-        # Skip empty lines and numeric sequence lines
-        if not line or re.match(r'^\d+$', line):
-            continue
-        # Skip position/alignment tags
-        if line.startswith('Kind:') or line.startswith('Language:'):
-            continue
-        
-        # Remove HTML-like tags
-        line = re.sub(r'<[^>]+>', '', line)
-        # Remove [Music], [Applause] etc
-        line = re.sub(r'\[.*?\]', '', line).strip()
-        
-        if not line:
-            continue
-            
-        # Deduplicate consecutive identical lines (common in auto-subs)
-        if line not in seen:
-            text_lines.append(line)
-            # Only track last N lines for dedup (auto-subs repeat with slight overlap)
-            seen.add(line)
-            if len(seen) > 5:
-                seen = set(text_lines[-5:])
-    
-    return ' '.join(text_lines)
+        return WordTimes.build(iter_words(iter_cues(f)))
+
+def wrap_words(words, width=WRAP_WIDTH):
+    """Greedy wrap: a line ends with the first word that takes it past width.
+
+    The running length is tracked instead of re-joining the line per word.
+    """
+    lines = []
+    start = 0
+    length = -1
+    for i, word in enumerate(words):
+        length += len(word) + 1
+        if length > width:
+            lines.append(' '.join(words[start:i + 1]))
+            start = i + 1
+            length = -1
+    if start < len(words):
+        lines.append(' '.join(words[start:]))
+    return lines
+
+def output_name(vtt_path):
+    return os.path.basename(vtt_path).replace('.en.vtt', '')
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+def clean_one(vtt_path):
+    """Clean one VTT and write its transcript; returns (name, word count, output path)."""
+    basename = output_name(vtt_path)
+    words, times = clean_vtt(vtt_path)
+    out_path = os.path.join(OUT_DIR, f'{basename}.txt')
+    with open(out_path, 'w') as f:
+        f.write('\n'.join(wrap_words(words)))
+    with open(os.path.join(OUT_DIR, f'{basename}.times.json'), 'w') as f:
+        json.dump(times.to_json(), f, separators=(',', ':'))
+    return basename, len(words), out_path
+
+def load_manifest():
+    if os.path.exists(MANIFEST_PATH):
+        with open(MANIFEST_PATH) as f:
+            manifest = json.load(f)
+        if manifest.get('cleaner_version') == CLEANER_VERSION:
+            return manifest
+    return {'cleaner_version': CLEANER_VERSION, 'transcripts': {}}
+
+def save_manifest(manifest):
+    tmp = MANIFEST_PATH + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True, ensure_ascii=False)
+    os.replace(tmp, MANIFEST_PATH)
 
 def main():
-    vtt_dir = os.path.join(os.path.dirname(__file__), 'youtube-transcripts')
-    out_dir = os.path.join(vtt_dir, 'cleaned')
-    os.makedirs(out_dir, exist_ok=True)
-    
-    for vtt_file in sorted(glob.glob(os.path.join(vtt_dir, '*.vtt'))):
-        basename = os.path.basename(vtt_file).replace('.en.vtt', '')
-        text = clean_vtt(vtt_file)
-        
-        # Word-wrap at ~100 chars for readability
-        words = text.split()
-        lines = []
-        current = []
-        for word in words:
-            current.append(word)
-            if len(' '.join(current)) > 100:
-                lines.append(' '.join(current))
-                current = []
-        if current:
-            lines.append(' '.join(current))
-        
-        out_path = os.path.join(out_dir, f'{basename}.txt')
-        with open(out_path, 'w') as f:
-            f.write('\n'.join(lines))
-        
-        print(f"✅ {basename}: {len(words)} words → {out_path}")
+    parser = argparse.ArgumentParser(description="Clean VTT subtitles into plain text transcripts")
+    parser.add_argument('vtt', nargs='*', help="VTT files to clean (default: all in youtube-transcripts/)")
+    parser.add_argument('--force', action='store_true', help="re-clean even if the VTT is unchanged")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    os.makedirs(OUT_DIR, exist_ok=True)
+    manifest = load_manifest()
+    entries = manifest['transcripts']
+    vtt_files = ([os.path.abspath(p if os.path.exists(p) else os.path.join(VTT_DIR, p)) for p in args.vtt]
+                 or sorted(glob.glob(os.path.join(VTT_DIR, '*.vtt'))))
+
+    pending = []
+    for vtt_file in vtt_files:
+        basename = output_name(vtt_file)
+        digest = file_hash(vtt_file)
+        entry = entries.get(basename)
+        if (not args.force and entry and entry['vtt_hash'] == digest
+                and os.path.exists(os.path.join(OUT_DIR, f'{basename}.txt'))):
+            continue
+        pending.append((vtt_file, digest))
+
+    if len(pending) > 1 and args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(pending))) as pool:
+            results = list(pool.map(clean_one, [p for p, _ in pending]))
+    else:
+        results = [clean_one(p) for p, _ in pending]
+
+    for (vtt_file, digest), (basename, words, out_path) in zip(pending, results):
+        entries[basename] = {'vtt': os.path.basename(vtt_file), 'vtt_hash': digest, 'words': words}
+        print(f"✅ {basename}: {words} words → {out_path}")
+
+    save_manifest(manifest)
+    print(f"📊 {len(results)} cleaned, {len(vtt_files) - len(results)} unchanged")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Streaming WebVTT cue parser with rolling auto-caption merge and word timestamps.
+
+    with open(path) as f:
+        for word, start in iter_words(iter_cues(f)):
+            ...
+
+YouTube auto-captions roll: every cue repeats the line already on screen as
+its first line and adds the next one (with per-word <00:00:01.040> tags),
+and a 10 ms cue repeats the finished line again. iter_words() drops a cue's
+first line only when it is exactly the last line of the previous cue, so
+words the speaker really repeats ("Heat. Heat. Heat.") across cue
+boundaries are kept. The file is read cue by cue and only the previous
+cue's last line is kept for the merge.
+
+Word start times come from the inline tags when present, else are spread
+evenly over the cue. WordTimes stores one time per STEP words, which is
+enough to cite a moment in the video and keeps the index small.
+"""
+import html
+import json
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+Cue = namedtuple('Cue', 'start end lines')
+
+CUE_TIMING_RE = re.compile(r'^((?:\d+:)?\d{2}:\d{2}\.\d{3})\s*-->\s*((?:\d+:)?\d{2}:\d{2}\.\d{3})')
+INLINE_TIME_RE = re.compile(r'<((?:\d+:)?\d{2}:\d{2}\.\d{3})>')
+TAG_RE = re.compile(r'<[^>]+>')
+SOUND_RE = re.compile(r'\[[^\]]*\]')
+STEP = 5
+
+def parse_time(stamp):
+    """'00:01:02.500' or '01:02.500' -> seconds."""
+    parts = stamp.split(':')
+    seconds = float(parts[-1])
+    for i, part in enumerate(reversed(parts[:-1]), 1):
+        seconds += int(part) * 60 ** i
+    return seconds
+
+def iter_cues(lines):
+    """Yield Cue(start, end, payload lines) from an iterable of VTT lines."""
+    timing = None
+    payload = []
+    for raw in lines:
+        line = raw.rstrip('\n').rstrip('\r')
+        m = CUE_TIMING_RE.match(line)
+        if m:
+            timing = (parse_time(m.group(1)), parse_time(m.group(2)))
+            payload = []
+        elif not line:
+            # Only an empty line ends a cue; auto-captions use " " as a payload line
+            if timing:
+                yield Cue(timing[0], timing[1], payload)
+            timing = None
+        elif timing:
+            payload.append(line)
+    if timing:
+        yield Cue(timing[0], timing[1], payload)
+
+def cue_lines(cue):
+    """[[(word, start)] per payload line] for one cue; inline tags time the words that follow them."""
+    lines = []
+    timed = False
+    for line in cue.lines:
+        line = SOUND_RE.sub(' ', line)
+        current = cue.start
+        words = []
+        for i, part in enumerate(INLINE_TIME_RE.split(line)):
+            if i % 2:
+                current = parse_time(part)
+                timed = True
+                continue
+            for word in html.unescape(TAG_RE.sub('', part)).split():
+                words.append((word, current))
+        lines.append(words)
+    total = sum(len(words) for words in lines)
+    if not timed and total > 1:
+        span = max(cue.end - cue.start, 0.0)
+        n = 0
+        for words in lines:
+            words[:] = [(w, cue.start + span * (n + i) / total) for i, (w, _) in enumerate(words)]
+            n += len(words)
+    return lines
+
+def cue_words(cue):
+    """[(word, start)] for one cue."""
+    return [word for words in cue_lines(cue) for word in words]
+
+def iter_words(cues):
+    """Yield (word, start seconds) across cues with rolling caption repeats removed."""
+    previous = []
+    for cue in cues:
+        lines = cue_lines(cue)
+        repeat = bool(lines and lines[0]) and [w for w, _ in lines[0]] == previous
+        for words in lines[repeat:]:
+            yield from words
+        shown = [words for words in lines if words]
+        if shown:
+            previous = [w for w, _ in shown[-1]]
+
+class WordTimes:
+    """Start time of every STEP-th word of a cleaned transcript."""
+
+    def __init__(self, words=0, times=(), step=STEP):
+        self.words = words
+        self.step = step
+        self.times = list(times)
+
+    @classmethod
+    def build(cls, timed_words, step=STEP):
+        """Returns (words, WordTimes) from iter_words() output."""
+        words, times = [], []
+        for i, (word, start) in enumerate(timed_words):
+            words.append(word)
+            if i % step == 0:
+                times.append(round(start, 1))
+        return words, cls(len(words), times, step)
+
+    def at_word(self, index):
+        """Start time (s) of the word at index; accurate to within `step` words."""
+        if not self.times:
+            return None
+        return self.times[min(max(index, 0) // self.step, len(self.times) - 1)]
+
+    def word_at_time(self, seconds):
+        """Index of the first sampled word spoken at or before `seconds`."""
+        return max(bisect_right(self.times, seconds) - 1, 0) * self.step
+
+    def to_json(self):
+        return {'version': 1, 'words': self.words, 'step': self.step, 'times': self.times}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data['words'], data['times'], data['step'])
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_json(json.load(f))
+
+def word_indices(text, offsets):
+    """Word index of each char offset in text (offsets sorted), in one pass."""
+    out = []
+    word = -1
+    in_word = False
+    pos = 0
+    for offset in offsets:
+        while pos <= offset and pos < len(text):
+            is_space = text[pos].isspace()
+            if not is_space and not in_word:
+                word += 1
+            in_word = not is_space
+            pos += 1
+        out.append(max(word, 0))
+    return out
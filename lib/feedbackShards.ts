@@ -0,0 +1,59 @@
+// Per-foil rider feedback shards from public/data/feedback-shards/
+// (built by scripts/build-feedback-db.py). Pages fetch the manifest once,
+// then only the shards of the foils on screen.
+
+export interface FeedbackPost {
+  id?: string;
+  source_label?: string;
+  rider?: string;
+  rider_type?: string;
+  type?: string;
+  text: string;
+  key_insight?: string;
+  foils_mentioned: string[];
+  rider_weight?: number | string | null;
+  use_case?: string | null;
+  sentiment?: string;
+  date?: string;
+}
+
+export interface FeedbackShardManifest {
+  foils: Record<string, { count: number; bytes: number; sentiment: Record<string, number> }>;
+  products: Record<string, string>;
+}
+
+const SHARDS_URL = '/data/feedback-shards';
+const shardCache = new Map<string, Promise<FeedbackPost[]>>();
+
+export function loadShardManifest(): Promise<FeedbackShardManifest> {
+  return fetch(`${SHARDS_URL}/manifest.json`).then(r => r.json());
+}
+
+export function foilIdFor(manifest: FeedbackShardManifest | null, productId: number | string): string | null {
+  return manifest?.products[String(productId)] ?? null;
+}
+
+// Number of posts about a product's foil, without fetching its shard
+export function feedbackCount(manifest: FeedbackShardManifest | null, productId: number | string): number {
+  const foilId = foilIdFor(manifest, productId);
+  return foilId ? manifest!.foils[foilId]?.count ?? 0 : 0;
+}
+
+// Posts for a product's foil, expert voices first then newest; [] when it has no shard
+export function loadFeedbackShard(manifest: FeedbackShardManifest | null, productId: number | string): Promise<FeedbackPost[]> {
+  const foilId = foilIdFor(manifest, productId);
+  if (!foilId) return Promise.resolve([]);
+  let shard = shardCache.get(foilId);
+  if (!shard) {
+    shard = fetch(`${SHARDS_URL}/${foilId}.json`)
+      .then(r => r.json())
+      .then(data => data.posts || [])
+      .catch(err => {
+        console.warn(`Feedback shard ${foilId} not available:`, err);
+        shardCache.delete(foilId);
+        return [];
+      });
+    shardCache.set(foilId, shard);
+  }
+  return shard;
+}
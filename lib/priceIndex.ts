@@ -0,0 +1,69 @@
+// Retail price index from public/data/price-index.json
+// (built by scripts/build-price-index.py). Prices are integer cents;
+// groups are keyed 'type' or 'type|series' with their prices sorted.
+
+export interface PricedProduct {
+  title: string;
+  handle: string;
+  price: number;
+  type: string;
+  series: string | null;
+  history: [number, number, string, string]; // min, max, first seen, last seen
+}
+
+export interface PriceGroup {
+  prices: number[];
+  percentiles: number[];
+  history: [number, number];
+}
+
+export interface PriceIndex {
+  meta: { percentiles: number[]; bands: [string, number][] };
+  groups: Record<string, PriceGroup>;
+  products: PricedProduct[];
+}
+
+export interface PricePlacement {
+  group: string;
+  n: number;
+  cheaperThan: number;
+  min: number;
+  median: number;
+  max: number;
+}
+
+// First i with prices[i] > cents
+function upperBound(prices: number[], cents: number): number {
+  let lo = 0;
+  let hi = prices.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (prices[mid] <= cents) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+// Where an asking price sits among the product's series, else its whole type
+export function placePrice(index: PriceIndex, product: PricedProduct, cents: number): PricePlacement | null {
+  const key = product.series && index.groups[`${product.type}|${product.series}`]
+    ? `${product.type}|${product.series}`
+    : product.type;
+  const group = index.groups[key];
+  if (!group) return null;
+  const { prices, percentiles } = group;
+  return {
+    group: key.replace('|', ' · '),
+    n: prices.length,
+    cheaperThan: prices.length - upperBound(prices, cents),
+    min: prices[0],
+    median: percentiles[index.meta.percentiles.indexOf(50)],
+    max: prices[prices.length - 1],
+  };
+}
+
+// Band for an asking price as % of retail; bands are [name, floor %] top down
+export function priceBand(index: PriceIndex, percentOfRetail: number): string {
+  const band = index.meta.bands.find(([, floor]) => percentOfRetail >= floor);
+  return band ? band[0] : index.meta.bands[index.meta.bands.length - 1][0];
+}
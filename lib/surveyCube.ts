@@ -0,0 +1,49 @@
+// Survey setup cube from public/data/survey-cube.json
+// (built by scripts/build-survey-cube.py). Only non-empty cells are stored:
+// cells[i] is a mixed-radix index over dims (last dim fastest), counts[i]
+// its setup mentions. Every roll-up is one pass over the stored cells.
+
+export interface CubeDim {
+  name: string;
+  values: string[];
+}
+
+export interface SurveyCube {
+  meta: { version: number; built_at: string; source: string; facts: number };
+  dims: CubeDim[];
+  cells: number[];
+  counts: number[];
+}
+
+// Allowed values per dim name; dims left out or given [] are not filtered
+export type CubeSlice = Record<string, string[]>;
+
+// Dense counts over the kept dims (row-major), summing out the rest
+export function rollup(cube: SurveyCube, keep: string[], where: CubeSlice = {}): number[] {
+  const shape = cube.dims.map(d => d.values.length);
+  const strides = shape.map((_, i) => shape.slice(i + 1).reduce((a, b) => a * b, 1));
+  const axes = keep.map(name => cube.dims.findIndex(d => d.name === name));
+  const filters = Object.entries(where)
+    .filter(([, allowed]) => allowed.length > 0)
+    .map(([name, allowed]) => {
+      const axis = cube.dims.findIndex(d => d.name === name);
+      return { axis, allowed: new Set(allowed.map(v => cube.dims[axis].values.indexOf(v))) };
+    });
+  const out = new Array(axes.reduce((n, axis) => n * shape[axis], 1)).fill(0);
+  cube.cells.forEach((cell, i) => {
+    const coord = (axis: number) => Math.floor(cell / strides[axis]) % shape[axis];
+    if (filters.some(f => !f.allowed.has(coord(f.axis)))) return;
+    const index = axes.reduce((acc, axis) => acc * shape[axis] + coord(axis), 0);
+    out[index] += cube.counts[i];
+  });
+  return out;
+}
+
+// [value, count] along one dim for the slice, largest first, empty values dropped
+export function breakdown(cube: SurveyCube, dim: string, where: CubeSlice = {}): [string, number][] {
+  const values = cube.dims.find(d => d.name === dim)?.values ?? [];
+  return rollup(cube, [dim], where)
+    .map((count, i): [string, number] => [values[i], count])
+    .filter(([, count]) => count > 0)
+    .sort((a, b) => b[1] - a[1]);
+}
@@ -0,0 +1,46 @@
+// Reviewer moments per foil from public/data/transcript-mentions.json
+// (built by scripts/build-transcript-index.py).
+// Hits are stored as parallel columns sorted by (foil, video, t);
+// foils[i] owns hits[offsets[i]..offsets[i+1]).
+
+export interface TranscriptMentions {
+  videos: { name: string; title: string | null; url: string | null }[];
+  foils: string[];
+  offsets: number[];
+  hits: { video: number[]; t: (number | null)[]; snippet: string[] };
+  products: Record<string, string>;
+}
+
+export interface ReviewerMoment {
+  title: string;
+  t: number | null;
+  url: string | null;
+  snippet: string;
+}
+
+export function formatTimestamp(t: number): string {
+  return `${Math.floor(t / 60)}:${String(t % 60).padStart(2, '0')}`;
+}
+
+export function reviewerMoments(index: TranscriptMentions, foilId: string, limit = 3): ReviewerMoment[] {
+  const { videos, foils, offsets, hits } = index;
+  let lo = 0;
+  let hi = foils.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (foils[mid] < foilId) lo = mid + 1;
+    else hi = mid;
+  }
+  if (foils[lo] !== foilId) return [];
+
+  const moments: ReviewerMoment[] = [];
+  for (let i = offsets[lo]; i < offsets[lo + 1] && moments.length < limit; i++) {
+    const video = videos[hits.video[i]];
+    const t = hits.t[i];
+    const url = video.url && t !== null
+      ? `${video.url}${video.url.includes('?') ? '&' : '?'}t=${t}s`
+      : video.url;
+    moments.push({ title: video.title || video.name, t, url, snippet: hits.snippet[i] });
+  }
+  return moments;
+}
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Segmented, compressed, append-only store for deduplicated FB posts.
+
+Layout of a store directory:
+  seg-000001.jsonl.zst   compressed JSONL segments (one post record per line,
+                         each append is a new compressed frame)
+  index.json             sidecar index: per-segment time range and foils,
+                         post key -> (segment, line), foil -> segments
+
+Foils are indexed by canonical id ("fireball-1350") and series id
+("fireball") from the foil alias registry, so "FB1350", "Fireball 1350" and
+"fb 1350" are one key and free-text noise in foils_mentioned is not a key.
+
+Records are never rewritten in place. When a post is seen again its updated
+record is appended and the index points at the newest copy; compaction
+rewrites segments without the superseded copies, retention drops segments
+whose posts were all last seen before the cutoff.
+
+zstd needs the `zstandard` package; without it segments fall back to gzip
+(.jsonl.gz), which supports the same concatenated-frame appends.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from fb_archive import parse_timestamp
+from foil_catalog import SERIES_BASE, SERIES_IDS, get_catalog
+from near_dupes import MinHashLSH, normalize_text
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+INDEX_VERSION = 2
+SEGMENT_MAX_POSTS = 500
+DEDUPE_WINDOW_DAYS = 14
+
+def _codec():
+    return "zstd" if zstandard else "gzip"
+
+def _compress(raw: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    return gzip.compress(raw)
+
+def _decompress(blob: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("store uses zstd segments; pip install zstandard")
+        reader = zstandard.ZstdDecompressor().stream_reader(blob, read_across_frames=True)
+        return reader.read()
+    return gzip.decompress(blob)
+
+def text_fingerprint(text: str) -> str:
+    """Stable key for posts without a real FB post_id."""
+    norm = ' '.join(normalize_text(text))
+    return "fp_" + hashlib.blake2b(norm.encode(), digest_size=8).hexdigest()
+
+def foil_keys(foils) -> set:
+    """Index keys for a post's foils: canonical foil ids plus their series ids."""
+    catalog = get_catalog()
+    keys = set()
+    for foil in foils or []:
+        for fid in catalog.extract(str(foil), include_uncatalogued=True):
+            keys.add(fid)
+            keys.add(fid.rsplit('-', 1)[0])
+        for series in catalog.series_mentions(str(foil)):
+            keys.add(SERIES_IDS[series])
+    return keys
+
+def foil_query_key(foil):
+    """Index key a --query names: a foil id ("FB1350") or a series id ("Fireball", "fb")."""
+    ids = get_catalog().extract(foil, include_uncatalogued=True)
+    if ids:
+        return ids[0]
+    name = ' '.join(foil.lower().split())
+    by_name = {series.lower(): prefix for series, prefix in SERIES_IDS.items()}
+    series = SERIES_BASE.get(name.replace(' ', '').replace('-', ''))
+    return by_name.get(name) or (SERIES_IDS[series] if series else name)
+
+class ArchiveStore:
+    def __init__(self, root, segment_max_posts=SEGMENT_MAX_POSTS):
+        self.root = Path(root)
+        self.segment_max_posts = segment_max_posts
+        self.index_path = self.root / "index.json"
+        if self.index_path.exists():
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        else:
+            self.index = {"version": INDEX_VERSION, "codec": _codec(), "next_segment": 1,
+                          "segments": [], "posts": {}, "foils": {}, "ingested": []}
+        self.codec = self.index["codec"]
+        if self.index["version"] < INDEX_VERSION:
+            self._reindex_foils()
+
+    # ── segments ──────────────────────────────────────────────
+
+    def _ext(self):
+        return ".jsonl.zst" if self.codec == "zstd" else ".jsonl.gz"
+
+    def _segment(self, name):
+        return next(s for s in self.index["segments"] if s["name"] == name)
+
+    def _open_segment(self):
+        segs = self.index["segments"]
+        if segs and not segs[-1]["sealed"] and segs[-1]["count"] < self.segment_max_posts:
+            return segs[-1]
+        if segs:
+            segs[-1]["sealed"] = True
+        name = f"seg-{self.index['next_segment']:06d}{self._ext()}"
+        self.index["next_segment"] += 1
+        # Left over from a write whose index was never saved; nothing points into it
+        (self.root / name).unlink(missing_ok=True)
+        seg = {"name": name, "count": 0, "live": 0, "min_ts": None, "max_ts": None,
+               "foils": [], "sealed": False}
+        segs.append(seg)
+        return seg
+
+    def _reindex_foils(self):
+        """Rebuild the foil keys of an older index from the live records."""
+        self.index["foils"] = {}
+        for seg in self.index["segments"]:
+            keys = set()
+            for offset, rec in enumerate(self.read_segment(seg["name"])):
+                if self.index["posts"].get(rec["key"]) == [seg["name"], offset]:
+                    keys |= foil_keys(rec.get("foils_mentioned"))
+            seg["foils"] = sorted(keys)
+            for key in keys:
+                self.index["foils"].setdefault(key, []).append(seg["name"])
+        self.index["version"] = INDEX_VERSION
+
+    def read_segment(self, name):
+        path = self.root / name
+        if not path.exists():
+            return []
+        with open(path, 'rb') as f:
+            raw = _decompress(f.read(), self.codec)
+        return [json.loads(line) for line in raw.decode().splitlines() if line]
+
+    def _append_records(self, records):
+        """Append records, rolling over to a new segment at segment_max_posts."""
+        pending = list(records)
+        while pending:
+            seg = self._open_segment()
+            room = self.segment_max_posts - seg["count"]
+            batch, pending = pending[:room], pending[room:]
+            payload = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in batch).encode()
+            with open(self.root / seg["name"], 'ab') as f:
+                f.write(_compress(payload, self.codec))
+            foils = set(seg["foils"])
+            for offset, rec in enumerate(batch, start=seg["count"]):
+                old = self.index["posts"].get(rec["key"])
+                if old:
+                    self._segment(old[0])["live"] -= 1
+                self.index["posts"][rec["key"]] = [seg["name"], offset]
+                seg["live"] += 1
+                ts = rec.get("first_seen")
+                if ts:
+                    seg["min_ts"] = min(seg["min_ts"] or ts, ts)
+                    seg["max_ts"] = max(seg["max_ts"] or ts, rec.get("last_seen") or ts)
+                for key in foil_keys(rec.get("foils_mentioned")):
+                    foils.add(key)
+                    segs = self.index["foils"].setdefault(key, [])
+                    if seg["name"] not in segs:
+                        segs.append(seg["name"])
+            seg["foils"] = sorted(foils)
+            seg["count"] += len(batch)
+
+    def save(self):
+        """Write the index to a temp file and swap it in, so a crash leaves the old one."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".json.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(self.index, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+
+    # ── ingest ────────────────────────────────────────────────
+
+    def _recent_records(self, since_ts):
+        """Live records in segments touched since since_ts (the dedupe window)."""
+        for seg in self.index["segments"]:
+            if seg["max_ts"] and seg["max_ts"] < since_ts:
+                continue
+            for offset, rec in enumerate(self.read_segment(seg["name"])):
+                if self.index["posts"].get(rec["key"]) == [seg["name"], offset]:
+                    yield rec
+
+    def append(self, canonical_posts, dedupe_window_days=DEDUPE_WINDOW_DAYS):
+        """Append canonical posts (near_dupes.canonical_post), merging re-captures.
+
+        A post matches an existing record by post_id, by text fingerprint,
+        or by MinHash near-duplicate text among records seen within the
+        dedupe window. Matches are merged and re-appended; the rest are new.
+        Returns (new, updated) counts.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        newest = max((p.get("last_seen") or "" for p in canonical_posts), default="")
+        cutoff = ""
+        if newest:
+            cutoff_dt = parse_timestamp(newest) - timedelta(days=dedupe_window_days)
+            cutoff = cutoff_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        lsh = MinHashLSH()
+        existing = {}
+        for rec in self._recent_records(cutoff):
+            existing[rec["key"]] = rec
+            lsh.add(rec["key"], rec.get("text", ""))
+
+        out, new, updated = {}, 0, 0
+        for post in canonical_posts:
+            key = post.get("post_id") or text_fingerprint(post.get("text", ""))
+            match = None
+            if key in out or key in existing:
+                match = out.get(key) or existing[key]
+            elif key in self.index["posts"]:
+                seg, offset = self.index["posts"][key]
+                match = self.read_segment(seg)[offset]
+            else:
+                for cand in lsh.query(post.get("text", "")):
+                    cand_rec = out.get(cand) or existing[cand]
+                    if post.get("post_id") and cand_rec.get("post_id") \
+                            and post["post_id"] != cand_rec["post_id"]:
+                        continue
+                    match = cand_rec
+                    break
+            if match:
+                rec = merge_records(match, post)
+                updated += 1
+            else:
+                rec = dict(post, key=key)
+                lsh.add(key, rec.get("text", ""))
+                new += 1
+            existing[rec["key"]] = rec
+            out[rec["key"]] = rec
+
+        self._append_records(out.values())
+        self.save()
+        return new, updated
+
+    # ── queries ───────────────────────────────────────────────
+
+    def get(self, key):
+        loc = self.index["posts"].get(key)
+        if not loc:
+            return None
+        return self.read_segment(loc[0])[loc[1]]
+
+    def candidate_segments(self, foil=None, since=None, until=None):
+        """Segment names that can hold matches; everything else is never opened."""
+        since, until = _iso(since), _iso(until)
+        names = [s["name"] for s in self.index["segments"] if s["live"] > 0
+                 and not (since and s["max_ts"] and s["max_ts"] < since)
+                 and not (until and s["min_ts"] and s["min_ts"] > until)]
+        if foil:
+            with_foil = set(self.index["foils"].get(foil_query_key(foil), ()))
+            names = [n for n in names if n in with_foil]
+        return names
+
+    def query(self, foil=None, since=None, until=None):
+        """Live posts mentioning foil (series or model) last seen in [since, until]."""
+        since = _iso(since)
+        until = _iso(until)
+        want = foil_query_key(foil) if foil else None
+        for name in self.candidate_segments(foil, since, until):
+            for offset, rec in enumerate(self.read_segment(name)):
+                if self.index["posts"].get(rec["key"]) != [name, offset]:
+                    continue
+                if since and (rec.get("last_seen") or "") < since:
+                    continue
+                if until and (rec.get("first_seen") or "") > until:
+                    continue
+                if want and want not in foil_keys(rec.get("foils_mentioned")):
+                    continue
+                yield rec
+
+    # ── maintenance ───────────────────────────────────────────
+
+    def apply_retention(self, keep_days, now=None):
+        """Drop whole segments whose posts were all last seen before the cutoff."""
+        now = now or datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=keep_days)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        dropped = [s for s in self.index["segments"]
+                   if s["sealed"] and s["max_ts"] and s["max_ts"] < cutoff]
+        for seg in dropped:
+            self._forget_segment(seg)
+        self.save()
+        self._unlink_segments(dropped)
+        return [s["name"] for s in dropped]
+
+    def _forget_segment(self, seg):
+        """Remove a segment from the index; its file stays until _unlink_segments."""
+        name = seg["name"]
+        self.index["segments"].remove(seg)
+        self.index["posts"] = {k: v for k, v in self.index["posts"].items() if v[0] != name}
+        for key in list(self.index["foils"]):
+            segs = [n for n in self.index["foils"][key] if n != name]
+            if segs:
+                self.index["foils"][key] = segs
+            else:
+                del self.index["foils"][key]
+
+    def _unlink_segments(self, segs):
+        """Delete segment files; only once the saved index no longer points into them."""
+        for seg in segs:
+            (self.root / seg["name"]).unlink(missing_ok=True)
+
+    def compact(self, min_live_ratio=0.5):
+        """Rewrite sealed segments that are mostly superseded or undersized.
+
+        Live records from the selected segments are re-appended in
+        first_seen order, so time-range pruning stays tight. The new segments
+        and the index are written before the old segments are deleted, so a
+        crash part way leaves either the old or the new layout intact.
+        """
+        victims = [s for s in self.index["segments"] if s["sealed"] and s["count"]
+                   and (s["live"] / s["count"] < min_live_ratio
+                        or s["count"] < self.segment_max_posts // 2)]
+        if len(victims) < 2 and not any(s["live"] < s["count"] for s in victims):
+            return 0
+        live = []
+        for seg in victims:
+            for offset, rec in enumerate(self.read_segment(seg["name"])):
+                if self.index["posts"].get(rec["key"]) == [seg["name"], offset]:
+                    live.append(rec)
+        live.sort(key=lambda r: r.get("first_seen") or "")
+        if self.index["segments"]:
+            self.index["segments"][-1]["sealed"] = True
+        self._append_records(live)
+        for seg in victims:
+            self._forget_segment(seg)
+        self.save()
+        self._unlink_segments(victims)
+        return len(victims)
+
+def merge_records(old, new):
+    """Fold a re-capture into the stored record."""
+    seen = [t for t in (old.get("first_seen"), new.get("first_seen"),
+                        old.get("last_seen"), new.get("last_seen")) if t]
+    merged = dict(old)
+    if len(new.get("text", "")) > len(old.get("text", "")):
+        merged["text"] = new["text"]
+    merged["post_id"] = old.get("post_id") or new.get("post_id")
+    merged["poster"] = old.get("poster") or new.get("poster")
+    merged["foils_mentioned"] = list(dict.fromkeys(
+        (old.get("foils_mentioned") or []) + (new.get("foils_mentioned") or [])))
+    merged["first_seen"] = min(seen) if seen else None
+    merged["last_seen"] = max(seen) if seen else None
+    merged["captures"] = old.get("captures", 1) + new.get("captures", 1)
+    merged["archives"] = sorted(set(old.get("archives", [])) | set(new.get("archives", [])))
+    return merged
+
+def _iso(value):
+    if not value:
+        return None
+    dt = parse_timestamp(value if 'T' in value else value + "T00:00:00")
+    return dt.strftime('%Y-%m-%dT%H:%M:%SZ') if dt else None
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Build token-budgeted context packs for the chat route.
+
+Instead of sending the whole knowledge base with every chat request, the
+knowledge base, product catalog and rider feedback are pre-chunked into
+small packs:
+
+  core                 product families + known naming mistakes (always sent)
+  series:<slug>        one per foil series (character, models, insights, links)
+  product:<foil id>    one per official front wing (model notes, price, feedback)
+  discipline:<name>    setup guides / progression per discipline
+  topic:<name>         fuselage, mast, shimming, pitfalls
+  catalog:<type>       available masts, fuselages, rear wings, boards, completes
+
+Each pack carries an estimated token count. The lookup index maps canonical
+foil ids (foil_catalog) and keywords to pack ids, so app/api/chat/route.ts can
+assemble a small, relevant context per request.
+
+The full condensed knowledge base, the route's fallback when no pack
+matches, is written as well (public/data/chat-knowledge-base.json, the text
+plus its hash and token count), so the route reads one small file at cold
+start instead of re-deriving it from axis-knowledge.json and the catalog.
+
+Usage:
+  python3 scripts/build-chat-context.py
+"""
+
+import hashlib
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+
+from foil_catalog import SERIES_BASE, SERIES_IDS, get_catalog
+
+PUBLIC_DIR = Path(__file__).parent.parent / "public" / "data"
+OUTPUT_FILE = PUBLIC_DIR / "chat-context.json"
+KNOWLEDGE_BASE_FILE = PUBLIC_DIR / "chat-knowledge-base.json"
+FEEDBACK_FILES = ("youtube-feedback.json", "yvon-feedback.json", "facebook-riders-feedback.json")
+
+PACK_BUDGET = 1200       # max estimated tokens per pack
+FEEDBACK_PER_PRODUCT = 4
+FEEDBACK_CHARS = 280
+
+# axis-knowledge.json series keys -> foil_catalog series names
+KNOWLEDGE_SERIES = {"PNG": "PNG", "PNG V2": "PNG v2", "BSC": "BSC", "HPS": "HPS", "ART": "ART",
+                    "ART Pro": "ARTPRO", "ART V2": "ART v2", "Spitfire": "Spitfire",
+                    "Fireball": "Fireball", "Tempo": "Tempo", "Surge": "Surge"}
+
+# Discipline packs: name -> (keywords, setup guide key fragments, series discipline fragments)
+DISCIPLINES = {
+    "downwind": (("downwind", "dw", "downwinder", "bumps", "swell"), ("downwind",), ("downwind",)),
+    "wing": (("winging", "wingfoil", "wingfoiling", "wingfoiler"), ("winging", "intermediate_allround"),
+             ("wing",)),
+    "prone": (("prone", "surf", "surfing", "wave", "waves"), ("surf", "prone"),
+              ("prone", "surf", "wave")),
+    "pump": (("pump", "pumping", "dock", "dockstart"), ("pump",), ("pump", "dock")),
+    "sup": (("sup", "paddle"), ("downwind_beginner",), ("sup",)),
+    "wake": (("wake", "wakefoil", "wakesurf", "boat"), (), ("wake",)),
+    "tow": (("tow", "towing"), (), ("tow",)),
+    "kite": (("kite", "kitefoil", "kitefoiling"), (), ("kite",)),
+}
+
+TOPICS = {
+    "fuselage": ("fuselage_guide", ("fuselage", "fuse", "fuselages", "red", "black", "advance",
+                                    "ti", "short", "ultrashort", "crazyshort")),
+    "mast": ("mast_guide", ("mast", "masts", "aluminum", "aluminium", "fatty", "stiffness")),
+    "shimming": ("shimming_guide", ("shim", "shims", "shimming")),
+    "pitfalls": ("common_pitfalls", ("problem", "issue", "struggle", "struggling", "wobbly",
+                                     "unstable", "pitch", "mistake")),
+}
+
+# catalog:<slug> -> (title, product_types, title filter, keywords)
+CATALOG_PACKS = {
+    "rear-wings": ("Rear wings", ("Foil Wing",), "rear wing",
+                   ("rear", "stab", "stabilizer", "tail", "progressive", "freeride")),
+    "masts": ("Masts", ("Mast",), None, ("mast", "masts")),
+    "fuselages": ("Fuselages", ("Fuselage",), None, ("fuselage", "fuse", "fuselages")),
+    "boards": ("Foil boards", ("Foil Board",), None, ("board", "boards")),
+    "completes": ("Foil completes and packages", ("Foil Complete",), None,
+                  ("complete", "package", "beginner", "starter")),
+}
+SKIP_TYPES = {'OPTIONS_HIDDEN_PRODUCT', 'OPTIONS_HIDDEN_PRODUCTS', 'Merch', 'Gear Bag',
+              'Board Leash', 'Strap', 'Screw', 'Mount', 'Adapter'}
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token for English prose)."""
+    return math.ceil(len(text) / 4)
+
+def clip(text, limit):
+    text = ' '.join(str(text or '').split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + '…'
+
+def make_pack(title, lines, budget=PACK_BUDGET):
+    """Join lines into a pack, dropping trailing lines beyond the token budget."""
+    kept = [f"=== {title} ==="]
+    for line in lines:
+        if not line:
+            continue
+        if estimate_tokens('\n'.join(kept + [line])) > budget:
+            break
+        kept.append(line)
+    text = '\n'.join(kept)
+    return {"title": title, "text": text, "tokens": estimate_tokens(text)}
+
+def flatten(value, prefix=""):
+    """Readable 'key: value' lines for a nested knowledge-base section."""
+    lines = []
+    if isinstance(value, dict):
+        for k, v in value.items():
+            label = str(k).replace('_', ' ')
+            if isinstance(v, (dict, list)):
+                lines.append(f"{prefix}{label}:")
+                lines.extend(flatten(v, prefix + "  "))
+            else:
+                lines.append(f"{prefix}{label}: {clip(v, 300)}")
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, dict):
+                lines.append(prefix + ' | '.join(f"{k}: {clip(v, 200)}" for k, v in item.items()
+                                                 if not isinstance(v, (dict, list))))
+            else:
+                lines.append(f"{prefix}- {clip(item, 300)}")
+    return lines
+
+def series_slug(series):
+    return SERIES_IDS[series]
+
+def available_products(catalog):
+    return [p for p in catalog if p.get("available") and p.get("product_type") not in SKIP_TYPES]
+
+def feedback_by_foil(foils):
+    """Canonical foil id -> feedback snippets, expert sources first."""
+    out = {}
+    for name in FEEDBACK_FILES:
+        path = PUBLIC_DIR / name
+        if not path.exists():
+            continue
+        for post in load_json(path).get("posts", []):
+            text = post.get("key_insight") or post.get("text") or ""
+            if len(text) < 40:
+                continue
+            mentioned = ' , '.join(str(f) for f in post.get("foils_mentioned") or []) or text
+            for fid in foils.extract(mentioned):
+                out.setdefault(fid, []).append(
+                    f"- {post.get('rider') or 'Rider'}: \"{clip(text, FEEDBACK_CHARS)}\"")
+    return out
+
+def build():
+    knowledge = load_json(PUBLIC_DIR / "axis-knowledge.json")
+    catalog = load_json(PUBLIC_DIR / "shopify-catalog.json")
+    foils = get_catalog()
+    products = available_products(catalog)
+
+    packs = {}
+    foil_index = {}
+    keywords = {}
+
+    def link(keyword, pack_id):
+        ids = keywords.setdefault(keyword.lower(), [])
+        if pack_id not in ids:
+            ids.append(pack_id)
+
+    # Shop links for front wings, by canonical id
+    wing_links = {}
+    for p in products:
+        if p.get("product_type") == "Foil Wing" and "rear" not in p["title"].lower():
+            for fid in foils.extract(p["title"])[:1]:
+                wing_links.setdefault(fid, p)
+
+    # ── core ──
+    lines = []
+    for key, s in knowledge.get("series", {}).items():
+        lines.append(f"{key} - {s.get('tagline', '')} | Disciplines: "
+                     f"{', '.join(s.get('disciplines', []))} | Fuselage: {s.get('fuselage', '')}")
+    corrections = knowledge.get("corrections", {}).get("items", [])
+    if corrections:
+        lines.append("Naming corrections (these products do not exist as written):")
+        lines.extend(f"  {c.get('wrong')} → {c.get('correct')} ({c.get('note', '')})" for c in corrections)
+    packs["core"] = make_pack("AXIS FOILS PRODUCT FAMILIES", lines)
+
+    # ── series ──
+    insights_by_series = knowledge.get("rider_insights", {}).get("by_series", {})
+    for key, s in knowledge.get("series", {}).items():
+        series = KNOWLEDGE_SERIES.get(key)
+        if not series:
+            continue
+        pack_id = f"series:{series_slug(series)}"
+        lines = [
+            f"{s.get('name', key)} - {s.get('tagline', '')}",
+            f"Character: {clip(s.get('character'), 400)}",
+            f"Best for: {clip(s.get('who_its_for'), 300)}",
+            f"Not ideal for: {clip(s.get('not_ideal_for'), 200)}" if s.get("not_ideal_for") else "",
+            f"Disciplines: {', '.join(s.get('disciplines', []))} | Fuselage: {s.get('fuselage', '')}",
+        ]
+        models = s.get("models", {})
+        if models:
+            lines.append("Models:")
+            lines.extend(f"  {m}: {clip(info.get('highlight'), 90)}"
+                         f" ({info.get('weight_range', 'all weights')})"
+                         for m, info in models.items())
+        links = sorted((fid, p) for fid, p in wing_links.items() if foils.wings[fid]["series"] == series)
+        if links:
+            lines.append("Shop: " + ' | '.join(f"{p['title']}: {p['url']}" for _, p in links))
+        lines.extend(f"Expert tip ({q.get('expert')}): \"{clip(q.get('quote'), 220)}\""
+                     for q in s.get("expert_quotes", [])[:3])
+        lines.extend(f"- {clip(i, 220)}" for i in s.get("community_insights", [])[:8])
+        packs[pack_id] = make_pack(f"SERIES: {key}", lines)
+        link(key.replace(' ', ''), pack_id)
+        for alias, base in SERIES_BASE.items():
+            # Short aliases ("fb", "ap") only count next to a size, via the foil lookup
+            if base == series and len(alias) > 3:
+                link(alias, pack_id)
+        for fid, w in foils.wings.items():
+            if w["series"] == series:
+                foil_index.setdefault(fid, []).append(pack_id)
+
+    # ── products ──
+    feedback = feedback_by_foil(foils)
+    model_notes = {}
+    for key, s in knowledge.get("series", {}).items():
+        for m, info in s.get("models", {}).items():
+            for fid in foils.extract(m)[:1]:
+                model_notes[fid] = (m, info)
+    insights = {}
+    for key, items in insights_by_series.items():
+        for i in items:
+            for fid in foils.extract(i.get("foil") or "")[:1]:
+                insights.setdefault(fid, []).append(
+                    f"- {i.get('rider')}: \"{clip(i.get('text'), FEEDBACK_CHARS)}\"")
+    for fid, w in sorted(foils.wings.items()):
+        name, info = model_notes.get(fid, (w["title"], {}))
+        shop = wing_links.get(fid)
+        lines = [
+            f"{name} ({w['series']} series, {w['area']} cm²)",
+            f"Highlight: {clip(info.get('highlight'), 200)}" if info.get("highlight") else "",
+            f"Notes: {clip(info.get('notes'), 400)}" if info.get("notes") else "",
+            f"Rider weight: {info.get('weight_range')}" if info.get("weight_range") else "",
+            f"Price: {w['price']}" if w.get("price") else "",
+            f"Link: {shop['url']}" if shop else "",
+        ]
+        quotes = insights.get(fid, []) + feedback.get(fid, [])
+        if quotes:
+            lines.append("Rider feedback:")
+            lines.extend(list(dict.fromkeys(quotes))[:FEEDBACK_PER_PRODUCT])
+        pack_id = f"product:{fid}"
+        packs[pack_id] = make_pack(f"PRODUCT: {name}", lines)
+        foil_index.setdefault(fid, []).insert(0, pack_id)
+
+    # ── disciplines ──
+    guides = knowledge.get("setup_guides", {})
+    for name, (words, guide_keys, series_words) in DISCIPLINES.items():
+        lines = []
+        if name == "downwind":
+            prog = knowledge.get("downwind_progression", {})
+            lines.append(prog.get("title", "Downwind progression") + ":")
+            lines.extend(f"  {st.get('step')}. {st.get('wing')} ({st.get('skill_level')}): "
+                         f"{clip(st.get('description'), 220)}" for st in prog.get("steps", []))
+        for gkey, g in guides.items():
+            if any(k in gkey for k in guide_keys):
+                lines.append(f"{g.get('title', gkey)}: front {g.get('front_wing')} | rear "
+                             f"{g.get('rear_wing')} | fuselage {g.get('fuselage')} | mast "
+                             f"{g.get('mast')} | {clip(g.get('notes'), 160)}")
+        fits = [key for key, s in knowledge.get("series", {}).items()
+                if any(w in d.lower() for d in s.get("disciplines", []) for w in series_words)]
+        if fits:
+            lines.append(f"Series suited to {name}: {', '.join(fits)}")
+        pack_id = f"discipline:{name}"
+        packs[pack_id] = make_pack(f"DISCIPLINE: {name.upper()}", lines)
+        for w in words:
+            link(w, pack_id)
+
+    # ── topics ──
+    for name, (section, words) in TOPICS.items():
+        data = knowledge.get(section)
+        if not data:
+            continue
+        pack_id = f"topic:{name}"
+        packs[pack_id] = make_pack(f"{name.upper()} GUIDE", flatten(data))
+        for w in words:
+            link(w, pack_id)
+
+    # ── catalog listings ──
+    for slug, (title, types, title_filter, words) in CATALOG_PACKS.items():
+        items = [p for p in products if p.get("product_type") in types
+                 and (not title_filter or title_filter in p["title"].lower())]
+        if not items:
+            continue
+        pack_id = f"catalog:{slug}"
+        packs[pack_id] = make_pack(f"AVAILABLE {title.upper()}",
+                                   [f"  {p['title']}: {p['url']}" for p in items])
+        for w in words:
+            link(w, pack_id)
+
+    series_aliases = {alias: SERIES_IDS[base] for alias, base in SERIES_BASE.items()}
+    return {
+        "meta": {
+            "built_at": datetime.now().isoformat(),
+            "pack_count": len(packs),
+            "total_tokens": sum(p["tokens"] for p in packs.values()),
+            "pack_budget": PACK_BUDGET,
+            "token_estimate": "ceil(chars / 4)",
+        },
+        "packs": packs,
+        "lookup": {
+            "series_aliases": series_aliases,
+            "foils": {fid: ids for fid, ids in sorted(foil_index.items()) if ids},
+            "keywords": dict(sorted(keywords.items())),
+        },
+    }
+
+def build_knowledge_base(knowledge, catalog):
+    """The condensed knowledge base text: families, fuselage and mast guides, product links."""
+    lines = ['=== AXIS FOILS PRODUCT FAMILIES ===']
+    for key, v in (knowledge.get("series") or {}).items():
+        lines.append(f"\n{key} - {v.get('tagline') or ''}")
+        lines.append(f"  {(v.get('character') or '')[:200]}")
+        lines.append(f"  Best for: {v.get('who_its_for') or ''}")
+        lines.append(f"  Disciplines: {', '.join(v.get('disciplines') or [])}")
+        lines.append(f"  Fuselage series: {v.get('fuselage') or ''}")
+        models = list((v.get("models") or {}).items())[:10]
+        model_str = ' | '.join(f"{m}: {((info or {}).get('highlight') or '')[:70]}" for m, info in models)
+        if model_str:
+            lines.append(f"  Models: {model_str}")
+        quotes = (v.get("expert_quotes") or [])[:1]
+        if quotes:
+            lines.append(f"  Expert tip ({quotes[0].get('expert')}): \"{(quotes[0].get('quote') or '')[:180]}\"")
+
+    lines.append('\n=== FUSELAGE GUIDE ===')
+    fg = knowledge.get("fuselage_guide") or {}
+    lines.append(fg.get("overview") or '')
+    for label, key in (("RED", "red_series"), ("BLACK", "black_series")):
+        sizes = ' | '.join(f"{k}: {v}" for k, v in ((fg.get(key) or {}).get("sizes") or {}).items())
+        lines.append(f"{label} Series sizes: {sizes}")
+
+    lines.append('\n=== MAST GUIDE ===')
+    for v in (knowledge.get("mast_guide") or {}).values():
+        if not isinstance(v, dict):
+            continue
+        warn = f" | ⚠️ WARNING: {v['warning'][:150]}" if v.get("warning") else ''
+        lines.append(f"{v.get('name') or ''}: {(v.get('character') or '')[:130]} | "
+                     f"For: {(v.get('who_its_for') or '')[:80]}{warn}")
+
+    lines.append('\n=== AVAILABLE PRODUCTS (with links) ===')
+    by_type = {}
+    for p in available_products(catalog):
+        by_type.setdefault(p.get("product_type") or 'Other', []).append(p)
+    type_order = ['Foil Complete', 'Foil Wing', 'Mast', 'Fuselage', 'Foil Board', 'Other']
+    for pt in [t for t in type_order if t in by_type] + [t for t in by_type if t not in type_order]:
+        lines.append(f"\n{pt}:")
+        lines.extend(f"  {p['title']}: {p['url']}" for p in by_type[pt])
+    return '\n'.join(lines)
+
+def write_knowledge_base():
+    text = build_knowledge_base(load_json(PUBLIC_DIR / "axis-knowledge.json"),
+                                load_json(PUBLIC_DIR / "shopify-catalog.json"))
+    data = {
+        "built_at": datetime.now().isoformat(),
+        "hash": hashlib.sha256(text.encode()).hexdigest()[:16],
+        "tokens": estimate_tokens(text),
+        "text": text,
+    }
+    with open(KNOWLEDGE_BASE_FILE, 'w') as f:
+        json.dump(data, f, ensure_ascii=False)
+    print(f"📚 Knowledge base: ~{data['tokens']} tokens (hash {data['hash']}) → {KNOWLEDGE_BASE_FILE}")
+
+def main():
+    print("💬 Building chat context packs")
+    print("=" * 50)
+    data = build()
+    with open(OUTPUT_FILE, 'w') as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+    meta = data["meta"]
+    kinds = {}
+    for pack_id in data["packs"]:
+        kinds[pack_id.split(':')[0]] = kinds.get(pack_id.split(':')[0], 0) + 1
+    print(f"✅ {meta['pack_count']} packs ({', '.join(f'{k}: {v}' for k, v in kinds.items())})")
+    print(f"📊 ~{meta['total_tokens']} tokens total, largest pack "
+          f"~{max(p['tokens'] for p in data['packs'].values())} tokens")
+    print(f"💾 Saved to {OUTPUT_FILE}")
+    write_knowledge_base()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Rebuild community-stats.json from raw survey responses.
+
+Takes Google Forms exports (the response sheet as CSV, or JSONL) and
+applies them to the response table kept in data/survey-state.json: new
+responses are added, edited ones replaced, unchanged ones skipped, and only
+those touch the aggregated counts. Passing the full export again is cheap,
+so the stats for /recommend (and the /insights setup cube,
+public/data/survey-cube.json) can be refreshed after every pull.
+
+  python3 scripts/build-community-stats.py responses.csv
+  python3 scripts/build-community-stats.py new-responses.jsonl
+  python3 scripts/build-community-stats.py responses.csv --full     # drop responses not in the export
+  python3 scripts/build-community-stats.py responses.csv --rebuild  # recount from scratch
+
+The state file holds the raw answers and is not committed.
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+from survey_cube import CUBE_FILE, build_cube, facts_from_responses, save_cube
+from survey_stats import SurveyAggregates, normalize_response, read_responses
+
+ROOT_DIR = Path(__file__).parent.parent
+STATE_FILE = ROOT_DIR / "data" / "survey-state.json"
+STATS_FILES = [ROOT_DIR / "data" / "community-stats.json",
+               ROOT_DIR / "public" / "data" / "community-stats.json"]
+STATE_VERSION = 1
+
+def load_state(rebuild=False):
+    if rebuild or not STATE_FILE.exists():
+        return {}, SurveyAggregates(), []
+    with open(STATE_FILE) as f:
+        state = json.load(f)
+    if state.get("version") != STATE_VERSION:
+        return {}, SurveyAggregates(), []
+    table = {row["id"]: row for row in state["responses"]}
+    return table, SurveyAggregates(state["aggregates"]), state.get("imports", [])
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate survey responses into community-stats.json")
+    parser.add_argument("exports", nargs="+", help="response exports (.csv or .jsonl)")
+    parser.add_argument("--full", action="store_true",
+                        help="exports are complete: remove responses missing from them")
+    parser.add_argument("--rebuild", action="store_true", help="ignore saved state and recount")
+    args = parser.parse_args()
+
+    print("📊 Aggregating survey responses")
+    print("=" * 50)
+    started = time.perf_counter()
+    table, aggs, imports = load_state(args.rebuild)
+    before = len(table)
+    changes = {"added": 0, "updated": 0, None: 0}
+    seen = set()
+    for path in args.exports:
+        for raw in read_responses(path):
+            row = normalize_response(raw)
+            seen.add(row["id"])
+            changes[aggs.upsert(table, row)] += 1
+        imports.append({"file": Path(path).name, "at": datetime.now().isoformat()})
+    removed = 0
+    if args.full:
+        for response_id in [i for i in table if i not in seen]:
+            removed += aggs.remove(table, response_id)
+
+    stats = aggs.community_stats({"source": "Google Forms export"})
+    for path in STATS_FILES:
+        with open(path, 'w') as f:
+            json.dump(stats, f, indent=2, ensure_ascii=False)
+    cube = build_cube(facts_from_responses(table), "survey responses")
+    save_cube(cube)
+    with open(STATE_FILE, 'w') as f:
+        json.dump({"version": STATE_VERSION, "imports": imports[-50:],
+                   "responses": list(table.values()), "aggregates": aggs.to_state()}, f)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    print(f"✅ {len(table)} responses ({before} before): {changes['added']} new, "
+          f"{changes['updated']} edited, {changes[None]} unchanged, {removed} removed in {elapsed:.0f}ms")
+    for name, entry in list(stats["disciplines"].items())[:5]:
+        top = entry["top_front_wings"][:1]
+        print(f"   {name:<30} {entry['total_setups']:>4} setups"
+              + (f"  top: {top[0]['wing']} ({top[0]['count']})" if top else ""))
+    print(f"🧊 Setup cube: {cube['meta']['facts']} setup mentions in {len(cube['cells'])} cells")
+    print(f"💾 Saved to {', '.join(str(p.relative_to(ROOT_DIR)) for p in STATS_FILES + [CUBE_FILE])}")
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,39 @@ Sources:
   1. Existing FB rider feedback (facebook-riders-feedback.json)
   2. FB surge feedback (fb-surge-feedback-parsed.json)
   3. FB main feed (fb-main-feed-parsed.json)
+     + any other data/*-parsed.json written by parse-fb-dump.py
   4. Yvon expert reviews (yvon-feedback.json)
   5. Axis foils expertise file (community knowledge)
   6. Evan tech specs (official measurements)
+
+Also writes one shard per canonical foil id to public/data/feedback-shards/,
+so /compare and /wizard fetch only the foils on screen. Each shard holds
+that foil's posts, expert/manufacturer voices first and newest first within
+each tier, with sentiment counts precomputed; manifest.json lists every
+shard with its post count and maps product ids to foil ids.
+
+  python3 scripts/build-feedback-db.py
+  python3 scripts/build-feedback-db.py --shards-only   # re-shard the current feedback file
 """
 
+import argparse
 import json
 from pathlib import Path
 from datetime import datetime
 
+from foil_catalog import get_catalog
+
 DATA_DIR = Path(__file__).parent.parent / "data"
 PUBLIC_DIR = Path(__file__).parent.parent / "public" / "data"
 MEMORY_DIR = Path(__file__).parent.parent.parent / "memory" / "groups" / "axis"
+SHARDS_DIR = PUBLIC_DIR / "feedback-shards"
+
+# Lower ranks first in a shard
+AUTHORITY_RANK = {"expert": 0, "manufacturer": 1, "media_review": 2,
+                  "community_consensus": 3, "setup_guide": 4, "community": 5}
+EXPERT_RIDER_TYPES = ("team_rider", "pro", "expert", "instructor")
+SHARD_FIELDS = ("id", "source_label", "rider", "rider_type", "type", "text", "key_insight",
+                "foils_mentioned", "rider_weight", "use_case", "sentiment", "date")
 
 def load_json(path):
     try:
@@ -26,6 +47,15 @@ def load_json(path):
         print(f"⚠️ Could not load {path}: {e}")
         return None
 
+def parsed_posts(data):
+    """Posts of a *-parsed.json file: parse-fb-dump.py writes "posts", the curated files "feedback"."""
+    if isinstance(data, list):
+        return data
+    return data.get("posts") or data.get("feedback") or []
+
+def post_text(post):
+    return post.get("text") or post.get("content") or post.get("excerpt") or ""
+
 def build_community_feedback():
     """Build structured community feedback from all sources."""
     
@@ -54,9 +84,9 @@ def build_community_feedback():
     # 2. FB Surge feedback
     surge_data = load_json(DATA_DIR / "fb-surge-feedback-parsed.json")
     if surge_data:
-        posts = surge_data if isinstance(surge_data, list) else surge_data.get("posts", [])
+        posts = parsed_posts(surge_data)
         for i, post in enumerate(posts):
-            text = post.get("text", post.get("content", ""))
+            text = post_text(post)
             if text and len(text) > 30:
                 all_feedback.append({
                     "id": f"surge_{i}",
@@ -76,9 +106,9 @@ def build_community_feedback():
     # 3. FB main feed
     main_feed = load_json(DATA_DIR / "fb-main-feed-parsed.json")
     if main_feed:
-        posts = main_feed if isinstance(main_feed, list) else main_feed.get("posts", [])
+        posts = parsed_posts(main_feed)
         for i, post in enumerate(posts):
-            text = post.get("text", post.get("content", ""))
+            text = post_text(post)
             if text and len(text) > 30:
                 all_feedback.append({
                     "id": f"fb_main_{i}",
@@ -94,6 +124,32 @@ def build_community_feedback():
                     "date": "2026-02"
                 })
         print(f"✅ Main feed: {len(posts)} posts")
+
+    # 3b. Other dumps segmented by parse-fb-dump.py
+    for path in sorted(DATA_DIR.glob("*-parsed.json")):
+        if path.name in ("fb-surge-feedback-parsed.json", "fb-main-feed-parsed.json"):
+            continue
+        dump = load_json(path)
+        if not dump:
+            continue
+        posts = parsed_posts(dump)
+        stem = path.name[:-len("-parsed.json")]
+        segmented_at = (dump.get("meta", {}) if isinstance(dump, dict) else {}).get("segmented_at")
+        for i, post in enumerate(posts):
+            text = post_text(post)
+            if text and len(text) > 30:
+                all_feedback.append({
+                    "id": f"{stem.replace('-', '_')}_{i}",
+                    "source": "facebook_dump",
+                    "source_label": "AXIS Riders FB Group",
+                    "rider": post.get("author") or extract_name(text),
+                    "text": clean_text(text),
+                    "foils_mentioned": post.get("foils_mentioned") or extract_foils(text),
+                    "sentiment": post.get("sentiment", "neutral"),
+                    "type": "community",
+                    "date": (segmented_at or "2026-02")[:7]
+                })
+        print(f"✅ {path.name}: {len(posts)} posts")
     
     # 4. Yvon expert reviews (already good quality)
     yvon_data = load_json(DATA_DIR / "yvon-feedback.json")
@@ -502,7 +558,73 @@ def extract_foils(text):
                 foils.add(m.strip())
     return list(foils)
 
+def authority_rank(post):
+    if post.get("rider_type") in EXPERT_RIDER_TYPES:
+        return AUTHORITY_RANK["expert"]
+    return AUTHORITY_RANK.get(post.get("type"), len(AUTHORITY_RANK))
+
+def post_foil_ids(post, catalog):
+    """Canonical foil ids a post is about: its mention list, else its text."""
+    ids = catalog.extract(", ".join(post.get("foils_mentioned") or []))
+    return list(dict.fromkeys(ids + catalog.extract(post.get("text") or "")))
+
+def build_foil_shards(feedback, catalog=None):
+    """{foil id: shard} with posts sorted by authority, then newest first."""
+    catalog = catalog or get_catalog()
+    by_foil = {}
+    for post in feedback:
+        slim = {k: post[k] for k in SHARD_FIELDS if post.get(k) not in (None, "", [])}
+        slim.setdefault("text", "")
+        slim.setdefault("foils_mentioned", [])
+        for fid in post_foil_ids(post, catalog):
+            by_foil.setdefault(fid, []).append(slim)
+    shards = {}
+    for fid, posts in sorted(by_foil.items()):
+        posts.sort(key=lambda p: p.get("date") or "", reverse=True)
+        posts.sort(key=authority_rank)
+        sentiment = {}
+        for p in posts:
+            key = str(p.get("sentiment") or "neutral").lower().replace(" ", "_")
+            sentiment[key] = sentiment.get(key, 0) + 1
+        shards[fid] = {"foil": fid, "title": catalog.wings[fid]["title"] if fid in catalog.wings else fid,
+                       "count": len(posts), "sentiment": sentiment, "posts": posts}
+    return shards
+
+def write_foil_shards(feedback):
+    catalog = get_catalog()
+    shards = build_foil_shards(feedback, catalog)
+    SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+    for stale in SHARDS_DIR.glob("*.json"):
+        if stale.stem != "manifest" and stale.stem not in shards:
+            stale.unlink()
+    foils = {}
+    for fid, shard in shards.items():
+        text = json.dumps(shard, separators=(',', ':'), ensure_ascii=False)
+        (SHARDS_DIR / f"{fid}.json").write_text(text)
+        foils[fid] = {"count": shard["count"], "bytes": len(text.encode()), "sentiment": shard["sentiment"]}
+    manifest = {
+        "built_at": datetime.now().isoformat(),
+        "posts": len(feedback),
+        "foils": foils,
+        "products": {str(w["product_id"]): fid for fid, w in catalog.wings.items()
+                     if fid in shards and w.get("product_id") is not None},
+    }
+    with open(SHARDS_DIR / "manifest.json", 'w') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    sizes = [v["bytes"] for v in foils.values()]
+    print(f"💾 {len(shards)} foil shards to {SHARDS_DIR} "
+          f"(median {sorted(sizes)[len(sizes) // 2] / 1024:.1f} KB, max {max(sizes) / 1024:.1f} KB)")
+
 def main():
+    parser = argparse.ArgumentParser(description="Build the rider feedback database and per-foil shards")
+    parser.add_argument("--shards-only", action="store_true",
+                        help="only rebuild the shards from public/data/facebook-riders-feedback.json")
+    args = parser.parse_args()
+
+    if args.shards_only:
+        write_foil_shards(load_json(PUBLIC_DIR / "facebook-riders-feedback.json")["posts"])
+        return
+
     print("🔧 Building comprehensive rider feedback database...")
     print("=" * 50)
     
@@ -532,6 +654,7 @@ def main():
         with open(path, 'w') as f:
             json.dump(output, f, indent=2)
         print(f"💾 Saved to {path}")
+    write_foil_shards(feedback)
     
     print(f"\n📊 TOTAL: {len(feedback)} feedback entries")
     print(f"  - Facebook groups: {output['meta']['sources']['facebook_groups']}")
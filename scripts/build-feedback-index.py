@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Build the BM25 feedback search index (public/data/feedback-index.json).
+
+Indexes every post in facebook-riders-feedback.json, youtube-feedback.json,
+survey-feedback.json and yvon-feedback.json. Query it from Python with
+feedback_search.FeedbackIndex, or from the command line:
+
+  python3 scripts/build-feedback-index.py
+  python3 scripts/build-feedback-index.py --query "surge 950 overfoiled" -k 5
+"""
+
+import argparse
+import json
+import time
+
+from feedback_search import INDEX_FILE, FeedbackIndex, build_index
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the feedback BM25 index")
+    parser.add_argument("--query", help="search the existing index instead of rebuilding")
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.query is not None:
+        if not args.query.strip():
+            parser.error("--query needs search terms")
+        index = FeedbackIndex.load()
+        started = time.perf_counter()
+        hits = index.hydrate(index.search(args.query, k=args.k))
+        elapsed = (time.perf_counter() - started) * 1000
+        for hit in hits:
+            post = hit["post"] or {}
+            print(f"  {hit['score']:6.2f}  {hit['id']:<24} {(post.get('text') or '')[:90]}")
+        print(f"\n🔍 {len(hits)} hits in {elapsed:.1f}ms")
+        return
+
+    print("🔎 Building feedback search index")
+    print("=" * 50)
+    started = time.perf_counter()
+    data = build_index()
+    with open(INDEX_FILE, 'w') as f:
+        json.dump(data, f, separators=(',', ':'))
+    meta = data["meta"]
+    print(f"✅ {meta['doc_count']} posts, {len(data['terms'])} terms "
+          f"in {time.perf_counter() - started:.1f}s")
+    print(f"💾 Saved to {INDEX_FILE} ({INDEX_FILE.stat().st_size // 1024} KB)")
+
+if __name__ == "__main__":
+    main()
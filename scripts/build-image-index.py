@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Build the perceptual-hash index of official product images
+(data/image-hashes.json) and match listing photos against it.
+
+Images are downloaded once into data/product-images/; --offline only hashes
+what is already there (e.g. a mirror copied from another machine). Needs
+Pillow (`pip install Pillow`).
+
+  python3 scripts/build-image-index.py
+  python3 scripts/build-image-index.py --offline --mirror /path/to/mirror
+  python3 scripts/build-image-index.py --match listing1.jpg listing2.jpg
+"""
+
+import argparse
+import json
+import time
+
+from image_hashes import (INDEX_FILE, MIRROR_DIR, NEAR_COPY_DISTANCE, ImageIndex, Image,
+                          build_index)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the product image hash index")
+    parser.add_argument("--match", nargs="+", metavar="PHOTO", help="listing photos to check instead of rebuilding")
+    parser.add_argument("--radius", type=int, default=NEAR_COPY_DISTANCE, help="max Hamming distance for --match")
+    parser.add_argument("--mirror", default=str(MIRROR_DIR), help="local image mirror directory")
+    parser.add_argument("--offline", action="store_true", help="don't download, hash the mirror only")
+    args = parser.parse_args()
+
+    if Image is None:
+        parser.error("Pillow is not installed; pip install Pillow")
+
+    if args.match:
+        index = ImageIndex.load()
+        for photo in args.match:
+            started = time.perf_counter()
+            matches = index.match_file(photo, args.radius)
+            elapsed = (time.perf_counter() - started) * 1000
+            if not matches:
+                print(f"✅ {photo}: no official image within {args.radius} bits ({elapsed:.1f}ms)")
+                continue
+            print(f"🚨 {photo}: {len(matches)} official image(s) ({elapsed:.1f}ms)")
+            for m in matches[:5]:
+                flipped = " (mirrored)" if m["mirrored"] else ""
+                print(f"   {m['distance']:2d} bits  {m['verdict']:<9} {m['title']}{flipped}")
+        return
+
+    print("🖼️  Building product image hash index")
+    print("=" * 50)
+    started = time.perf_counter()
+    data, failed = build_index(mirror_dir=args.mirror, offline=args.offline)
+    with open(INDEX_FILE, 'w') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"✅ {data['meta']['image_count']} images hashed in {time.perf_counter() - started:.1f}s")
+    for handle, error in failed[:10]:
+        print(f"   ⚠️  {handle}: {error}")
+    if len(failed) > 10:
+        print(f"   ... and {len(failed) - 10} more failures")
+    print(f"💾 Saved to {INDEX_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Build per-page slim projections of the public data artifacts.
+
+Pages used to fetch whole files (axis-products.json alone is ~650 KB, most
+of it HTML descriptions and tags) to read a handful of fields. PAGES below
+declares, per route, which source files it reads and which fields of them.
+Each projection keeps the source's shape with everything else dropped, so
+a page only swaps its fetch URL:
+
+  public/data/pages/<page>/<source>.json
+
+Every projection has a size budget; the build fails if one is exceeded, so
+a page that starts reading a new field has to say so here. Rider feedback
+is not projected here: pages fetch per-foil shards (build-feedback-db.py),
+and /verify reads the price index (build-price-index.py).
+
+  python3 scripts/build-page-data.py
+  python3 scripts/build-page-data.py --check    # verify budgets, write nothing
+"""
+
+import argparse
+import json
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+PUBLIC_DIR = Path(__file__).parent.parent / "public" / "data"
+PAGES_DIR = PUBLIC_DIR / "pages"
+MANIFEST_FILE = PAGES_DIR / "manifest.json"
+
+TAG_RE = re.compile(r'<[^>]*>')
+
+def html_text(limit):
+    """Field transform: tags stripped the way FoilComparison.stripHtml does, cut to limit chars."""
+    return lambda value: TAG_RE.sub('', value)[:limit] if isinstance(value, str) else value
+
+WINGS = "collections.front-wings.products"
+EVAN_FIELDS = ["front_wings.name", "front_wings.series", "front_wings.span_mm",
+               "front_wings.max_chord_mm", "front_wings.mean_chord_mm", "front_wings.true_area_cm2",
+               "front_wings.projected_area_cm2", "front_wings.volume_cm3", "front_wings.aspect_ratio"]
+
+# page -> source file -> fields read (dotted paths through dicts; lists are
+# mapped over; "*" matches every key) and the size budget of the projection.
+PAGES = {
+    "home": {
+        "axis-products.json": {
+            "budget_kb": 60,
+            "fields": ["meta.scraped_at", "meta.source", f"{WINGS}.id", f"{WINGS}.title",
+                       f"{WINGS}.image", f"{WINGS}.price", (f"{WINGS}.description", html_text(300)),
+                       f"{WINGS}.specs"],
+        },
+    },
+    "browse": {
+        "axis-products.json": {"budget_kb": 4, "fields": [f"{WINGS}.specs.series"]},
+    },
+    "search": {
+        "axis-products.json": {
+            "budget_kb": 40,
+            "fields": [f"{WINGS}.id", f"{WINGS}.title", f"{WINGS}.image", f"{WINGS}.price",
+                       f"{WINGS}.available", f"{WINGS}.url", f"{WINGS}.specs"],
+        },
+    },
+    "series": {
+        "axis-products.json": {
+            "budget_kb": 40,
+            "fields": [f"{WINGS}.id", f"{WINGS}.title", f"{WINGS}.image", f"{WINGS}.price",
+                       f"{WINGS}.available", f"{WINGS}.url", f"{WINGS}.specs"],
+        },
+    },
+    "compare": {
+        "axis-products.json": {
+            "budget_kb": 35,
+            "fields": [f"{WINGS}.id", f"{WINGS}.title", f"{WINGS}.image", f"{WINGS}.price",
+                       f"{WINGS}.specs"],
+        },
+        "yvon-feedback.json": {"budget_kb": 4, "fields": ["posts.foils_mentioned", "posts.key_insight"]},
+        "evan-tech-specs.json": {"budget_kb": 12, "fields": EVAN_FIELDS},
+    },
+    "wizard": {
+        "axis-products.json": {
+            "budget_kb": 20,
+            "fields": [f"{WINGS}.id", f"{WINGS}.title", f"{WINGS}.specs.series", f"{WINGS}.specs.area",
+                       f"{WINGS}.specs.aspectRatio", f"{WINGS}.specs.modelNumber"],
+        },
+        "yvon-feedback.json": {
+            "budget_kb": 5,
+            "fields": ["posts.foils_mentioned", "posts.key_insight", "posts.rider_type", "posts.rider"],
+        },
+    },
+}
+
+def compile_fields(fields):
+    """Dotted field paths -> nested shape dict; leaves are True or a transform."""
+    shape = {}
+    for field in fields:
+        path, leaf = field if isinstance(field, tuple) else (field, True)
+        keys = path.split('.')
+        node = shape
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+        node[keys[-1]] = leaf
+    return shape
+
+def project(value, shape):
+    if shape is True:
+        return value
+    if callable(shape):
+        return shape(value)
+    if isinstance(value, list):
+        return [project(v, shape) for v in value]
+    if not isinstance(value, dict):
+        return value
+    out = {}
+    for key, sub in shape.items():
+        for k in (value if key == "*" else [key] if key in value else []):
+            out[k] = project(value[k], sub)
+    return out
+
+def build(pages=PAGES, public_dir=PUBLIC_DIR):
+    """[(page, source, json text, budget bytes)] for every projection."""
+    sources = {}
+    out = []
+    for page, reads in pages.items():
+        for source, spec in reads.items():
+            if source not in sources:
+                with open(Path(public_dir) / source) as f:
+                    sources[source] = json.load(f)
+            data = project(sources[source], compile_fields(spec["fields"]))
+            text = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+            out.append((page, source, text, spec["budget_kb"] * 1024))
+    return out
+
+def main():
+    parser = argparse.ArgumentParser(description="Build per-page data projections")
+    parser.add_argument("--check", action="store_true", help="only check size budgets")
+    args = parser.parse_args()
+
+    print("📦 Building per-page data projections")
+    print("=" * 50)
+    built = build()
+    artifacts = {}
+    over = []
+    for page, source, text, budget in built:
+        size = len(text.encode())
+        full = (PUBLIC_DIR / source).stat().st_size
+        mark = "✅" if size <= budget else "❌"
+        print(f"{mark} {page + '/' + source:<42} {size / 1024:7.1f} KB  "
+              f"(budget {budget // 1024} KB, full {full / 1024:.0f} KB)")
+        if size > budget:
+            over.append(f"{page}/{source}")
+        artifacts[f"{page}/{source}"] = {"source": source, "bytes": size, "budget_bytes": budget}
+
+    if over:
+        print(f"\n❌ Over budget: {', '.join(over)}")
+        print("   Drop fields from PAGES or raise the budget deliberately.")
+        sys.exit(1)
+    if args.check:
+        return
+    for page, source, text, _ in built:
+        path = PAGES_DIR / page / source
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    with open(MANIFEST_FILE, 'w') as f:
+        json.dump({"built_at": datetime.now().isoformat(), "artifacts": artifacts}, f, indent=2)
+    print(f"💾 Saved {len(artifacts)} projections to {PAGES_DIR}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Build the retail price index (public/data/price-index.json).
+
+Groups the official products by type and series with sorted retail prices,
+percentiles and the retail range seen across builds; /verify places an
+asking price against it. Rebuild after scraping axis-products.json, and
+query it from Python with price_index.PriceIndex or the command line:
+
+  python3 scripts/build-price-index.py
+  python3 scripts/build-price-index.py --query "Fireball 1500" --asking 450
+  python3 scripts/build-price-index.py --type "Front Wings" --series Fireball --asking 450
+"""
+
+import argparse
+import json
+import time
+
+from price_index import INDEX_FILE, PriceIndex, build_index
+
+def dollars(cents):
+    return f"${cents / 100:,.0f}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the retail price index")
+    parser.add_argument("--query", help="product title, handle or foil name to check instead of rebuilding")
+    parser.add_argument("--type", help="product type to place --asking in (e.g. 'Front Wings')")
+    parser.add_argument("--series", help="series within --type")
+    parser.add_argument("--asking", type=float, help="asking price in dollars")
+    args = parser.parse_args()
+
+    if args.query or args.type:
+        if args.asking is None:
+            parser.error("--asking is required with --query or --type")
+        if args.asking < 0:
+            parser.error("--asking can't be negative")
+        index = PriceIndex.load()
+        if args.query:
+            result = index.check(args.query, args.asking)
+            if result is None:
+                print(f"❌ No product matching {args.query!r}")
+                return
+            lo, hi, first, last = result["retail_history"]
+            print(f"💰 {result['product']}: retail {dollars(result['retail'])} "
+                  f"(seen {dollars(lo)}–{dollars(hi)}, {first} → {last})")
+            print(f"   Asking {dollars(result['asking'])} = {result['percent_of_retail']:.0f}% "
+                  f"of retail → {result['band'].upper()}")
+            place = result["category"]
+        else:
+            place = index.place(args.asking, args.type, args.series)
+            if place is None:
+                print(f"❌ No price group for {args.type!r}")
+                return
+        print(f"   {place['group']}: cheaper than {place['cheaper_than']} of {place['n']} retail prices "
+              f"(min {dollars(place['min'])}, median {dollars(place['median'])}, max {dollars(place['max'])})")
+        return
+
+    print("💰 Building retail price index")
+    print("=" * 50)
+    started = time.perf_counter()
+    data = build_index()
+    with open(INDEX_FILE, 'w') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+    print(f"✅ {data['meta']['product_count']} products in {len(data['groups'])} groups "
+          f"in {(time.perf_counter() - started) * 1000:.0f}ms")
+    for key, group in data["groups"].items():
+        if '|' not in key:
+            p10, _, p50, _, p90 = group["percentiles"]
+            print(f"   {key:<12} n={len(group['prices']):<3} p10 {dollars(p10)}  p50 {dollars(p50)}  p90 {dollars(p90)}")
+    print(f"💾 Saved to {INDEX_FILE} ({INDEX_FILE.stat().st_size / 1024:.1f} KB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Build the survey setup cube (public/data/survey-cube.json) for the
+/insights Setup Explorer, and query it from the command line.
+
+Facts come from the raw survey response table (data/survey-state.json,
+kept by build-community-stats.py) when it exists, else from the survey
+rows of community-setups.json, which have no age answers.
+
+  python3 scripts/build-survey-cube.py
+  python3 scripts/build-survey-cube.py --by front_wing --where discipline="Wing Foiling"
+  python3 scripts/build-survey-cube.py --by weight mast --where experience="4+ years" "2-4 years"
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from survey_cube import (CUBE_FILE, DIMS, SETUPS_FILE, Cube, build_cube, facts_from_responses,
+                         facts_from_setups, save_cube)
+
+STATE_FILE = Path(__file__).parent.parent / "data" / "survey-state.json"
+
+def parse_where(items):
+    """["discipline=Wing Foiling", "Kite Foiling", "weight=<65kg"] -> {dim: [values]}."""
+    where, dim = {}, None
+    for item in items or []:
+        if "=" in item and item.split("=", 1)[0] in dict(DIMS):
+            dim, item = item.split("=", 1)
+        if dim is None:
+            raise ValueError(f"--where value {item!r} has no dimension")
+        if item not in dict(DIMS)[dim]:
+            raise ValueError(f"{item!r} is not a {dim} value: {', '.join(dict(DIMS)[dim])}")
+        where.setdefault(dim, []).append(item)
+    return where
+
+def load_facts():
+    if STATE_FILE.exists():
+        with open(STATE_FILE) as f:
+            table = {row["id"]: row for row in json.load(f)["responses"]}
+        return facts_from_responses(table), "survey responses"
+    with open(SETUPS_FILE) as f:
+        return facts_from_setups(json.load(f)), "community-setups.json survey rows"
+
+def main():
+    dim_names = [name for name, _ in DIMS]
+    parser = argparse.ArgumentParser(description="Build or query the survey setup cube")
+    parser.add_argument("--by", nargs="+", choices=dim_names, help="dims to break down by instead of rebuilding")
+    parser.add_argument("--where", nargs="+", metavar="DIM=VALUE", help="slice, e.g. discipline=\"Wing Foiling\"")
+    args = parser.parse_args()
+
+    if args.by:
+        cube = Cube.load()
+        try:
+            where = parse_where(args.where)
+        except ValueError as e:
+            parser.error(str(e))
+        started = time.perf_counter()
+        shape, counts = cube.rollup(args.by, where)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"🧊 {' × '.join(args.by)} over {sum(counts)} setup mentions ({elapsed:.1f}ms)")
+        axes = [cube.values[cube.names.index(name)] for name in args.by]
+        rows = []
+        for index, count in enumerate(counts):
+            if count:
+                labels = []
+                for values in reversed(axes):
+                    index, i = divmod(index, len(values))
+                    labels.append(values[i])
+                rows.append((" / ".join(reversed(labels)), count))
+        for label, count in sorted(rows, key=lambda r: -r[1])[:25]:
+            print(f"   {count:>4}  {label}")
+        return
+
+    print("🧊 Building survey setup cube")
+    print("=" * 50)
+    started = time.perf_counter()
+    facts, source = load_facts()
+    data = build_cube(facts, source)
+    save_cube(data)
+    dense = 1
+    for _, values in DIMS:
+        dense *= len(values)
+    print(f"✅ {data['meta']['facts']} setup mentions from {source} in "
+          f"{(time.perf_counter() - started) * 1000:.0f}ms")
+    print(f"   {len(data['cells'])} non-empty cells of {dense:,}")
+    print(f"💾 Saved to {CUBE_FILE}")
+
+if __name__ == "__main__":
+    main()
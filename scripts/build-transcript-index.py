@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Build the transcript mention index (public/data/transcript-mentions.json).
+
+Maps each catalog foil to the reviewer moments that mention it: video,
+timestamp and a snippet of the cleaned transcript. Rebuild after
+clean-vtt.py; query it from Python with transcript_mentions.MentionIndex
+or from the command line:
+
+  python3 scripts/build-transcript-index.py
+  python3 scripts/build-transcript-index.py --query "Fireball 1500"
+"""
+
+import argparse
+import json
+import time
+
+from transcript_mentions import INDEX_FILE, MentionIndex, build_index
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the transcript mention index")
+    parser.add_argument("--query", help="look up a foil in the existing index instead of rebuilding")
+    parser.add_argument("--video", help="only hits in this transcript")
+    args = parser.parse_args()
+
+    if args.query:
+        index = MentionIndex.load()
+        started = time.perf_counter()
+        hits = index.lookup(args.query, video=args.video)
+        elapsed = (time.perf_counter() - started) * 1000
+        for hit in hits:
+            t = hit["t"]
+            at = f"{t // 60:3d}:{t % 60:02d}" if t is not None else "   ?  "
+            print(f"  {at}  {hit['title'][:50]:<50}  {hit['snippet'][:80]}")
+        print(f"\n🎬 {len(hits)} moments in {elapsed:.2f}ms")
+        return
+
+    print("🎬 Building transcript mention index")
+    print("=" * 50)
+    started = time.perf_counter()
+    data = build_index()
+    with open(INDEX_FILE, 'w') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+    meta = data["meta"]
+    print(f"✅ {meta['transcripts']} transcripts, {meta['hit_count']} moments, "
+          f"{len(data['foils'])} foils in {time.perf_counter() - started:.1f}s")
+    if meta["duplicates_skipped"]:
+        print(f"   ↪ {len(meta['duplicates_skipped'])} duplicate transcripts skipped")
+    print(f"💾 Saved to {INDEX_FILE} ({INDEX_FILE.stat().st_size // 1024} KB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Compact the one-JSON-per-scan FB archives into the segmented archive store.
+
+Only archives not yet ingested are read. Their posts are collapsed with
+MinHash/LSH, merged with re-captures already in the store, and appended as
+compressed JSONL segments under data/archive-store/.
+
+Usage:
+  python3 scripts/compact-fb-archives.py                  # ingest new archives
+  python3 scripts/compact-fb-archives.py --retention-days 365 --compact
+  python3 scripts/compact-fb-archives.py --prune-raw      # delete ingested raw JSON
+  python3 scripts/compact-fb-archives.py --query Tempo --since 2026-04-01
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from archive_store import ArchiveStore
+from fb_archive import ARCHIVE_DIRS, iter_archive_posts, list_archive_files
+from near_dupes import MinHashLSH, canonical_post, cluster_posts
+
+STORE_DIR = Path(__file__).parent.parent / "data" / "archive-store"
+
+def ingest(store):
+    pending = [p for p in list_archive_files() if p.name not in store.index["ingested"]]
+    if not pending:
+        print("✅ No new archives to ingest")
+        return
+    posts = []
+    for path in pending:
+        posts.extend(iter_archive_posts(path))
+    clusters = cluster_posts(posts, MinHashLSH())
+    canonical = [canonical_post([posts[i] for i in c]) for c in clusters]
+    canonical.sort(key=lambda p: p["first_seen"] or "")
+    new, updated = store.append(canonical)
+    store.index["ingested"].extend(p.name for p in pending)
+    store.save()
+    print(f"✅ Ingested {len(pending)} archives: {len(posts)} captures → "
+          f"{new} new posts, {updated} merged into existing")
+
+def prune_raw(store):
+    removed = 0
+    for path in list_archive_files():
+        if path.name in store.index["ingested"]:
+            # The same scan may have been copied into both archive dirs
+            for d in ARCHIVE_DIRS:
+                (d / path.name).unlink(missing_ok=True)
+            removed += 1
+    print(f"🗑️  Removed {removed} raw archive files already in the store")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact FB scan archives into the segmented store")
+    parser.add_argument("--store", default=str(STORE_DIR))
+    parser.add_argument("--retention-days", type=int, help="drop segments last seen before this many days ago")
+    parser.add_argument("--compact", action="store_true", help="rewrite superseded/undersized segments")
+    parser.add_argument("--prune-raw", action="store_true", help="delete raw archive JSON once ingested")
+    parser.add_argument("--query", metavar="FOIL", help="query posts mentioning a foil or series")
+    parser.add_argument("--since", help="ISO date/time lower bound for --query")
+    parser.add_argument("--until", help="ISO date/time upper bound for --query")
+    args = parser.parse_args()
+
+    store = ArchiveStore(args.store)
+
+    if args.query or args.since or args.until:
+        started = time.perf_counter()
+        segments = store.candidate_segments(args.query, args.since, args.until)
+        hits = list(store.query(args.query, args.since, args.until))
+        elapsed = (time.perf_counter() - started) * 1000
+        for rec in hits:
+            print(f"  [{rec['first_seen']} → {rec['last_seen']}] {rec.get('poster') or '?'}: "
+                  f"{rec['text'][:100]}")
+        print(f"\n🔍 {len(hits)} posts from {len(segments)}/{len(store.index['segments'])} "
+              f"segments in {elapsed:.1f}ms")
+        return
+
+    print("🗜️  FB archive compaction")
+    print("=" * 50)
+    ingest(store)
+    if args.retention_days is not None:
+        dropped = store.apply_retention(args.retention_days)
+        print(f"✅ Retention ({args.retention_days}d): dropped {len(dropped)} segments")
+    if args.compact:
+        rewritten = store.compact()
+        print(f"✅ Compaction: rewrote {rewritten} segments")
+    if args.prune_raw:
+        prune_raw(store)
+
+    segs = store.index["segments"]
+    print(f"\n📊 {len(store.index['posts'])} posts in {len(segs)} {store.codec} segments")
+    print(f"💾 Store: {store.root}")
+
+if __name__ == "__main__":
+    main()
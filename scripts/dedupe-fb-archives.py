@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Collapse re-captured FB posts across all scan archives into canonical posts.
+
+Sources:
+  1. Scan archives (public/data/archives/*.json, archives/*.json)
+  2. Live scraper posts in facebook-riders-feedback.json
+
+Each canonical post keeps first_seen / last_seen scan timestamps and how
+many captures were merged into it, so foil_mentions counts each real post
+once instead of once per scan that happened to see it.
+"""
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+from fb_archive import iter_all_archive_posts, load_json, parse_timestamp
+from near_dupes import MinHashLSH, canonical_post, cluster_posts
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+OUTPUT_FILE = DATA_DIR / "fb-posts-canonical.json"
+LIVE_FILE = DATA_DIR / "facebook-riders-feedback.json"
+
+def load_live_posts():
+    """FB posts already in the feedback db, normalized like archive posts."""
+    data = load_json(LIVE_FILE)
+    posts = []
+    for post in (data or {}).get("posts", []):
+        if not str(post.get("source", "")).startswith("facebook") or not post.get("text"):
+            continue
+        seen = parse_timestamp(post.get("date") or post.get("scraped_at") or "")
+        posts.append({
+            "post_id": None,
+            "source": "axis_riders_group",
+            "poster": post.get("rider"),
+            "text": post["text"],
+            "foils_mentioned": post.get("foils_mentioned", []),
+            "discipline": post.get("use_case"),
+            "sentiment": post.get("sentiment"),
+            "posted_at": post.get("date"),
+            "scanned_at": seen.strftime('%Y-%m-%dT%H:%M:%SZ') if seen else None,
+            "archive": LIVE_FILE.name,
+        })
+    return posts
+
+def main():
+    print("🧬 Near-duplicate collapse of FB scan archives (MinHash/LSH)")
+    print("=" * 50)
+
+    started = time.perf_counter()
+    posts = list(iter_all_archive_posts())
+    print(f"✅ Archive captures: {len(posts)}")
+    live = load_live_posts()
+    posts.extend(live)
+    print(f"✅ Live feedback posts: {len(live)}")
+
+    clusters = cluster_posts(posts, MinHashLSH())
+    canonical = [canonical_post([posts[i] for i in cluster]) for cluster in clusters]
+    canonical.sort(key=lambda p: (p["first_seen"] or "", p["post_id"] or ""))
+    for i, post in enumerate(canonical):
+        post["id"] = post["post_id"] or f"fbc_{i}"
+
+    foil_mentions = {}
+    for post in canonical:
+        for foil in post["foils_mentioned"]:
+            foil_mentions[foil] = foil_mentions.get(foil, 0) + 1
+
+    output = {
+        "meta": {
+            "built_at": datetime.now().isoformat(),
+            "captures": len(posts),
+            "canonical_posts": len(canonical),
+            "method": "minhash-lsh (128 perms, 32 bands, 3-word shingles)",
+            "description": "FB posts deduplicated across scan archives; one record per real post"
+        },
+        "posts": canonical,
+        "statistics": {
+            "total_posts": len(canonical),
+            "foil_mentions": dict(sorted(foil_mentions.items(), key=lambda kv: -kv[1]))
+        }
+    }
+
+    with open(OUTPUT_FILE, 'w') as f:
+        json.dump(output, f, indent=2)
+
+    elapsed = time.perf_counter() - started
+    print(f"\n📊 {len(posts)} captures → {len(canonical)} canonical posts "
+          f"({len(posts) - len(canonical)} re-captures collapsed) in {elapsed:.2f}s")
+    print(f"💾 Saved to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Extract foil feedback from the cleaned YouTube transcripts into youtube-feedback.json.
+
+  python3 scripts/extract-youtube-feedback.py                          # Anthropic API, all transcripts
+  python3 scripts/extract-youtube-feedback.py "AXIS Surge Foil Ramblings [_qB034jY70Y]"
+  python3 scripts/stub-completion-server.py &                          # offline
+  python3 scripts/extract-youtube-feedback.py --endpoint http://127.0.0.1:8765 --dry-run
+
+Runs data-sources/EXTRACTION-PROMPT.md over every transcript chunk (see
+transcript_extract.py). Responses are cached per prompt version + chunk, so
+after a prompt tweak or a new video only the changed chunks are sent.
+Entries replace those with the same id in public/data/youtube-feedback.json.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+from transcript_extract import (CLIENTS, DEFAULT_MODEL, ResponseCache, extract_transcript,
+                                load_prompt, load_transcripts, prompt_version, video_for)
+
+OUTPUT_FILE = Path(__file__).parent.parent / "public" / "data" / "youtube-feedback.json"
+
+async def run(args):
+    with open(args.output if Path(args.output).exists() else OUTPUT_FILE) as f:
+        feedback = json.load(f)
+    videos = feedback["meta"].get("videos", [])
+    template = load_prompt()
+    version = prompt_version(template, args.model)
+    client = CLIENTS[args.provider](args.endpoint, model=args.model,
+                                    api_key=os.environ.get(args.api_key_env))
+    cache = ResponseCache()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    stats = {"chunks": 0, "calls": 0, "cache_hits": 0, "invalid": 0, "unparseable": 0}
+
+    print("🎬 YouTube feedback extraction")
+    print("=" * 50)
+    print(f"   Prompt version {version} ({args.model}), {args.concurrency} concurrent calls")
+    transcripts, duplicates = load_transcripts(args.transcripts)
+    for name, same_as in duplicates:
+        print(f"   ↪ {name}: same transcript as {same_as}, skipped")
+    results = await asyncio.gather(*(
+        extract_transcript(name, text, video_for(name, videos), client, cache, version,
+                           template, semaphore, stats)
+        for name, text in transcripts))
+
+    entries = {}
+    for (name, _), found in zip(transcripts, results):
+        print(f"   ✅ {name}: {len(found)} entries")
+        for entry in found:
+            entries[entry["id"]] = entry
+        video = video_for(name, videos)
+        if video.get("url") and all(v.get("url") != video["url"] for v in videos):
+            videos.append({k: video[k] for k in ("title", "url") if video.get(k)})
+
+    posts = feedback["posts"]
+    replaced = sum(1 for p in posts if p["id"] in entries)
+    feedback["posts"] = [p for p in posts if p["id"] not in entries] + list(entries.values())
+    feedback["meta"].update(extracted=date.today().isoformat(), video_count=len(videos),
+                            videos=videos, prompt_version=version)
+
+    print(f"\n📊 {stats['chunks']} chunks: {stats['calls']} sent, {stats['cache_hits']} cached; "
+          f"{stats['invalid']} invalid entries, {stats['unparseable']} unparseable responses")
+    print(f"   {len(entries)} entries ({replaced} replaced, {len(entries) - replaced} new)")
+    if args.dry_run:
+        print("   Dry run: nothing written")
+        return
+    with open(args.output, 'w') as f:
+        json.dump(feedback, f, indent=2, ensure_ascii=False)
+    print(f"💾 Saved to: {args.output}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM extraction of YouTube transcript feedback")
+    parser.add_argument("transcripts", nargs="*", help="cleaned transcript names (default: all)")
+    parser.add_argument("--provider", choices=list(CLIENTS), default="anthropic")
+    parser.add_argument("--endpoint", default="https://api.anthropic.com")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--api-key-env", default="ANTHROPIC_API_KEY")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--output", default=str(OUTPUT_FILE))
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(run(parser.parse_args()))
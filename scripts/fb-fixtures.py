@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Record FB feed DOM fixtures and replay them offline to benchmark the scrapers.
+
+  python3 scripts/fb-fixtures.py record riders --scrolls 40    # live, needs FB cookies
+  python3 scripts/fb-fixtures.py replay riders                 # offline
+  python3 scripts/fb-fixtures.py replay riders --settle 0 --latency-ms 150
+
+record scrolls a source like a scan does and snapshots the articles that
+appear after every scroll (scripts and media stripped) into
+data/fb-fixtures/<name>/fixture.json, together with the page's stylesheets:
+innerText depends on computed visibility, so the replay has to hide what the
+live page hid. It also writes labels.json, one entry per post with its live
+key and the foils the catalog extracted; correct the foils by hand and set
+"labeled": true to make the entry count towards accuracy.
+
+replay serves the fixture from a local HTTP server as an infinite-scroll page
+(one recorded batch per load-more) and runs the unchanged scan loop
+(fb_scan.scan_source) against it. It reports posts per second, per-scroll
+latency, how many recorded posts came back with their live key, and
+extraction accuracy against labels.json, and saves the report as
+replay-report.json next to the fixture.
+"""
+
+import argparse
+import asyncio
+import html
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from playwright.async_api import async_playwright
+
+from fb_browser import LEAN_LAUNCH_ARGS, ContextPool, RateBudget
+from fb_page import MIN_TEXT_LENGTH
+from fb_scan import SOURCES, STEALTH_JS, scan_source
+from foil_catalog import get_catalog
+from scan_state import post_key
+
+FIXTURES_DIR = Path(__file__).parent.parent / "data" / "fb-fixtures"
+COOKIES_PATH = Path.home() / ".clawdbot/credentials/fb-cookies.json"
+
+SNAPSHOT_JS = """
+(minLength) => {
+    const out = [];
+    document.querySelectorAll('[role="article"]:not([data-axis-recorded])').forEach((el) => {
+        if (el.parentElement && el.parentElement.closest('[role="article"]')) return;
+        const text = el.innerText || '';
+        if (text.length < minLength) return;  // still a placeholder; retry next scroll
+        el.setAttribute('data-axis-recorded', '1');
+        const clone = el.cloneNode(true);
+        clone.querySelectorAll('script, img, svg, video, image, noscript')
+             .forEach((n) => n.remove());
+        const link = el.querySelector('a[href*="/posts/"], a[href*="/permalink/"], a[href*="story_fbid="]');
+        out.push({html: clone.outerHTML, text: text,
+                  post_url: link ? link.href.split('?')[0] : null});
+    });
+    return out;
+}
+"""
+
+# Same-origin sheets come back as text; cross-origin ones (static.xx.fbcdn.net) only as a URL
+STYLES_JS = """
+() => ({
+    htmlClass: document.documentElement.className,
+    sheets: Array.from(document.styleSheets).map((sheet) => {
+        try {
+            return {css: Array.from(sheet.cssRules).map((r) => r.cssText).join('\\n')};
+        } catch (e) {
+            return {href: sheet.href};
+        }
+    }),
+})
+"""
+
+# Infinite scroll: the next recorded batch is fetched whenever the reader nears the bottom
+REPLAY_PAGE = """<!doctype html>
+<html class="%s"><head><meta charset="utf-8"><title>fixture replay</title>
+<link rel="stylesheet" href="/styles.css"></head>
+<body><div id="feed" role="feed"></div><div style="height:1200px"></div>
+<script>
+(() => {
+  const total = %d;
+  let next = 0, loading = false;
+  const feed = document.getElementById('feed');
+  const more = () => {
+    if (loading || next >= total) return;
+    if (next > 0 && window.innerHeight + window.scrollY < document.body.scrollHeight - 1500) return;
+    loading = true;
+    fetch('/batch/' + next).then((r) => r.json()).then((items) => {
+      for (const html of items) {
+        const wrap = document.createElement('div');
+        wrap.innerHTML = html;
+        feed.appendChild(wrap);
+      }
+      next += 1;
+      loading = false;
+      more();
+    });
+  };
+  window.addEventListener('scroll', more, {passive: true});
+  more();
+})();
+</script></body></html>
+"""
+
+def fixture_dir(name):
+    return FIXTURES_DIR / name
+
+async def record_styles(page, context):
+    """All CSS the live page applies, as one stylesheet, plus the <html> class it keys off."""
+    found = await page.evaluate(STYLES_JS)
+    parts = []
+    for sheet in found["sheets"]:
+        if "css" in sheet:
+            parts.append(sheet["css"])
+        elif sheet.get("href"):
+            response = await context.request.get(sheet["href"])
+            if response.ok:
+                parts.append(await response.text())
+            else:
+                print(f"   ⚠️ Stylesheet {sheet['href']} returned {response.status}")
+    return "\n".join(parts), found["htmlClass"]
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+async def record(name, source, scrolls, settle_s):
+    spec = SOURCES[source]
+    catalog = get_catalog()
+    batches, labels = [], []
+    print(f"🎥 Recording {source} → {fixture_dir(name)}")
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=['--no-sandbox', '--disable-gpu']
+                                          + LEAN_LAUNCH_ARGS)
+        cookies = None
+        if COOKIES_PATH.exists():
+            with open(COOKIES_PATH) as f:
+                cookies = json.load(f)
+        pool = ContextPool(browser, size=1, cookies=cookies)
+        async with pool.context() as (context, _):
+            page = await context.new_page()
+            await page.add_init_script(STEALTH_JS)
+            await page.goto(spec["url"], wait_until='domcontentloaded', timeout=60000)
+            if "login" in page.url.lower():
+                raise SystemExit("❌ Not logged in. Refresh the FB cookies first.")
+            await asyncio.sleep(3)
+            for i in range(scrolls + 1):
+                if i:
+                    await page.evaluate("window.scrollBy(0, 700)")
+                    await asyncio.sleep(settle_s)
+                snapshot = await page.evaluate(SNAPSHOT_JS, MIN_TEXT_LENGTH)
+                batches.append([a["html"] for a in snapshot])
+                for article in snapshot:
+                    labels.append({
+                        "key": post_key(article),
+                        "post_url": article["post_url"],
+                        "text_head": article["text"][:160],
+                        "foils": catalog.extract(article["text"]),
+                        "labeled": False,
+                    })
+                if i % 10 == 0:
+                    print(f"   Scroll {i}: {sum(len(b) for b in batches)} articles recorded")
+            styles, html_class = await record_styles(page, context)
+        await browser.close()
+
+    out = fixture_dir(name)
+    out.mkdir(parents=True, exist_ok=True)
+    with open(out / "fixture.json", 'w') as f:
+        json.dump({"source": source, "url": spec["url"], "recorded_at": datetime.now().isoformat(),
+                   "html_class": html_class, "styles": styles, "batches": batches}, f, ensure_ascii=False)
+    labels_path = out / "labels.json"
+    if labels_path.exists():
+        print(f"   Kept existing {labels_path.name} (new draft not written)")
+    else:
+        with open(labels_path, 'w') as f:
+            json.dump({"posts": labels}, f, indent=2, ensure_ascii=False)
+    print(f"💾 Saved {len(batches)} batches / {len(labels)} articles to {out}")
+
+def start_server(batches, latency_ms, styles="", html_class=""):
+    """Serve the replay page, its stylesheet and its batches on an ephemeral localhost port."""
+    page = (REPLAY_PAGE % (html.escape(html_class), len(batches))).encode()
+    css = styles.encode()
+    encoded = [json.dumps(b).encode() for b in batches]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path in ("/", "/index.html"):
+                body, ctype = page, "text/html; charset=utf-8"
+            elif self.path == "/styles.css":
+                body, ctype = css, "text/css; charset=utf-8"
+            elif self.path.startswith("/batch/"):
+                try:
+                    body = encoded[int(self.path.rsplit("/", 1)[1])]
+                except (ValueError, IndexError):
+                    self.send_error(404)
+                    return
+                ctype = "application/json"
+                if latency_ms:
+                    time.sleep(latency_ms / 1000)
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def key_match(posts, labels):
+    """Share of recorded posts the replay found under their live key (1.0 = same innerText)."""
+    if not labels:
+        return None
+    found = {post_key(p) for p in posts}
+    return round(sum(l["key"] in found for l in labels) / len(labels), 3)
+
+def score(posts, labels):
+    """Post recall/precision by key and foil extraction accuracy on labeled posts."""
+    labeled = {l["key"]: l for l in labels if l.get("labeled")}
+    if not labeled:
+        return None
+    found = {post_key(p): p for p in posts}
+    matched = [k for k in found if k in labeled]
+    exact = tp = fp = fn = 0
+    for key in matched:
+        got, want = set(found[key]["foils_mentioned"]), set(labeled[key]["foils"])
+        exact += got == want
+        tp += len(got & want)
+        fp += len(got - want)
+        fn += len(want - got)
+    return {
+        "labeled_posts": len(labeled),
+        "post_recall": round(len(matched) / len(labeled), 3),
+        "foil_exact_match": round(exact / len(matched), 3) if matched else None,
+        "foil_precision": round(tp / (tp + fp), 3) if tp + fp else None,
+        "foil_recall": round(tp / (tp + fn), 3) if tp + fn else None,
+    }
+
+async def replay(name, settle_s, latency_ms, block_requests=True):
+    with open(fixture_dir(name) / "fixture.json") as f:
+        fixture = json.load(f)
+    labels_path = fixture_dir(name) / "labels.json"
+    labels = []
+    if labels_path.exists():
+        with open(labels_path) as f:
+            labels = json.load(f)["posts"]
+    batches = fixture["batches"]
+    if "styles" not in fixture:
+        print("   ⚠️ Fixture has no stylesheets (recorded before they were kept); "
+              "innerText and keys may differ from live. Re-record it.")
+    server = start_server(batches, latency_ms, fixture.get("styles", ""), fixture.get("html_class", ""))
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    spec = {"url": url, "max_scrolls": 4 * len(batches) + 10, "high_water_mark": False,
+            "load_settle_s": (0.5, 0.5), "settle_s": (settle_s, settle_s)}
+    scroll_ms, yields = [], []
+
+    def on_scroll(scroll, articles, new_posts, seconds):
+        scroll_ms.append(seconds * 1000)
+        yields.append(new_posts)
+
+    print(f"▶️  Replaying {name}: {len(batches)} batches, "
+          f"{sum(len(b) for b in batches)} articles from {url}")
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True, args=['--no-sandbox', '--disable-gpu']
+                                              + (LEAN_LAUNCH_ARGS if block_requests else []))
+            pool = ContextPool(browser, size=1, block_requests=block_requests)
+            # Budget high enough never to wait: the replay measures the scraper, not the pacing
+            budget = RateBudget(rate_per_s=1000, burst=1000)
+            started = time.monotonic()
+            result = await scan_source(name, spec, pool, budget, get_catalog(), on_scroll=on_scroll)
+            elapsed = time.monotonic() - started
+            await browser.close()
+    finally:
+        server.shutdown()
+
+    posts = result["posts"]
+    report = {
+        "fixture": name,
+        "replayed_at": datetime.now().isoformat(),
+        "settle_s": settle_s,
+        "latency_ms": latency_ms,
+        "posts": len(posts),
+        "scrolls": len(scroll_ms),
+        "elapsed_s": round(elapsed, 2),
+        "posts_per_s": round(len(posts) / elapsed, 2) if elapsed else None,
+        "scroll_ms": {
+            "p50": round(percentile(scroll_ms, 50), 1) if scroll_ms else None,
+            "p95": round(percentile(scroll_ms, 95), 1) if scroll_ms else None,
+            "max": round(max(scroll_ms), 1) if scroll_ms else None,
+        },
+        "posts_per_scroll": round(sum(yields) / len(yields), 2) if yields else None,
+        "key_match": key_match(posts, labels),
+        "accuracy": score(posts, labels),
+        "telemetry": result["telemetry"].summary(),
+    }
+    with open(fixture_dir(name) / "replay-report.json", 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print("\n" + "=" * 50)
+    print(f"📊 {report['posts']} posts in {report['elapsed_s']}s "
+          f"({report['posts_per_s']} posts/s, {report['scrolls']} scrolls)")
+    print(f"   Scroll latency p50 {report['scroll_ms']['p50']} ms, "
+          f"p95 {report['scroll_ms']['p95']} ms (settle {settle_s * 1000:.0f} ms)")
+    if report["key_match"] is not None:
+        print(f"   Live keys reproduced: {report['key_match']:.1%} of {len(labels)} recorded posts")
+    if report["accuracy"]:
+        acc = report["accuracy"]
+        print(f"   Accuracy on {acc['labeled_posts']} labeled posts: recall {acc['post_recall']}, "
+              f"foil exact {acc['foil_exact_match']}, foil P/R {acc['foil_precision']}/{acc['foil_recall']}")
+    else:
+        print("   No labeled posts yet (set \"labeled\": true in labels.json)")
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record and replay FB feed fixtures")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="snapshot a live feed (needs FB cookies)")
+    rec.add_argument("name")
+    rec.add_argument("--source", choices=list(SOURCES), default="axis_riders_group")
+    rec.add_argument("--scrolls", type=int, default=30)
+    rec.add_argument("--settle", type=float, default=2.5, help="seconds to wait after each scroll")
+    rep = sub.add_parser("replay", help="benchmark the scan loop against a fixture offline")
+    rep.add_argument("name")
+    rep.add_argument("--settle", type=float, default=0.3, help="seconds to wait after each scroll")
+    rep.add_argument("--latency-ms", type=int, default=0, help="simulated delay per load-more batch")
+    rep.add_argument("--no-block", action="store_true", help="disable request blocking")
+    args = parser.parse_args()
+    if args.command == "record":
+        asyncio.run(record(args.name, args.source, args.scrolls, args.settle))
+    else:
+        asyncio.run(replay(args.name, args.settle, args.latency_ms, block_requests=not args.no_block))
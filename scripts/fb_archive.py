@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Loader for the scheduled FB scan archives.
+
+Every scan writes its own JSON layout (meta/scan/scan_meta blocks,
+riders_group_posts vs riders_group.posts_in_window, poster vs author, ...).
+This module flattens any of them into one normalized post shape so the
+downstream tools (dedupe, archive store, indexes) don't each need to know
+every variant.
+"""
+
+import json
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+ARCHIVE_DIRS = [ROOT_DIR / "public" / "data" / "archives", ROOT_DIR / "archives"]
+
+# Keys whose post lists are nested comments/replies, not top-level posts
+COMMENT_KEY_HINTS = ("comment", "repl", "question", "unanswered")
+ISO_RE = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}')
+FB_ID_RE = re.compile(r'(?:permalink|posts|story_fbid=|pfbid)[/=]?([A-Za-z0-9]{10,})')
+FILENAME_DATE_RE = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})')
+TEXT_KEYS = ("text", "post_text", "content", "full_text", "message")
+
+def load_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ Could not load {path}: {e}")
+        return None
+
+def list_archive_files(dirs=None):
+    """All JSON scan archives, oldest file name first.
+
+    The same scan is sometimes copied into both archive dirs; the first
+    directory wins so it is only read once.
+    """
+    files = {}
+    for d in dirs or ARCHIVE_DIRS:
+        if Path(d).exists():
+            for p in Path(d).glob("*.json"):
+                files.setdefault(p.name, p)
+    return [files[name] for name in sorted(files)]
+
+def parse_timestamp(value):
+    """Parse an ISO-ish timestamp into an aware UTC datetime (or None)."""
+    if not isinstance(value, str) or not ISO_RE.match(value.strip()):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.strip().replace(' ', 'T', 1))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+def scan_timestamp(data, path=None):
+    """Best-effort scan time for an archive, as an ISO UTC string."""
+    candidates = []
+
+    def collect(obj, depth):
+        if depth > 2 or not isinstance(obj, dict):
+            return
+        for k, v in obj.items():
+            if isinstance(v, dict):
+                collect(v, depth + 1)
+            elif isinstance(v, str) and parse_timestamp(v):
+                key = k.lower()
+                if any(h in key for h in ('time', 'at', 'utc', 'iso', 'timestamp')):
+                    # Prefer explicit UTC / start-of-scan fields
+                    rank = 0 if 'utc' in key else 1
+                    candidates.append((rank, parse_timestamp(v)))
+
+    collect(data, 0)
+    if candidates:
+        candidates.sort(key=lambda c: c[0])
+        return candidates[0][1].strftime('%Y-%m-%dT%H:%M:%SZ')
+    if path is not None:
+        m = FILENAME_DATE_RE.search(Path(path).name)
+        if m:
+            return f"{m.group(1)}-{m.group(2)}-{m.group(3)}T00:00:00Z"
+    return None
+
+def extract_post_id(post):
+    """Global FB post id if the capture recorded one (not per-file ids like post_3)."""
+    pid = post.get("post_id")
+    if pid:
+        return str(pid)
+    for key in ("permalink", "post_url", "url", "link", "post_link_hint", "post_id_hint"):
+        value = post.get(key)
+        if isinstance(value, str):
+            if key == "post_id_hint":
+                return value
+            m = FB_ID_RE.search(value)
+            if m:
+                return m.group(1)
+    return None
+
+def _first(post, keys):
+    for k in keys:
+        v = post.get(k)
+        if v:
+            return v
+    return None
+
+def _foils(post):
+    foils = []
+    for key in ("foils_mentioned", "foils", "foil_mentioned", "products_mentioned",
+                "foils_or_gear_mentioned", "gear_mentioned", "equipment_mentioned"):
+        v = post.get(key)
+        if isinstance(v, list):
+            foils.extend(str(x) for x in v if isinstance(x, (str, int)))
+        elif isinstance(v, str):
+            foils.append(v)
+    return list(dict.fromkeys(foils))
+
+def post_text(post):
+    for key in TEXT_KEYS:
+        value = post.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return ""
+
+def normalize_post(post, source, scanned_at, archive):
+    return {
+        "post_id": extract_post_id(post),
+        "source": source,
+        "poster": _first(post, ("poster", "author", "name")),
+        "text": post_text(post),
+        "foils_mentioned": _foils(post),
+        "discipline": _first(post, ("discipline", "use_case")),
+        "sentiment": post.get("sentiment") if isinstance(post.get("sentiment"), str) else None,
+        "posted_at": _first(post, ("timestamp_approx", "timestamp", "date")),
+        "scanned_at": scanned_at,
+        "archive": archive,
+    }
+
+def iter_archive_posts(path, data=None):
+    """Yield normalized top-level posts from one archive file, whatever its schema."""
+    data = data if data is not None else load_json(path)
+    if not isinstance(data, dict):
+        return
+    scanned_at = scan_timestamp(data, path)
+    archive = Path(path).name
+
+    def walk(obj, keys):
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                if any(h in k.lower() for h in COMMENT_KEY_HINTS):
+                    continue
+                yield from walk(v, keys + (k,))
+        elif isinstance(obj, list):
+            for item in obj:
+                if isinstance(item, dict) and post_text(item):
+                    joined = " ".join(keys).lower()
+                    source = "axis_official_page" if "official" in joined else "axis_riders_group"
+                    yield normalize_post(item, source, scanned_at, archive)
+                else:
+                    yield from walk(item, keys)
+
+    yield from walk(data, ())
+
+def iter_all_archive_posts(dirs=None):
+    for path in list_archive_files(dirs):
+        yield from iter_archive_posts(path)
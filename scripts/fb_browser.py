@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Lean browser profile and request blocking for the Playwright FB scrapers.
+
+The scrapers only read article text, but Facebook pulls images, video,
+fonts, analytics and logging beacons with every scroll. RequestBlocker
+routes every request of a context, aborts the configured resource types
+and tracker domains, and counts what was blocked and how many bytes the
+allowed requests transferred:
+
+    context = await browser.new_context(**lean_context_options())
+    blocker = RequestBlocker()
+    await blocker.install(context)
+    ...
+    meta["network"] = await blocker.report()
+
+Scans that read several sources at once share one browser through a
+ContextPool (a bounded number of live contexts) and pace every navigation
+and scroll through one RateBudget, so running sources in parallel does not
+multiply the load we put on Facebook.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+# Stylesheets stay allowed: innerText depends on computed visibility
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "imageset", "texttrack",
+                                    "beacon", "csp_report", "ping"})
+TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "connect.facebook.net", "pixel.facebook.com",
+    "an.facebook.com", "scorecardresearch.com", "hotjar.com",
+)
+# Facebook's own logging endpoints (path prefixes)
+BLOCKED_PATHS = ("/ajax/bz", "/ajax/bnzai", "/security/hsts-pixel", "/tr/", "/tr?")
+
+LEAN_LAUNCH_ARGS = [
+    '--blink-settings=imagesEnabled=false',
+    '--autoplay-policy=user-gesture-required',
+    '--mute-audio',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--no-first-run',
+]
+
+def lean_context_options(**overrides):
+    """new_context() kwargs for a low-overhead scraping context."""
+    options = {
+        "viewport": {'width': 1280, 'height': 900},
+        "reduced_motion": "reduce",
+        "service_workers": "block",
+        "locale": "en-US",
+    }
+    options.update(overrides)
+    return options
+
+class RequestBlocker:
+    def __init__(self, block_types=BLOCKED_RESOURCE_TYPES, block_domains=TRACKER_DOMAINS,
+                 block_paths=BLOCKED_PATHS, enabled=True):
+        self.block_types = frozenset(block_types)
+        self.block_domains = tuple(block_domains)
+        self.block_paths = tuple(block_paths)
+        self.enabled = enabled
+        self.requests = 0
+        self.blocked = {}
+        self.bytes_transferred = 0
+        self._pending = set()
+
+    def should_block(self, resource_type, url):
+        """Reason to block a request ("image", "tracker", ...) or None to let it through."""
+        if resource_type in self.block_types:
+            return resource_type
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        if any(host == d or host.endswith("." + d) for d in self.block_domains):
+            return "tracker"
+        path = parts.path + ("?" if parts.query else "")
+        if path.startswith(self.block_paths):
+            return "logging"
+        return None
+
+    async def _route(self, route):
+        request = route.request
+        self.requests += 1
+        reason = self.should_block(request.resource_type, request.url) if self.enabled else None
+        if reason:
+            self.blocked[reason] = self.blocked.get(reason, 0) + 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _measure(self, request):
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self.bytes_transferred += (sizes.get("responseBodySize", 0) +
+                                   sizes.get("responseHeadersSize", 0) +
+                                   sizes.get("requestHeadersSize", 0) +
+                                   sizes.get("requestBodySize", 0))
+
+    def _on_finished(self, request):
+        task = asyncio.ensure_future(self._measure(request))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def install(self, context):
+        await context.route("**/*", self._route)
+        context.on("requestfinished", self._on_finished)
+
+    async def report(self):
+        """Network summary for the scan meta block."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        blocked = sum(self.blocked.values())
+        return {
+            "requests": self.requests,
+            "blocked": blocked,
+            "blocked_by_reason": dict(sorted(self.blocked.items(), key=lambda kv: -kv[1])),
+            "bytes_transferred": self.bytes_transferred,
+            "blocking_enabled": self.enabled,
+        }
+
+class RateBudget:
+    """Token bucket shared by every page of a scan: one token per navigation or scroll."""
+
+    def __init__(self, rate_per_s=1.0, burst=2):
+        self.rate = rate_per_s
+        self.burst = burst
+        self.tokens = float(burst)
+        self.acquired = 0
+        self.waited_s = 0.0
+        self._updated = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # The lock is held while sleeping, so waiters are served in arrival order
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._updated is not None:
+                self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self.tokens < 1:
+                wait = (1 - self.tokens) / self.rate
+                await asyncio.sleep(wait)
+                self.waited_s += wait
+                self.tokens = 1.0
+                self._updated = loop.time()
+            self.tokens -= 1
+            self.acquired += 1
+
+    def report(self):
+        return {"rate_per_s": self.rate, "burst": self.burst, "actions": self.acquired,
+                "waited_s": round(self.waited_s, 1)}
+
+class ContextPool:
+    """At most `size` live contexts on one browser; each gets its own RequestBlocker."""
+
+    def __init__(self, browser, size=3, block_requests=True, cookies=None, **context_options):
+        self.browser = browser
+        self.size = size
+        self.block_requests = block_requests
+        self.cookies = cookies
+        self.context_options = (lean_context_options(**context_options) if block_requests
+                                else context_options)
+        self._slots = asyncio.Semaphore(size)
+
+    @asynccontextmanager
+    async def context(self):
+        """Yields (context, blocker); read blocker.report() before leaving the block."""
+        async with self._slots:
+            context = await self.browser.new_context(**self.context_options)
+            try:
+                blocker = RequestBlocker(enabled=self.block_requests)
+                await blocker.install(context)
+                if self.cookies:
+                    await context.add_cookies(self.cookies)
+                yield context, blocker
+            finally:
+                await context.close()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+In-page article extraction for the Playwright Facebook scrapers.
+
+Calling query_selector_all('[role="article"]') and awaiting inner_text() on
+every handle after each scroll costs one round-trip per node and re-reads
+every article seen so far, so a deep scrape goes quadratic. Instead a
+MutationObserver is installed in the page; it queues articles as Facebook
+inserts them, and drain_articles() serializes only the queued ones in a
+single page.evaluate round-trip. Articles still too short to be a post
+after a few drains are set aside, and queued again when Facebook adds
+content inside them.
+
+    await install_article_observer(page)
+    while scrolling:
+        await page.evaluate("window.scrollBy(0, 500)")
+        for article in await drain_articles(page):
+            ...  # {"text", "post_url", "nested"}
+"""
+
+import asyncio
+
+MIN_TEXT_LENGTH = 50
+# Drains an article may stay queued while Facebook is still filling it in;
+# after that it is set aside until nodes are added inside it again
+MAX_PENDING_DRAINS = 3
+
+INSTALL_OBSERVER_JS = """
+() => {
+    if (window.__axisArticles) return window.__axisArticles.queue.length;
+    // timing: cumulative in-page ms, read by scan_telemetry's page samples
+    const state = {queue: [], known: new WeakSet(), observer: null,
+                   timing: {observe_ms: 0, query_ms: 0, text_ms: 0, drains: 0}};
+    const enqueue = (el) => {
+        if (!state.known.has(el)) {
+            state.known.add(el);
+            state.queue.push(el);
+        }
+    };
+    const scan = (node) => {
+        if (node.nodeType !== 1) return;
+        if (node.matches('[role="article"]')) enqueue(node);
+        node.querySelectorAll('[role="article"]').forEach(enqueue);
+    };
+    scan(document.body);
+    state.observer = new MutationObserver((mutations) => {
+        const t0 = performance.now();
+        for (const m of mutations) {
+            m.addedNodes.forEach(scan);
+            // Content filled into an article that was set aside while still short
+            const host = m.target.nodeType === 1 ? m.target.closest('[role="article"]') : null;
+            if (host) enqueue(host);
+        }
+        state.timing.observe_ms += performance.now() - t0;
+    });
+    state.observer.observe(document.body, {childList: true, subtree: true});
+    window.__axisArticles = state;
+    return state.queue.length;
+}
+"""
+
+DRAIN_JS = """
+([minLength, maxPending]) => {
+    const state = window.__axisArticles;
+    if (!state) return [];
+    const out = [];
+    const pending = [];
+    const timing = state.timing;
+    timing.drains += 1;
+    for (const el of state.queue) {
+        if (!el.isConnected) continue;
+        let t0 = performance.now();
+        const text = el.innerText || '';
+        timing.text_ms += performance.now() - t0;
+        if (text.length < minLength) {
+            // Placeholder skeletons get filled in after insertion; retry a few drains,
+            // then forget the article so the observer re-queues it once it hydrates
+            el.__axisTries = (el.__axisTries || 0) + 1;
+            if (el.__axisTries < maxPending) {
+                pending.push(el);
+            } else {
+                el.__axisTries = 0;
+                state.known.delete(el);
+            }
+            continue;
+        }
+        t0 = performance.now();
+        const link = el.querySelector('a[href*="/posts/"], a[href*="/permalink/"], a[href*="story_fbid="]');
+        const nested = !!(el.parentElement && el.parentElement.closest('[role="article"]'));
+        timing.query_ms += performance.now() - t0;
+        out.push({
+            text: text,
+            post_url: link ? link.href.split('?')[0] : null,
+            nested: nested,
+        });
+    }
+    state.queue = pending;
+    return out;
+}
+"""
+
+async def install_article_observer(page):
+    """Start queueing articles in page; returns how many were already present."""
+    return await page.evaluate(INSTALL_OBSERVER_JS)
+
+async def drain_articles(page, min_length=MIN_TEXT_LENGTH):
+    """Articles added since the last drain, serialized in one round-trip."""
+    return await page.evaluate(DRAIN_JS, [min_length, MAX_PENDING_DRAINS])
+
+async def restore_scroll(page, target_y, settle_s=0.8, max_stalls=5):
+    """Scroll back down to target_y after a reload (the feed only grows as it scrolls)."""
+    stalls, last_y = 0, -1
+    while stalls < max_stalls:
+        y = await page.evaluate("window.scrollY")
+        if y >= target_y:
+            break
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await asyncio.sleep(settle_s)
+        stalls = stalls + 1 if y == last_y else 0
+        last_y = y
+    return await page.evaluate("window.scrollY")
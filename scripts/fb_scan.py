@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Per-source FB scanning shared by scan-fb-sources.py and the offline replay
+harness (fb-fixtures.py).
+
+scan_source() opens one pooled context, loads a source, scrolls until its
+high-water mark / scroll budget / idle limit, and returns the new posts with
+per-source stats. merge_results() combines several sources into one scan
+record. The timing knobs live in the source spec (load_settle_s, settle_s) so
+a replay can run the same loop without human-paced delays. Every step of
+the loop is timed (scan_telemetry.py): each source's summary goes into its
+stats and the merged histograms into the scan block's "telemetry".
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime
+
+from fb_archive import FB_ID_RE
+from fb_page import drain_articles, install_article_observer
+from scan_state import HighWaterMark, post_key
+from scan_telemetry import Telemetry
+
+SEARCH_SCROLLS = 15
+# Screens with no new articles before a source gives up
+MAX_IDLE_SCROLLS = 6
+# Human-paced waits (seconds) after the first load and after each scroll
+LOAD_SETTLE_S = (2.0, 4.0)
+SCROLL_SETTLE_S = (1.5, 3.0)
+
+SOURCES = {
+    "axis_riders_group": {
+        "url": "https://www.facebook.com/groups/axisfoilriders?sorting_setting=CHRONOLOGICAL",
+        "max_scrolls": 60,
+        "initial_scrolls": 20,
+        "high_water_mark": True,
+    },
+    "axis_official_page": {
+        "url": "https://www.facebook.com/axisfoils",
+        "max_scrolls": 25,
+        "initial_scrolls": 10,
+        "high_water_mark": True,
+    },
+    "surge_search": {
+        "url": "https://www.facebook.com/groups/axisfoilriders/search/?q=surge",
+        "query": "surge",
+        "max_scrolls": SEARCH_SCROLLS,
+        "high_water_mark": False,
+    },
+}
+
+STEALTH_JS = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+"""
+
+def make_post(article, catalog):
+    m = FB_ID_RE.search(article.get("post_url") or "")
+    return {
+        "post_id": m.group(1) if m else None,
+        "post_url": article.get("post_url"),
+        "text": article["text"],
+        "foils_mentioned": catalog.extract(article["text"]),
+        "scraped_at": datetime.now().isoformat(),
+    }
+
+async def scan_source(name, spec, pool, budget, catalog, on_scroll=None):
+    """Scroll one source in its own pooled context; returns its posts and stats.
+
+    on_scroll(scroll, articles, new_posts, seconds) is called after each scroll
+    with the drained articles, how many became posts, and the scroll's wall time.
+    """
+    started = time.monotonic()
+    telemetry = Telemetry()
+    mark = HighWaterMark(name) if spec["high_water_mark"] else None
+    max_scrolls = spec["max_scrolls"]
+    if mark and not mark.has_mark:
+        max_scrolls = spec["initial_scrolls"]
+    posts, keys = [], set()
+    scrolls = idle = 0
+    reached_mark = False
+
+    async with pool.context() as (context, blocker):
+        waited_for_slot = time.monotonic() - started
+        page = await context.new_page()
+        await page.add_init_script(STEALTH_JS)
+        with telemetry.timer("rate_wait"):
+            await budget.acquire()
+        with telemetry.timer("page_load"):
+            await page.goto(spec["url"], wait_until='domcontentloaded', timeout=60000)
+        if "login" in page.url.lower():
+            raise RuntimeError(f"not logged in (landed on {page.url})")
+        with telemetry.timer("load_settle"):
+            await asyncio.sleep(random.uniform(*spec.get("load_settle_s", LOAD_SETTLE_S)))
+        with telemetry.timer("install_observer"):
+            await install_article_observer(page)
+
+        while scrolls < max_scrolls and idle < MAX_IDLE_SCROLLS and not reached_mark:
+            scroll_started = time.monotonic()
+            posts_before = len(posts)
+            with telemetry.timer("rate_wait"):
+                await budget.acquire()
+            with telemetry.timer("scroll"):
+                await page.evaluate(f"window.scrollBy(0, {random.randint(400, 800)})")
+            with telemetry.timer("scroll_wait"):
+                await asyncio.sleep(random.uniform(*spec.get("settle_s", SCROLL_SETTLE_S)))
+            with telemetry.timer("drain"):
+                articles = await drain_articles(page)
+            telemetry.observe("articles_per_drain", len(articles))
+            idle = 0 if articles else idle + 1
+            scrolls += 1
+            for article in articles:
+                if article["nested"]:
+                    continue
+                if mark:
+                    if mark.reached(article):
+                        reached_mark = True
+                        break
+                    if post_key(article) in mark.known:
+                        continue
+                key = post_key(article)
+                if key not in keys:
+                    keys.add(key)
+                    with telemetry.timer("extract"):
+                        posts.append(make_post(article, catalog))
+            telemetry.observe("new_posts_per_scroll", len(posts) - posts_before)
+            await telemetry.sample_page(page, scrolls)
+            if on_scroll:
+                on_scroll(scrolls, articles, len(posts) - posts_before,
+                          time.monotonic() - scroll_started)
+        await telemetry.sample_page(page)
+        network = await blocker.report()
+
+    if mark:
+        mark.save()
+    print(f"   ✅ {name}: {len(posts)} posts in {scrolls} scrolls "
+          f"({time.monotonic() - started:.0f}s)")
+    return {
+        "posts": posts,
+        "telemetry": telemetry,
+        "stats": {
+            "posts": len(posts),
+            "scrolls": scrolls,
+            "reached_mark": reached_mark if mark else None,
+            "waited_for_context_s": round(waited_for_slot, 1),
+            "duration_s": round(time.monotonic() - started, 1),
+            "network": network,
+            "telemetry": telemetry.summary(buckets=False),
+        },
+    }
+
+def merge_results(names, results, started_at, duration_s, pool_size, budget):
+    """One scan record: a section per source plus a scan block with per-source stats."""
+    record = {"scan": {
+        "timestamp": started_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        "status": "completed",
+        "duration_s": round(duration_s, 1),
+        "pool_size": pool_size,
+        "rate_budget": budget.report(),
+        "sources": {},
+        "failures": [],
+    }}
+    owner = {}
+    telemetries = []
+    for name, result in zip(names, results):
+        spec = SOURCES[name]
+        section = {"url": spec["url"]}
+        if "query" in spec:
+            section["query"] = spec["query"]
+        if isinstance(result, BaseException):
+            record["scan"]["failures"].append({"source": name, "error": f"{type(result).__name__}: {result}"})
+            record["scan"]["sources"][name] = {"posts": 0, "error": str(result)}
+            section["posts_in_window"] = []
+            record[name] = section
+            continue
+        kept = []
+        duplicates = 0
+        for post in result["posts"]:
+            key = post["post_id"] or post_key(post)
+            if key in owner:
+                duplicates += 1
+                continue
+            owner[key] = name
+            kept.append(post)
+        section["posts_in_window"] = kept
+        telemetries.append(result["telemetry"])
+        stats = dict(result["stats"], posts=len(kept), duplicates_dropped=duplicates)
+        record["scan"]["sources"][name] = stats
+        record[name] = section
+    if telemetries:
+        record["scan"]["telemetry"] = Telemetry.merged(telemetries).summary()
+    failures = len(record["scan"]["failures"])
+    if failures == len(names):
+        record["scan"]["status"] = "failed"
+    elif failures:
+        record["scan"]["status"] = "completed_with_limits"
+    return record
+
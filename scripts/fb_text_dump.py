@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Streaming segmenter for raw FB text dumps (copy-paste or OCR of a feed or a
+group search, like data/fb-surge-search-raw.txt).
+
+    for post in iter_dump_posts("data/fb-surge-search-raw.txt"):
+        post["author"], post["posted_at_raw"], post["text"], post["comments"]
+
+The dump is read one line at a time with a single line of lookahead. A post
+starts at a short name-like line followed by a timestamp line ("January 9
+8:38 AM", "3d", "Yesterday at 9:12", tolerant of OCR damage like "Febrary 1a
+210M"). The action bar (Like / Comment / Send) closes the post body; text
+after it that ends in a reply or relative time is a comment. UI chrome
+(reaction summaries, search filters, "See more", the lines clean_text() in
+build-feedback-db.py strips) is dropped. Page-break markers from multi-page
+captures do not end a post, so a post split across screenshots stays whole.
+
+Only the current post is held in memory, so memory is bounded by the
+longest post, not by the dump.
+"""
+
+import re
+from difflib import SequenceMatcher
+
+PAGE_BREAK = "---PAGE BREAK---"
+MONTHS = ("january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december")
+# OCR mangles month names ("Febrary", "sanuary", "Janay"); this is the SequenceMatcher ratio
+MONTH_MATCH = 0.6
+MAX_AUTHOR_CHARS = 40
+MAX_AUTHOR_WORDS = 5
+
+RELATIVE_TIME_RE = re.compile(
+    r'^\W*(\d{1,2}\s*(m|min|mins|h|hr|hrs|hours?|d|days?|w|wk|weeks?|y|yr|years?)'
+    r'(\s+ago)?|just now|yesterday( at [\d:]+\s*[ap]?m?)?)\W*$', re.I)
+# Like / Comment / Send, as typed or as OCR'd ("tke Q comment F send", "Uke Q comme")
+ACTION_BAR_RE = re.compile(r'\bq\s+comm?|\bcomm\w*\s+\W?\w?\W?\s*s[eo]nd\b|'
+                           r'^\W*\w{0,3}\s*(like|ike|lke|tke|uke)\W*$', re.I)
+# "You, Mike Ross and 46 others  5 comments", or the reaction icons OCR'd as "©"
+REACTIONS_RE = re.compile(r'\band\s+\d+(\s+oth\w*)?\W*$|\bothe(rs?)?\b|'
+                          r'\d+\s*c[aoe][nm]+[em]*[eo]?n\w*\b|^\W{0,2}©\w{0,2}\s.*,', re.I)
+HEADER_LINES = {"search results", "filters", "recent posts", "posts you've seen",
+                "posts youve seen", "date posted", "posts from", "tagged location",
+                "following", "follow", "see more", "see less", "like", "reply", "comment", "share", "send",
+                "write a comment...", "most relevant", "all comments", "newest"}
+BADGE_PREFIXES = ("top contributor", "group expert", "rising contributor", "admin", "moderator",
+                  "author")
+REPLY_RE = re.compile(r'^\W*(\d{1,2}\s*[mhdwy]\s+)?(like\s+)?reply\W*$', re.I)
+NAME_TOKEN_RE = re.compile(r"^[A-Z][\w'’.-]*$")
+
+def _alpha(line):
+    return re.sub(r'[^a-z ]', '', line.lower()).strip()
+
+def is_timestamp(line) -> bool:
+    if RELATIVE_TIME_RE.match(line):
+        return True
+    if len(line) > 32 or not re.search(r'\d', line):
+        return False
+    m = re.match(r'^\W*([A-Za-z]+)', line)
+    if not m:
+        return False
+    word = m.group(1).lower()
+    return len(word) >= 4 and any(SequenceMatcher(None, word, month).ratio() >= MONTH_MATCH
+                                  for month in MONTHS)
+
+def clean_author(line):
+    """Strip OCR'd badges and icons around a name line ("‘Shannon Stent", "Robert Sellar S")."""
+    words = re.sub(r"^[^\w]+", "", line).split()
+    while words and (len(words[-1]) <= 2 or not re.search(r'[A-Za-z]{2}', words[-1])):
+        words.pop()
+    return " ".join(words)
+
+def is_author(line) -> bool:
+    name = clean_author(line)
+    words = name.split()
+    if not words or len(name) > MAX_AUTHOR_CHARS or len(words) > MAX_AUTHOR_WORDS:
+        return False
+    if is_chrome(line) or is_timestamp(line):
+        return False
+    return sum(bool(NAME_TOKEN_RE.match(w)) for w in words) >= max(1, len(words) - 1)
+
+def is_chrome(line) -> bool:
+    low = line.strip().lower()
+    alpha = _alpha(line)
+    if not alpha or alpha in HEADER_LINES or low in HEADER_LINES:
+        return True
+    if low.startswith(BADGE_PREFIXES) or alpha.startswith(("see m", "see l")) and len(alpha) <= 9:
+        return True
+    # clean_text()'s short time indicators ("3d", "1w")
+    if len(low) <= 3 and any(c in low for c in 'dwmhy'):
+        return True
+    words = line.split()
+    if ACTION_BAR_RE.search(line) and len(words) <= 8:
+        return True
+    return bool(REACTIONS_RE.search(line)) and len(words) <= 14
+
+class _Post:
+    __slots__ = ("author", "posted_at_raw", "lines", "comments", "pending", "closed",
+                 "page", "line_no")
+
+    def __init__(self, author, posted_at_raw, page, line_no):
+        self.author = author
+        self.posted_at_raw = posted_at_raw
+        self.lines = []
+        self.comments = []
+        self.pending = []
+        self.closed = False
+        self.page = page
+        self.line_no = line_no
+
+    def feed(self, line):
+        if ACTION_BAR_RE.search(line) and len(line.split()) <= 8:
+            self.closed = True
+            self.pending = []
+            return
+        if REPLY_RE.match(line) or (self.closed and RELATIVE_TIME_RE.match(line)):
+            self.end_comment()
+            return
+        if is_chrome(line):
+            return
+        (self.pending if self.closed else self.lines).append(line)
+
+    def end_comment(self):
+        if not self.pending:
+            return
+        author = None
+        if len(self.pending) > 1 and is_author(self.pending[0]):
+            author = clean_author(self.pending[0])
+            self.pending = self.pending[1:]
+        self.comments.append({"author": author, "text": " ".join(self.pending)})
+        self.pending = []
+
+    def to_dict(self, catalog=None):
+        text = " ".join(self.lines)
+        post = {
+            "author": self.author,
+            "posted_at_raw": self.posted_at_raw,
+            "text": text,
+            "comments": self.comments,
+            "page": self.page,
+            "line": self.line_no,
+        }
+        if catalog is not None:
+            post["foils_mentioned"] = catalog.extract(
+                text + " " + " ".join(c["text"] for c in self.comments))
+        return post
+
+def iter_dump_lines(source):
+    if isinstance(source, str) or hasattr(source, "__fspath__"):
+        with open(source, encoding="utf-8", errors="replace") as f:
+            yield from f
+    else:
+        yield from source
+
+def iter_dump_posts(source, catalog=None, min_chars=20):
+    """Yield structured posts from a raw dump (path or iterable of lines), in order.
+
+    With a foil_catalog.FoilCatalog, each post also gets "foils_mentioned".
+    Posts whose body is shorter than min_chars (image-only, cut off) are skipped.
+    """
+    post = None
+    held = None      # one line of lookahead: (line_no, text) not yet assigned
+    page = 0
+
+    def emit(p):
+        if p is None:
+            return None
+        # Text after the action bar with no reply/time line is feed noise, not a comment
+        out = p.to_dict(catalog)
+        return out if len(out["text"]) >= min_chars else None
+
+    for line_no, raw in enumerate(iter_dump_lines(source), 1):
+        line = raw.strip()
+        if not line:
+            continue
+        if line == PAGE_BREAK:
+            page += 1
+            continue
+        if held and is_timestamp(line) and is_author(held[1]):
+            done = emit(post)
+            if done:
+                yield done
+            post = _Post(clean_author(held[1]), line, page, held[0])
+            held = None
+            continue
+        if held and post:
+            post.feed(held[1])
+        held = (line_no, line)
+    if held and post:
+        post.feed(held[1])
+    done = emit(post)
+    if done:
+        yield done
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+BM25 inverted index over rider feedback.
+
+The serialized index (public/data/feedback-index.json) holds a small doc
+table plus one postings list per term. Each postings list is a run of
+varint pairs (doc-id gap, term frequency), base64 encoded, so it can be
+served statically and decoded lazily per query term.
+
+Foil mentions are indexed as canonical ids from foil_catalog in addition
+to the plain words, so "FB1750" in a query finds posts that wrote
+"Fireball 1750".
+
+    from feedback_search import FeedbackIndex
+    index = FeedbackIndex.load()
+    for hit in index.search("fireball 1750 pumping", k=5):
+        print(hit["score"], hit["id"], hit["file"])
+"""
+
+import base64
+import heapq
+import json
+import math
+import re
+from datetime import datetime
+from pathlib import Path
+
+from foil_catalog import get_catalog
+
+PUBLIC_DIR = Path(__file__).parent.parent / "public" / "data"
+INDEX_FILE = PUBLIC_DIR / "feedback-index.json"
+FEEDBACK_FILES = ("facebook-riders-feedback.json", "youtube-feedback.json",
+                  "survey-feedback.json", "yvon-feedback.json")
+INDEX_VERSION = 1
+K1 = 1.2
+B = 0.75
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+a an and are as at be but by for from had has have i i'm if in into is it its just me my
+of on or so than that the their then there these they this to too was we were what when
+which while who will with you your im ive it's
+""".split())
+
+def _normalize_word(word):
+    # Cheap plural folding: "foils" → "foil", keeps "mass", "plus"
+    if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+def tokenize(text):
+    """Index terms for text: normalized words plus canonical foil ids."""
+    if not text:
+        return []
+    words = [_normalize_word(w) for w in WORD_RE.findall(text.lower())
+             if w not in STOPWORDS and len(w) > 1]
+    return words + get_catalog().extract(text, include_uncatalogued=True)
+
+def doc_text(post):
+    """Searchable text of a feedback post."""
+    parts = [post.get("text") or "", post.get("key_insight") or ""]
+    parts.extend(str(f) for f in post.get("foils_mentioned") or [])
+    return ' '.join(p for p in parts if p)
+
+# ── postings codec ────────────────────────────────────────────
+
+def _put_varint(out, n):
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+def encode_postings(postings):
+    """[(doc, tf), ...] sorted by doc → base64 varint (gap, tf) pairs."""
+    out = bytearray()
+    prev = 0
+    for doc, tf in postings:
+        _put_varint(out, doc - prev)
+        _put_varint(out, tf)
+        prev = doc
+    return base64.b64encode(bytes(out)).decode('ascii')
+
+def decode_postings(blob):
+    raw = base64.b64decode(blob)
+    values, n, shift = [], 0, 0
+    for byte in raw:
+        n |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(n)
+            n, shift = 0, 0
+    postings, doc = [], 0
+    for i in range(0, len(values), 2):
+        doc += values[i]
+        postings.append((doc, values[i + 1]))
+    return postings
+
+# ── build ─────────────────────────────────────────────────────
+
+def build_index(data_dir=PUBLIC_DIR, files=FEEDBACK_FILES):
+    """Index every post in files; a post id seen in an earlier file is skipped."""
+    doc_ids, doc_files, doc_lens = [], [], []
+    seen = set()
+    postings = {}
+    for file_no, name in enumerate(files):
+        path = Path(data_dir) / name
+        if not path.exists():
+            continue
+        with open(path) as f:
+            posts = json.load(f).get("posts", [])
+        for post in posts:
+            pid = post.get("id")
+            if not pid or pid in seen:
+                continue
+            seen.add(pid)
+            terms = tokenize(doc_text(post))
+            if not terms:
+                continue
+            doc = len(doc_ids)
+            doc_ids.append(pid)
+            doc_files.append(file_no)
+            doc_lens.append(len(terms))
+            counts = {}
+            for t in terms:
+                counts[t] = counts.get(t, 0) + 1
+            for t, tf in counts.items():
+                postings.setdefault(t, []).append((doc, tf))
+
+    return {
+        "meta": {
+            "version": INDEX_VERSION,
+            "built_at": datetime.now().isoformat(),
+            "k1": K1,
+            "b": B,
+            "files": list(files),
+            "doc_count": len(doc_ids),
+            "avg_doc_len": round(sum(doc_lens) / len(doc_lens), 3) if doc_lens else 0,
+            "encoding": "base64 varint (doc gap, tf) pairs",
+        },
+        "docs": {"ids": doc_ids, "files": doc_files, "lens": doc_lens},
+        "terms": {t: [len(p), encode_postings(p)] for t, p in sorted(postings.items())},
+    }
+
+# ── query ─────────────────────────────────────────────────────
+
+class FeedbackIndex:
+    def __init__(self, data):
+        self.meta = data["meta"]
+        self.doc_ids = data["docs"]["ids"]
+        self.doc_files = data["docs"]["files"]
+        self.doc_lens = data["docs"]["lens"]
+        self.terms = data["terms"]
+        self.k1 = self.meta["k1"]
+        self.b = self.meta["b"]
+        self.avg_len = self.meta["avg_doc_len"] or 1
+        self._decoded = {}
+
+    @classmethod
+    def load(cls, path=INDEX_FILE):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def postings(self, term):
+        if term not in self._decoded:
+            entry = self.terms.get(term)
+            self._decoded[term] = decode_postings(entry[1]) if entry else []
+        return self._decoded[term]
+
+    def idf(self, term):
+        df = self.terms[term][0] if term in self.terms else 0
+        n = len(self.doc_ids)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def search(self, query, k=10, files=None):
+        """Top-k posts by BM25 score, optionally restricted to some source files."""
+        allowed = None
+        if files:
+            names = self.meta["files"]
+            allowed = {names.index(f) for f in files if f in names}
+        scores = {}
+        for term in dict.fromkeys(tokenize(query)):
+            idf = self.idf(term)
+            for doc, tf in self.postings(term):
+                if allowed is not None and self.doc_files[doc] not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lens[doc] / self.avg_len)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        top = heapq.nlargest(k, scores.items(), key=lambda kv: kv[1])
+        return [{"id": self.doc_ids[doc], "file": self.meta["files"][self.doc_files[doc]],
+                 "score": round(score, 4)} for doc, score in top]
+
+    def hydrate(self, hits, data_dir=PUBLIC_DIR):
+        """Attach the full post records to search hits (loads each source file once)."""
+        by_file = {}
+        for hit in hits:
+            by_file.setdefault(hit["file"], set()).add(hit["id"])
+        posts = {}
+        for name, ids in by_file.items():
+            with open(Path(data_dir) / name) as f:
+                for post in json.load(f).get("posts", []):
+                    if post.get("id") in ids:
+                        posts[post["id"]] = post
+        return [dict(hit, post=posts.get(hit["id"])) for hit in hits]
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Shared AXIS front-wing alias registry.
+
+Riders write the same wing a dozen ways: "FB1750", "Fireball 1750",
+"ART 939 V2", "999v2", "Art Pro 1201", "PNGv2 1200". Every build stage that
+counts or groups foil mentions should resolve them through here, so the
+canonical ids (e.g. "fireball-1750", "art-v2-939") line up across artifacts
+and with the official catalog in axis-products.json.
+"""
+
+import json
+import re
+from pathlib import Path
+
+PRODUCTS_FILE = Path(__file__).parent.parent / "public" / "data" / "axis-products.json"
+
+# Canonical series name -> id prefix
+SERIES_IDS = {
+    "ART": "art", "ART v2": "art-v2", "ARTPRO": "artpro", "HPS": "hps", "BSC": "bsc",
+    "PNG": "png", "PNG v2": "png-v2", "SP": "sp", "Spitfire": "spitfire",
+    "Fireball": "fireball", "Surge": "surge", "Tempo": "tempo",
+}
+
+# Spelling variants -> base series (version suffix handled separately)
+SERIES_PATTERN = (r'art\s*-?\s*pro|artpro|ap|art|hps|bsc|png|spit\s*fire|spirt\s*fire|spit|'
+                  r'fireball|fb|surge|tempo|sp')
+SERIES_BASE = {"artpro": "ARTPRO", "ap": "ARTPRO", "art": "ART", "hps": "HPS", "bsc": "BSC",
+               "png": "PNG", "spitfire": "Spitfire", "spirtfire": "Spitfire", "spit": "Spitfire",
+               "fireball": "Fireball", "fb": "Fireball",
+               "surge": "Surge", "tempo": "Tempo", "sp": "SP"}
+
+MENTION_RE = re.compile(
+    r'\b(?P<series>' + SERIES_PATTERN + r')\s*-?\s*(?P<v1>v\s*[12]\b)?\s*'
+    r'(?P<area>\d{3,4})(?P<b>b)?\s*(?P<v2>v\s*[12]\b)?',
+    re.IGNORECASE)
+# Size first: "960 Spitfire", "1300 PNG V2"
+REVERSED_RE = re.compile(
+    r'\b(?P<area>\d{3,4})(?P<b>b)?\s*(?P<series>' + SERIES_PATTERN + r')\b\s*(?P<v2>v\s*[12]\b)?',
+    re.IGNORECASE)
+# "Surge 830, 890 and 1010" → one mention per size
+SIZE_LIST_RE = re.compile(
+    r'\b(?P<series>' + SERIES_PATTERN + r')(?P<first>\s*-?\s*(?:v\s*[12]\s*)?\d{3,4})'
+    r'(?P<rest>(?:\s*(?:,|/|&|\band\b)\s*\d{3,4}\b)+)',
+    re.IGNORECASE)
+# Bare "999v2" / "1300v1" only counts when the version suffix is there
+BARE_RE = re.compile(r'\b(?P<area>\d{3,4})\s*(?P<v2>v\s*[12])\b', re.IGNORECASE)
+SERIES_ONLY_RE = re.compile(r'\b(' + SERIES_PATTERN + r')\b(?!\s*-?\s*(?:v\s*[12]\s*)?\d)',
+                            re.IGNORECASE)
+
+def _series_key(raw):
+    key = re.sub(r'[\s-]', '', raw.lower())
+    return SERIES_BASE.get(key)
+
+def expand_size_lists(text):
+    """Repeat the series before each size of a list: "Surge 830, 890" → "Surge 830, Surge 890"."""
+    def expand(m):
+        sizes = re.findall(r'\d{3,4}', m.group("rest"))
+        return m.group("series") + m.group("first") + ''.join(
+            f", {m.group('series')} {size}" for size in sizes)
+    return SIZE_LIST_RE.sub(expand, text)
+
+def foil_id(series, area, suffix=""):
+    return f"{SERIES_IDS[series]}-{area}{suffix}"
+
+def title_to_series_area(title, specs=None):
+    """(series, area, suffix) for an official front-wing product title."""
+    m = MENTION_RE.search(title)
+    if not m:
+        return None
+    series = _series_key(m.group("series"))
+    version = m.group("v1") or m.group("v2")
+    if version and series in ("ART", "PNG") and version.lower().replace(' ', '') == 'v2':
+        series = f"{series} v2"
+    elif not series and specs and specs.get("series") in SERIES_IDS:
+        series = specs["series"]
+    return series, int(m.group("area")), (m.group("b") or "").lower()
+
+class FoilCatalog:
+    """Official front wings plus the alias rules to resolve free-text mentions."""
+
+    def __init__(self, products_file=PRODUCTS_FILE):
+        with open(products_file) as f:
+            data = json.load(f)
+        self.wings = {}
+        for p in data["collections"]["front-wings"]["products"]:
+            parsed = title_to_series_area(p["title"], p.get("specs"))
+            if not parsed:
+                continue
+            series, area, suffix = parsed
+            fid = foil_id(series, area, suffix)
+            self.wings[fid] = {
+                "id": fid,
+                "series": series,
+                "area": area,
+                "title": p["title"],
+                "handle": p.get("handle"),
+                "price": p.get("price"),
+                "product_id": p.get("id"),
+            }
+        # area -> ids, to resolve bare "999v2" style mentions
+        self._by_area = {}
+        for fid, w in self.wings.items():
+            self._by_area.setdefault(w["area"], []).append(fid)
+
+    def __contains__(self, fid):
+        return fid in self.wings
+
+    def label(self, fid):
+        """Display name for an id, catalogued or not: "art-v2-999" -> "ART v2 999"."""
+        wing = self.wings.get(fid)
+        if wing:
+            return f"{wing['series']} {fid[len(SERIES_IDS[wing['series']]) + 1:]}"
+        for series, prefix in sorted(SERIES_IDS.items(), key=lambda kv: -len(kv[1])):
+            if fid.startswith(prefix + "-"):
+                return f"{series} {fid[len(prefix) + 1:]}"
+        return fid
+
+    def _resolve_parts(self, series, area, suffix, version):
+        """Catalog id for series/area, preferring the stated version."""
+        if series in ("ART", "PNG"):
+            v2 = f"{series} v2"
+            if version == "v2":
+                order = [v2, series]
+            else:
+                # "ART 939" only exists as ART v2 939; plain wins when both exist
+                order = [series, v2]
+            for s in order:
+                fid = foil_id(s, area, suffix)
+                if fid in self.wings:
+                    return fid
+            return None
+        fid = foil_id(series, area, suffix)
+        if fid in self.wings:
+            return fid
+        if suffix:
+            fid = foil_id(series, area)
+            return fid if fid in self.wings else None
+        return None
+
+    def resolve(self, mention):
+        """Canonical catalog id for a single mention string, or None."""
+        ids = self.extract(mention)
+        return ids[0] if ids else None
+
+    def extract(self, text, include_uncatalogued=False):
+        """All front wings mentioned in text, as canonical ids in order of appearance.
+
+        include_uncatalogued also returns ids for series+area combinations
+        that aren't (or aren't yet) in the official catalog, e.g. surge-1150.
+        """
+        if not text:
+            return []
+        text = expand_size_lists(text)
+        found = []
+        spans = []
+        matches = list(MENTION_RE.finditer(text))
+        taken = [m.span() for m in matches]
+        matches += [m for m in REVERSED_RE.finditer(text)
+                    if not any(a <= m.start() < b or m.start() <= a < m.end() for a, b in taken)]
+        for m in sorted(matches, key=lambda m: m.start()):
+            series = _series_key(m.group("series"))
+            if not series:
+                continue
+            version = ((m.groupdict().get("v1") or m.group("v2") or "")
+                       .lower().replace(' ', ''))
+            area = int(m.group("area"))
+            suffix = (m.group("b") or "").lower()
+            fid = self._resolve_parts(series, area, suffix, version)
+            # Size-first matches ("2025 surge") only count when they hit the catalog
+            if not fid and include_uncatalogued and m.re is MENTION_RE:
+                s = f"{series} v2" if version == "v2" and series in ("ART", "PNG") else series
+                fid = foil_id(s, area, suffix)
+            if fid:
+                found.append(fid)
+            spans.append(m.span())
+        for m in BARE_RE.finditer(text):
+            if any(a <= m.start() < b for a, b in spans):
+                continue
+            version = m.group("v2").lower().replace(' ', '')
+            area = int(m.group("area"))
+            candidates = [fid for fid in self._by_area.get(area, [])
+                          if fid.startswith(("art", "png"))]
+            if version == "v2":
+                candidates = [c for c in candidates if "-v2-" in c] or candidates
+            else:
+                candidates = [c for c in candidates if "-v2-" not in c] or candidates
+            if len(candidates) == 1:
+                found.append(candidates[0])
+        return list(dict.fromkeys(found))
+
+    def series_mentions(self, text):
+        """Series named without a size ("loving my Surge"), as canonical series names."""
+        out = []
+        for m in SERIES_ONLY_RE.finditer(text or ""):
+            series = _series_key(m.group(1))
+            # "sp" and "fb" alone are too ambiguous in free text
+            if series and m.group(1).lower() not in ("sp", "fb", "art", "spit"):
+                out.append(series)
+        return list(dict.fromkeys(out))
+
+_catalog = None
+
+def get_catalog():
+    """Process-wide catalog instance (loads axis-products.json once)."""
+    global _catalog
+    if _catalog is None:
+        _catalog = FoilCatalog()
+    return _catalog
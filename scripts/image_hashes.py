@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Perceptual hashes of the official product images, for spotting listings
+that reuse AXIS photography.
+
+Every product image in axis-products.json is fetched once into a local
+mirror (data/product-images/, or read from there when it already exists)
+and reduced to a 64-bit difference hash: grayscale, resized to 9x8, one bit
+per horizontally adjacent pixel pair. Re-encoded, resized or lightly
+cropped copies of a photo keep most bits, so a listing photo is matched by
+Hamming distance. The hashes go into a BK-tree, which only descends into
+children whose edge distance can still be within the radius, so a query
+touches a small part of the catalog.
+
+Mirrored copies (a common trick to dodge reverse image search) are caught
+by also querying the hash of the flipped photo.
+
+Hashing needs Pillow (`pip install Pillow`); loading the index and matching
+precomputed hashes do not.
+
+    from image_hashes import ImageIndex
+    index = ImageIndex.load()
+    for match in index.match_file("listing-photo.jpg"):
+        print(match["distance"], match["title"])
+"""
+
+import json
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+ROOT_DIR = Path(__file__).parent.parent
+PRODUCTS_FILE = ROOT_DIR / "public" / "data" / "axis-products.json"
+MIRROR_DIR = ROOT_DIR / "data" / "product-images"
+INDEX_FILE = ROOT_DIR / "data" / "image-hashes.json"
+INDEX_VERSION = 1
+HASH_SIZE = 8
+FETCH_WIDTH = 512       # Shopify CDN resize; plenty for a 9x8 hash
+REUSED_DISTANCE = 6     # same photo, re-encoded or resized
+NEAR_COPY_DISTANCE = 12 # cropped, recolored or watermarked copy
+
+def _require_pil():
+    if Image is None:
+        raise RuntimeError("image hashing needs Pillow; pip install Pillow")
+
+def dhash(image, size=HASH_SIZE):
+    """64-bit difference hash of a PIL image."""
+    _require_pil()
+    gray = image.convert("L").resize((size + 1, size), Image.LANCZOS)
+    pixels = list(gray.getdata())
+    bits = 0
+    for row in range(size):
+        line = pixels[row * (size + 1):(row + 1) * (size + 1)]
+        for left, right in zip(line, line[1:]):
+            bits = (bits << 1) | (left > right)
+    return bits
+
+def hash_file(path):
+    """(hash, hash of the mirrored image) for an image file."""
+    _require_pil()
+    with Image.open(path) as image:
+        return dhash(image), dhash(image.transpose(Image.FLIP_LEFT_RIGHT))
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+class BKTree:
+    """Metric tree over hashes under Hamming distance.
+
+    Nodes are [hash, item ids, {edge distance: child}]; equal hashes share a
+    node. By the triangle inequality only children whose edge distance lies
+    within radius of the query's distance to the node can hold a match.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def add(self, h, item):
+        self.size += 1
+        if self.root is None:
+            self.root = [h, [item], {}]
+            return
+        node = self.root
+        while True:
+            d = hamming(h, node[0])
+            if d == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [h, [item], {}]
+                return
+            node = child
+
+    def search(self, h, radius):
+        """[(distance, item)] within radius, nearest first."""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            d = hamming(h, node[0])
+            if d <= radius:
+                found.extend((d, item) for item in node[1])
+            for edge, child in node[2].items():
+                if d - radius <= edge <= d + radius:
+                    stack.append(child)
+        return sorted(found, key=lambda x: x[0])
+
+def _mirror_path(product, mirror_dir):
+    suffix = Path(product["image"].split("?")[0]).suffix.lower() or ".jpg"
+    return Path(mirror_dir) / f"{product['handle']}{suffix}"
+
+def fetch_image(product, mirror_dir=MIRROR_DIR, offline=False):
+    """Local path of a product's image, downloading it into the mirror if missing."""
+    path = _mirror_path(product, mirror_dir)
+    if path.exists() or offline:
+        return path if path.exists() else None
+    url = product["image"]
+    url += f"{'&' if '?' in url else '?'}width={FETCH_WIDTH}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    request = urllib.request.Request(url, headers={"User-Agent": "axis-advisor/1.0"})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        path.write_bytes(response.read())
+    return path
+
+def build_index(products_file=PRODUCTS_FILE, mirror_dir=MIRROR_DIR, offline=False):
+    """Hash every product image; returns (index data, [(handle, error)])."""
+    _require_pil()
+    with open(products_file) as f:
+        catalog = json.load(f)
+    entries, failed, seen = [], [], set()
+    for collection in catalog["collections"].values():
+        for p in collection.get("products", []):
+            if not p.get("image") or p["handle"] in seen:
+                continue
+            seen.add(p["handle"])
+            try:
+                path = fetch_image(p, mirror_dir, offline)
+                if path is None:
+                    failed.append((p["handle"], "not in local mirror"))
+                    continue
+                h, _ = hash_file(path)
+            except Exception as e:
+                failed.append((p["handle"], str(e)))
+                continue
+            entries.append({"handle": p["handle"], "title": p["title"],
+                            "image": p["image"], "hash": f"{h:016x}"})
+    data = {
+        "meta": {
+            "version": INDEX_VERSION,
+            "built_at": datetime.now().isoformat(),
+            "algorithm": f"dhash {HASH_SIZE}x{HASH_SIZE}",
+            "image_count": len(entries),
+        },
+        "images": entries,
+    }
+    return data, failed
+
+class ImageIndex:
+    def __init__(self, data):
+        self.meta = data["meta"]
+        self.images = data["images"]
+        self.tree = BKTree()
+        for i, entry in enumerate(self.images):
+            self.tree.add(int(entry["hash"], 16), i)
+
+    @classmethod
+    def load(cls, path=INDEX_FILE):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def match(self, h, mirrored=None, radius=NEAR_COPY_DISTANCE):
+        """Official images within radius of a hash (and of its mirrored hash), nearest first."""
+        best = {}
+        for query, flipped in ((h, False), (mirrored, True)):
+            if query is None:
+                continue
+            for d, i in self.tree.search(query, radius):
+                if i not in best or d < best[i][0]:
+                    best[i] = (d, flipped)
+        matches = []
+        for i, (d, flipped) in sorted(best.items(), key=lambda x: x[1][0]):
+            entry = self.images[i]
+            matches.append({
+                "distance": d,
+                "verdict": "reused" if d <= REUSED_DISTANCE else "near_copy",
+                "mirrored": flipped,
+                "handle": entry["handle"],
+                "title": entry["title"],
+                "image": entry["image"],
+            })
+        return matches
+
+    def match_file(self, path, radius=NEAR_COPY_DISTANCE):
+        h, mirrored = hash_file(path)
+        return self.match(h, mirrored, radius)
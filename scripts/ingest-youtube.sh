@@ -41,8 +41,8 @@ if [ ! -f "$NAME.en.vtt" ]; then
     exit 1
 fi
 
-# Clean VTT to plain text
-python3 "$PROJECT_DIR/data-sources/clean-vtt.py"
+# Clean VTT to plain text (only this transcript; others are tracked in cleaned/manifest.json)
+python3 "$PROJECT_DIR/data-sources/clean-vtt.py" "$TRANSCRIPT_DIR/$NAME.en.vtt"
 
 echo ""
 echo "✅ Transcript ready at: $CLEANED_DIR/$NAME.txt"
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Bulk counterfeit screening of marketplace listings.
+
+A Screener is built once from the price index (build-price-index.py), the
+foil alias registry and the anti-counterfeiting section of
+axis-knowledge.json, then scores listings one at a time, so whole exports
+stream through in constant memory:
+
+  - the title resolves to an official product: exact title, else the first
+    catalogued front wing mention, else a mast, rear wing or fuselage by its
+    line and size ("75cm HM mast", "Progressive 400 rear wing"); a bundle is
+    priced as the first of those it names. Resolutions are memoized per
+    title, since marketplace dumps repeat the same titles many times
+  - the asking price is banded against that product's retail price
+  - title and description are matched against the listing red-flag phrases
+    in one pass of a single compiled regex
+  - a wing size the knowledge base says doesn't exist ("Spitfire 1150") is
+    flagged as a non-existent model at critical weight; any other series+size
+    missing from the catalog (discontinued or mistyped) as an unlisted model
+    at medium weight
+  - a listing that resolves to no product and raises no more than a low
+    score is reported as "unresolved": its price could not be checked
+
+    from listing_screen import Screener, read_listings
+    screener = Screener()
+    for listing in read_listings("marketplace.csv"):
+        result = screener.screen(listing)
+"""
+
+import csv
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from foil_catalog import MENTION_RE, get_catalog
+from price_index import INDEX_FILE, PriceIndex, parse_cents, price_band
+from survey_cube import MAST_RULES, REAR_WING_RULES
+
+PUBLIC_DIR = Path(__file__).parent.parent / "public" / "data"
+KNOWLEDGE_FILE = PUBLIC_DIR / "axis-knowledge.json"
+
+# First matching column wins; marketplace exports name these differently
+TITLE_KEYS = ("title", "name", "listing_title", "product")
+PRICE_KEYS = ("price", "asking_price", "asking", "amount")
+TEXT_KEYS = ("description", "body", "text", "details")
+ID_KEYS = ("id", "listing_id", "url", "link")
+
+PRICE_POINTS = {"scam": 60, "suspicious": 30}
+# A knowledge-base "does not exist" model is a clone; any other size missing from
+# the catalog may just be discontinued or mistyped
+NON_EXISTENT_SEVERITY = "critical"
+UNLISTED_SEVERITY = "medium"
+LEVELS = (("high", 60), ("medium", 30), ("low", 0))
+UNRESOLVED = "unresolved"
+
+# Ordered: first pattern found wins ("Ultrashort" before "Short")
+FUSELAGE_RULES = [
+    ("Crazyshort", re.compile(r'crazy', re.I)),
+    ("Psychoshort", re.compile(r'psycho', re.I)),
+    ("Sillyshort", re.compile(r'silly', re.I)),
+    ("Ultrashort", re.compile(r'ultra', re.I)),
+    ("Windsurf", re.compile(r'windsurf', re.I)),
+    ("Ti Link", re.compile(r'\bti\b|titanium', re.I)),
+    ("K-Series", re.compile(r'\bk\s*-?\s*series', re.I)),
+    ("Short", re.compile(r'short', re.I)),
+    ("Standard", re.compile(r'standard', re.I)),
+]
+# Product type -> word a listing names it by; tried in this order
+PART_KEYWORDS = {
+    "Masts": re.compile(r'\bmast', re.I),
+    "Rear Wings": re.compile(r'\brear\b|\btail\b|\bstab', re.I),
+    "Fuselages": re.compile(r'\bfuse', re.I),
+}
+# Title words that make a different product of the same line and size
+PART_QUALIFIERS = {"fatty", "drive", "advance", "flat", "small", "anhedral"}
+# "75cm", "750mm", "75", "$700" (a price, skipped); bare numbers from 300 up are mm
+LENGTH_RE = re.compile(r'(?<![\w$.,])(\d{2,4})\s*(cm|mm)?(?![\d.,])', re.I)
+REAR_SIZE_RE = re.compile(r'(?<![\w$.,])([2-5]\d{2})(?!\s*(?:cm|mm)|[\d.,])', re.I)
+
+def _field(row, keys):
+    for key in keys:
+        value = row.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+def read_listings(path):
+    """Yield listing dicts from a .csv or .jsonl file, one row at a time."""
+    path = Path(path)
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.suffix.lower() == ".csv":
+            for row in csv.DictReader(f):
+                yield {k.strip().lower(): v for k, v in row.items() if k}
+        else:
+            for line in f:
+                if line.strip():
+                    yield {k.lower(): v for k, v in json.loads(line).items()}
+
+def _line(text, rules):
+    return next((name for name, rx in rules if rx.search(text)), None)
+
+def mast_length_cm(text):
+    """First plausible mast length in cm: "75cm", "750mm", "82" -> 75, 75, 82."""
+    for m in LENGTH_RE.finditer(text):
+        value, unit = int(m.group(1)), (m.group(2) or "").lower()
+        cm = value / 10 if unit == "mm" or (not unit and value >= 300) else value
+        if 40 <= cm <= 130:
+            return round(cm)
+    return None
+
+def rear_wing_size(text):
+    m = REAR_SIZE_RE.search(text)
+    return int(m.group(1)) if m else None
+
+PART_SHAPES = {
+    "Masts": (MAST_RULES, mast_length_cm),
+    "Rear Wings": (REAR_WING_RULES, rear_wing_size),
+    "Fuselages": (FUSELAGE_RULES, lambda text: None),
+}
+
+def part_key(product_type, text):
+    """(type, line, size) of a mast / rear wing / fuselage title, or None without a line."""
+    rules, size = PART_SHAPES[product_type]
+    line = _line(text, rules)
+    return (product_type, line, size(text)) if line else None
+
+def _words(text):
+    return set(re.findall(r'[a-z]+', text.lower()))
+
+def compile_red_flags(rules):
+    """One alternation over every rule's phrases; the named group is the rule index."""
+    parts = []
+    for i, rule in enumerate(rules):
+        phrases = sorted((re.escape(p.lower()) for p in rule["phrases"]), key=len, reverse=True)
+        parts.append(f"(?P<r{i}>{'|'.join(phrases)})")
+    return re.compile(r'(?<!\w)(?:' + '|'.join(parts) + r')(?!\w)') if parts else None
+
+class Screener:
+    def __init__(self, index_file=INDEX_FILE, knowledge_file=KNOWLEDGE_FILE):
+        self.index = PriceIndex.load(index_file)
+        self.catalog = get_catalog()
+        with open(knowledge_file) as f:
+            knowledge = json.load(f)
+        red_flags = knowledge.get("anti_counterfeiting", {}).get("listing_red_flags", {})
+        self.weights = red_flags.get("severity_weights", {"critical": 60, "high": 25, "medium": 10})
+        self.rules = red_flags.get("rules", [])
+        self.red_flag_re = compile_red_flags(self.rules)
+        # "Does not exist" corrections, e.g. Spitfire 1150, are models only a clone would claim
+        self.non_existent = {fid for item in knowledge.get("corrections", {}).get("items", [])
+                             if "does not exist" in item.get("note", "").lower()
+                             for fid in self.catalog.extract(item["wrong"], include_uncatalogued=True)}
+        # (type, line, size) -> products, to resolve masts, rear wings and fuselages
+        self.parts = {}
+        for p in self.index.products:
+            key = part_key(p["type"], p["title"]) if p["type"] in PART_SHAPES else None
+            if key:
+                self.parts.setdefault(key, []).append(p)
+        self.resolve = lru_cache(maxsize=65536)(self._resolve)
+
+    def _resolve_part(self, title):
+        """Mast, rear wing or fuselage a title names by line and size, or None."""
+        # Front wing sizes ("Spitfire 1150 + 75 HM mast") aren't mast lengths
+        title = MENTION_RE.sub(" ", title)
+        words = _words(title)
+        for product_type, keyword in PART_KEYWORDS.items():
+            if not keyword.search(title):
+                continue
+            key = part_key(product_type, title)
+            # A product with a qualifier the title lacks (FATTY, Advance+) is another product;
+            # of the rest, most shared words (colour) wins, then the lowest retail
+            candidates = [p for p in self.parts.get(key, ()) if _words(p["title"]) & PART_QUALIFIERS <= words]
+            if candidates:
+                return max(candidates, key=lambda p: (len(_words(p["title"]) & words), -p["price"]))
+        return None
+
+    def _resolve(self, title):
+        """(price-index product or None, unlisted foil id or None) for a listing title."""
+        product = self.index.product(title, mentions=False)
+        if product is not None:
+            return product, None
+        ids = self.catalog.extract(title, include_uncatalogued=True)
+        for fid in ids:
+            if fid in self.catalog:
+                return self.index.product(self.catalog.wings[fid]["handle"], mentions=False), None
+        return self._resolve_part(title), ids[0] if ids else None
+
+    def screen(self, listing):
+        title = str(_field(listing, TITLE_KEYS) or "")
+        text = str(_field(listing, TEXT_KEYS) or "")
+        asking = parse_cents(_field(listing, PRICE_KEYS))
+        product, unlisted = self.resolve(title)
+
+        flags = []
+        score = 0
+        if unlisted:
+            if unlisted in self.non_existent:
+                flags.append("non_existent_model")
+                score += self.weights[NON_EXISTENT_SEVERITY]
+            else:
+                flags.append("unlisted_model")
+                score += self.weights[UNLISTED_SEVERITY]
+        if self.red_flag_re is not None:
+            hits = {m.lastgroup for m in self.red_flag_re.finditer(f"{title}\n{text}".lower())}
+            for i in sorted(int(group[1:]) for group in hits):
+                rule = self.rules[i]
+                flags.append(rule["id"])
+                score += self.weights.get(rule["severity"], 0)
+
+        result = {"id": _field(listing, ID_KEYS), "title": title, "asking": asking}
+        if product is not None:
+            result["product"] = product["title"]
+            result["retail"] = product["price"]
+            if asking:
+                ratio = 100 * asking / product["price"]
+                band = price_band(ratio)
+                result["percent_of_retail"] = round(ratio, 1)
+                result["band"] = band
+                score += PRICE_POINTS.get(band, 0)
+        score = min(score, 100)
+        result["score"] = score
+        result["level"] = next(level for level, floor in LEVELS if score >= floor)
+        if product is None and result["level"] == "low":
+            result["level"] = UNRESOLVED
+        result["flags"] = flags
+        return result
+
+    def screen_all(self, listings):
+        for listing in listings:
+            yield self.screen(listing)
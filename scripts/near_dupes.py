@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+MinHash / LSH near-duplicate detection for FB post texts.
+
+Scheduled scans re-capture the same post over and over, each time with
+slightly different text (truncated at "See more", reaction counts glued
+on, comments expanded or not). Exact-text sets miss those, and comparing
+every pair of posts is quadratic. Here each post gets a MinHash signature;
+LSH banding buckets signatures so only likely matches are compared.
+"""
+
+import hashlib
+import random
+import re
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 64) - 1
+
+# FB chrome that differs between captures of the same post
+NOISE_RE = re.compile(r'\b(see more|see less|like|reply|share|follow|edited|top contributor|'
+                      r'rising contributor|group expert|all reactions)\b')
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+def normalize_text(text: str) -> list:
+    """Lowercased word tokens with FB UI chrome stripped."""
+    return TOKEN_RE.findall(NOISE_RE.sub(' ', (text or '').lower()))
+
+def shingles(text: str, size: int = 3) -> set:
+    """Hashed word n-gram shingles (64-bit ints)."""
+    tokens = normalize_text(text)
+    if len(tokens) < size:
+        grams = [' '.join(tokens)] if tokens else []
+    else:
+        grams = [' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+    return {int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), 'little')
+            for g in grams}
+
+class MinHashLSH:
+    """Incremental MinHash index with banded LSH buckets.
+
+    Pairs whose Jaccard similarity is roughly above (1/bands) ** (1/rows)
+    land in a shared bucket with high probability; only those candidates
+    are verified against the exact shingle sets.
+    """
+
+    def __init__(self, num_perm=128, bands=32, threshold=0.5, containment=0.8,
+                 shingle_size=3, seed=42):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.containment = containment
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+                       for _ in range(num_perm)]
+        self._buckets = [{} for _ in range(bands)]
+        self._shingles = {}
+
+    def __len__(self):
+        return len(self._shingles)
+
+    def signature(self, shingle_set) -> list:
+        if not shingle_set:
+            return [MAX_HASH] * self.num_perm
+        return [min([(a * h + b) % MERSENNE_PRIME for h in shingle_set])
+                for a, b in self._perms]
+
+    def _band_keys(self, sig):
+        r = self.rows
+        for i in range(self.bands):
+            yield i, hash(tuple(sig[i * r:(i + 1) * r]))
+
+    def similarity(self, a: set, b: set) -> float:
+        """Jaccard, or containment for truncated re-captures of longer posts."""
+        if not a or not b:
+            return 0.0
+        inter = len(a & b)
+        jaccard = inter / len(a | b)
+        smaller = min(len(a), len(b))
+        # Containment only counts when the shorter capture is substantial
+        if smaller >= 5 and inter / smaller >= self.containment:
+            return max(jaccard, inter / smaller)
+        return jaccard
+
+    def query(self, text: str, shingle_set=None, sig=None) -> list:
+        """Keys of indexed posts that are near-duplicates of text."""
+        shingle_set = shingle_set if shingle_set is not None else shingles(text, self.shingle_size)
+        sig = sig if sig is not None else self.signature(shingle_set)
+        candidates = set()
+        for band, key in self._band_keys(sig):
+            candidates.update(self._buckets[band].get(key, ()))
+        matches = []
+        for cand in candidates:
+            sim = self.similarity(shingle_set, self._shingles[cand])
+            if sim >= self.threshold or sim >= self.containment:
+                matches.append(cand)
+        return matches
+
+    def add(self, key, text: str) -> list:
+        """Index text under key and return the near-duplicates already indexed."""
+        shingle_set = shingles(text, self.shingle_size)
+        sig = self.signature(shingle_set)
+        matches = self.query(text, shingle_set, sig)
+        for band, bkey in self._band_keys(sig):
+            self._buckets[band].setdefault(bkey, []).append(key)
+        self._shingles[key] = shingle_set
+        return matches
+
+class UnionFind:
+    """Disjoint sets; a set may carry a label, and sets with different labels never join."""
+
+    def __init__(self):
+        self.parent = {}
+        self.labels = {}  # root -> label
+
+    def find(self, x):
+        self.parent.setdefault(x, x)
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def label(self, x, value):
+        self.labels[self.find(x)] = value
+
+    def union(self, a, b):
+        """Join the sets of a and b unless they carry different labels; True if joined."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return True
+        la, lb = self.labels.get(ra), self.labels.get(rb)
+        if la and lb and la != lb:
+            return False
+        root, child = min(ra, rb), max(ra, rb)
+        self.parent[child] = root
+        self.labels.pop(child, None)
+        if la or lb:
+            self.labels[root] = la or lb
+        return True
+
+def cluster_posts(posts, lsh=None):
+    """Group normalized posts (see fb_archive.normalize_post) into re-capture clusters.
+
+    Posts sharing a real FB post_id are always merged; two different
+    post_ids are never merged even when their texts are near-identical
+    (the same question cross-posted twice is two posts), also not through
+    an id-less capture that resembles both: each cluster carries its
+    post_id and a union that would join two ids is refused.
+    Returns a list of clusters, each a list of indexes into posts.
+    """
+    lsh = lsh or MinHashLSH()
+    uf = UnionFind()
+    by_post_id = {}
+    for i, post in enumerate(posts):
+        uf.find(i)
+        pid = post.get("post_id")
+        if pid:
+            uf.label(i, pid)
+            if pid in by_post_id:
+                uf.union(i, by_post_id[pid])
+            else:
+                by_post_id[pid] = i
+        for j in lsh.add(i, post.get("text", "")):
+            uf.union(i, j)
+
+    clusters = {}
+    for i in range(len(posts)):
+        clusters.setdefault(uf.find(i), []).append(i)
+    return list(clusters.values())
+
+def canonical_post(captures):
+    """Collapse the captures of one post into a single canonical record."""
+    best = max(captures, key=lambda p: len(p.get("text", "")))
+    seen = sorted(p["scanned_at"] for p in captures if p.get("scanned_at"))
+    foils = []
+    for p in captures:
+        foils.extend(p.get("foils_mentioned", []))
+    post_id = next((p["post_id"] for p in captures if p.get("post_id")), None)
+    return {
+        "post_id": post_id,
+        "source": best.get("source"),
+        "poster": best.get("poster") or next((p["poster"] for p in captures if p.get("poster")), None),
+        "text": best.get("text", ""),
+        "foils_mentioned": list(dict.fromkeys(foils)),
+        "discipline": best.get("discipline"),
+        "sentiment": best.get("sentiment"),
+        "first_seen": seen[0] if seen else None,
+        "last_seen": seen[-1] if seen else None,
+        "captures": len(captures),
+        "archives": sorted({p["archive"] for p in captures if p.get("archive")}),
+    }
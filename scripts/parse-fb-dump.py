@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Segment raw FB text dumps into structured posts (see fb_text_dump.py).
+
+  python3 scripts/parse-fb-dump.py data/fb-surge-search-raw.txt
+  python3 scripts/parse-fb-dump.py dump.txt -o data/fb-kite-search-parsed.json
+  python3 scripts/parse-fb-dump.py dump.txt --jsonl -o - | head
+
+The output is {"meta", "posts"} with author / text / foils_mentioned per post.
+build-feedback-db.py picks up every data/*-parsed.json, so the default output
+next to the dump feeds the next build. An existing file (such as the curated
+fb-main-feed-parsed.json) is only overwritten with --force. Posts are written
+as they are segmented, so the dump is never held in memory.
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from fb_text_dump import iter_dump_posts
+from foil_catalog import get_catalog
+
+def default_output(path):
+    stem = Path(path).stem
+    if stem.endswith("-raw"):
+        stem = stem[:-len("-raw")]
+    return Path(path).with_name(f"{stem}-parsed.json")
+
+def write_json(posts, out, meta):
+    out.write('{\n  "meta": ' + json.dumps(meta, ensure_ascii=False) + ',\n  "posts": [')
+    count = 0
+    for count, post in enumerate(posts, 1):
+        out.write((',' if count > 1 else '') + '\n    ' + json.dumps(post, ensure_ascii=False))
+    out.write('\n  ]\n}\n')
+    return count
+
+def write_jsonl(posts, out):
+    count = 0
+    for count, post in enumerate(posts, 1):
+        out.write(json.dumps(post, ensure_ascii=False) + '\n')
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Segment a raw FB text dump into posts")
+    parser.add_argument("dump", type=Path)
+    parser.add_argument("-o", "--output", help="output file, or - for stdout")
+    parser.add_argument("--jsonl", action="store_true", help="one post per line")
+    parser.add_argument("--min-chars", type=int, default=20)
+    parser.add_argument("--force", action="store_true", help="overwrite an existing output file")
+    args = parser.parse_args()
+
+    output = args.output or str(default_output(args.dump).with_suffix(
+        ".jsonl" if args.jsonl else ".json"))
+    if output != "-" and Path(output).exists() and not args.force:
+        parser.error(f"{output} already exists (use --force to overwrite, or -o)")
+    posts = iter_dump_posts(args.dump, catalog=get_catalog(), min_chars=args.min_chars)
+    meta = {"source": args.dump.name, "segmented_at": datetime.now().isoformat(),
+            "segmenter": "fb_text_dump"}
+    out = sys.stdout if output == "-" else open(output, 'w')
+    try:
+        count = write_jsonl(posts, out) if args.jsonl else write_json(posts, out, meta)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if output != "-":
+        print(f"✅ {count} posts segmented from {args.dump}")
+        print(f"💾 Saved to: {output}")
+
+if __name__ == "__main__":
+    main()
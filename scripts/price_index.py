@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Retail price index over the official AXIS products.
+
+Prices are parsed once to integer cents. Products are grouped by product
+type (the collection label: Front Wings, Rear Wings, Masts, Fuselages) and,
+where they have one, by series; every group keeps its retail prices sorted
+plus their percentiles, so an asking price is placed against a whole
+category with one binary search.
+
+Retail history: each build folds the current scrape into the previous
+index, so every product carries the lowest and highest retail price seen
+across builds and when. The serialized index is
+public/data/price-index.json, read by /verify.
+
+    from price_index import PriceIndex
+    index = PriceIndex.load()
+    index.check("Fireball 1500", 450)
+    index.place(450, "Front Wings", series="Fireball")
+"""
+
+import json
+import re
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+
+from foil_catalog import get_catalog
+
+PUBLIC_DIR = Path(__file__).parent.parent / "public" / "data"
+PRODUCTS_FILE = PUBLIC_DIR / "axis-products.json"
+INDEX_FILE = PUBLIC_DIR / "price-index.json"
+INDEX_VERSION = 1
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# Asking price as % of retail -> band, checked top down (used-market norms)
+BANDS = (("safe", 75), ("fair", 55), ("suspicious", 40), ("scam", 0))
+
+# Shopify size-option placeholders and hardware, not resold on their own
+SKIPPED_TYPES = {"OPTIONS_HIDDEN_PRODUCT", "Screw"}
+
+PRICE_RE = re.compile(r'\d[\d,]*(?:\.\d+)?')
+
+def parse_cents(value):
+    """755, "755.00" or "$1,299" -> integer cents; None when there is no price."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(round(value * 100))
+    m = PRICE_RE.search(str(value))
+    return int(round(float(m.group().replace(',', '')) * 100)) if m else None
+
+def _asking_cents(asking):
+    cents = parse_cents(asking)
+    if cents is None:
+        raise ValueError(f"asking price {asking!r} is not a price")
+    if cents < 0:
+        raise ValueError(f"asking price {asking!r} is negative")
+    return cents
+
+def group_key(product_type, series=None):
+    return f"{product_type}|{series}" if series else product_type
+
+def percentile(prices, p):
+    """Linear-interpolated percentile of sorted integer prices, in cents."""
+    if not prices:
+        return None
+    pos = (len(prices) - 1) * p / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(prices) - 1)
+    return int(round(prices[lo] + (prices[hi] - prices[lo]) * (pos - lo)))
+
+def price_band(ratio_pct):
+    return next((band for band, floor in BANDS if ratio_pct >= floor), BANDS[-1][0])
+
+def _previous_history(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {p["handle"]: p["history"] for p in data.get("products", []) if "history" in p}
+
+def build_index(products_file=PRODUCTS_FILE, previous_file=INDEX_FILE):
+    with open(products_file) as f:
+        catalog = json.load(f)
+    seen_at = catalog["meta"].get("scraped_at", datetime.now().isoformat())[:10]
+    history = _previous_history(previous_file)
+
+    products, members, handles = [], {}, set()
+    for collection in catalog["collections"].values():
+        for p in collection.get("products", []):
+            cents = parse_cents(p.get("price"))
+            if not cents or p.get("product_type") in SKIPPED_TYPES or p["handle"] in handles:
+                continue
+            handles.add(p["handle"])
+            specs = p.get("specs", {})
+            product_type = specs.get("product_type") or collection.get("name") or p.get("product_type")
+            series = specs.get("series")
+            lo, hi, first, last = history.get(p["handle"], [cents, cents, seen_at, seen_at])
+            products.append({
+                "title": p["title"],
+                "handle": p["handle"],
+                "price": cents,
+                "type": product_type,
+                "series": series,
+                "history": [min(lo, cents), max(hi, cents), min(first, seen_at), max(last, seen_at)],
+            })
+            members.setdefault(group_key(product_type), []).append(len(products) - 1)
+            if series:
+                members.setdefault(group_key(product_type, series), []).append(len(products) - 1)
+
+    groups = {}
+    for key in sorted(members):
+        rows = [products[i] for i in members[key]]
+        prices = sorted(r["price"] for r in rows)
+        groups[key] = {
+            "prices": prices,
+            "percentiles": [percentile(prices, p) for p in PERCENTILES],
+            "history": [min(r["history"][0] for r in rows), max(r["history"][1] for r in rows)],
+        }
+    products.sort(key=lambda r: r["title"])
+
+    return {
+        "meta": {
+            "version": INDEX_VERSION,
+            "built_at": datetime.now().isoformat(),
+            "scraped_at": catalog["meta"].get("scraped_at"),
+            "unit": "cents",
+            "percentiles": list(PERCENTILES),
+            "bands": [list(b) for b in BANDS],
+            "product_count": len(products),
+            "layout": "groups keyed 'type' or 'type|series'; products[].history = [min, max, first_seen, last_seen]",
+        },
+        "groups": groups,
+        "products": products,
+    }
+
+class PriceIndex:
+    def __init__(self, data):
+        self.meta = data["meta"]
+        self.groups = data["groups"]
+        self.products = data["products"]
+        self._by_title = {p["title"].lower(): p for p in self.products}
+        self._by_handle = {p["handle"]: p for p in self.products}
+
+    @classmethod
+    def load(cls, path=INDEX_FILE):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def product(self, name, mentions=True):
+        """Product by Shopify handle, exact title (any case) or, with mentions, a foil mention ("FB1500")."""
+        found = self._by_handle.get(name) or self._by_title.get(name.lower())
+        if found is None and mentions:
+            catalog = get_catalog()
+            fid = catalog.resolve(name)
+            found = self._by_handle.get(catalog.wings[fid]["handle"]) if fid else None
+        return found
+
+    def group_for(self, product_type, series=None):
+        """Key of the series group when it exists, else of the whole product type."""
+        key = group_key(product_type, series)
+        return key if key in self.groups else product_type if product_type in self.groups else None
+
+    def place(self, asking, product_type, series=None):
+        """Where an asking price (dollars) sits among a category's retail prices.
+
+        Raises ValueError when asking isn't a price.
+        """
+        cents = _asking_cents(asking)
+        key = self.group_for(product_type, series)
+        if key is None:
+            return None
+        group = self.groups[key]
+        prices = group["prices"]
+        below = bisect_left(prices, cents)
+        return {
+            "group": key,
+            "asking": cents,
+            "n": len(prices),
+            "cheaper_than": len(prices) - bisect_right(prices, cents),
+            "percentile": round(100 * below / len(prices), 1),
+            "min": prices[0],
+            "median": group["percentiles"][PERCENTILES.index(50)],
+            "max": prices[-1],
+        }
+
+    def check(self, name, asking):
+        """Price reality check of one listing against its product's retail price and category.
+
+        Raises ValueError when asking isn't a price.
+        """
+        cents = _asking_cents(asking)
+        product = self.product(name)
+        if product is None:
+            return None
+        ratio = 100 * cents / product["price"]
+        return {
+            "product": product["title"],
+            "retail": product["price"],
+            "asking": cents,
+            "percent_of_retail": round(ratio, 1),
+            "band": price_band(ratio),
+            "retail_history": product["history"],
+            "category": self.place(asking, product["type"], product["series"]),
+        }
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Scan every AXIS Facebook source in one pass and write a single scan archive.
+
+  python3 scripts/scan-fb-sources.py                       # all sources, in parallel
+  python3 scripts/scan-fb-sources.py --sources axis_riders_group surge_search
+  python3 scripts/scan-fb-sources.py --pool 1              # one source at a time
+
+All sources share one headless browser. A ContextPool bounds how many
+contexts are live at once and a RateBudget paces every navigation and scroll
+across all of them, so with a pool as large as the source list the scan takes
+about as long as its slowest source instead of the sum of all of them.
+
+The group and the official page stop at their high-water marks (scan_state.py);
+the Surge search has no stable order and always reads a fixed number of screens.
+Posts are merged into public/data/archives/fb-scan-<timestamp>.json; a post
+found by more than one source is kept under the first source that found it.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from playwright.async_api import async_playwright
+
+from fb_browser import LEAN_LAUNCH_ARGS, ContextPool, RateBudget
+from fb_scan import SOURCES, merge_results, scan_source
+from foil_catalog import get_catalog
+
+COOKIES_PATH = Path.home() / ".clawdbot/credentials/fb-cookies.json"
+ARCHIVE_DIR = Path(__file__).parent.parent / "public" / "data" / "archives"
+
+def load_cookies():
+    if COOKIES_PATH.exists():
+        with open(COOKIES_PATH) as f:
+            return json.load(f)
+    return None
+
+async def run_scan(names, pool_size, rate_per_s, block_requests=True):
+    print("🛰️  AXIS FB multi-source scan")
+    print("=" * 50)
+    catalog = get_catalog()
+    budget = RateBudget(rate_per_s=rate_per_s)
+    started_at = datetime.now(timezone.utc)
+    started = time.monotonic()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=True,
+            args=['--disable-blink-features=AutomationControlled', '--no-sandbox',
+                  '--disable-dev-shm-usage', '--disable-gpu']
+                 + (LEAN_LAUNCH_ARGS if block_requests else []))
+        pool = ContextPool(
+            browser, size=pool_size, block_requests=block_requests, cookies=load_cookies(),
+            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            timezone_id='America/Los_Angeles')
+        print(f"📂 Sources: {', '.join(names)} (pool {pool_size}, {rate_per_s} actions/s)")
+        try:
+            results = await asyncio.gather(
+                *(scan_source(name, SOURCES[name], pool, budget, catalog) for name in names),
+                return_exceptions=True)
+        finally:
+            await browser.close()
+
+    duration = time.monotonic() - started
+    record = merge_results(names, results, started_at, duration, pool_size, budget)
+    stamp = started_at.strftime('%Y-%m-%dT%H-%M-%SZ')
+    output_file = ARCHIVE_DIR / f"fb-scan-{stamp}.json"
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w') as f:
+        json.dump(record, f, indent=2, ensure_ascii=False)
+
+    scan = record["scan"]
+    slowest = max((s.get("duration_s", 0) for s in scan["sources"].values()), default=0)
+    print("\n" + "=" * 50)
+    print(f"📊 {scan['status']}: {sum(s['posts'] for s in scan['sources'].values())} posts "
+          f"in {scan['duration_s']:.0f}s (slowest source {slowest:.0f}s)")
+    for failure in scan["failures"]:
+        print(f"   ❌ {failure['source']}: {failure['error']}")
+    print(f"💾 Saved to: {output_file}")
+    return record
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scan all AXIS FB sources into one archive")
+    parser.add_argument("--sources", nargs="+", choices=list(SOURCES), default=list(SOURCES))
+    parser.add_argument("--pool", type=int, default=len(SOURCES),
+                        help="max browser contexts open at once (default: one per source)")
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="navigations + scrolls per second across all sources")
+    parser.add_argument("--no-block", action="store_true",
+                        help="load images/video/fonts/trackers (disable request blocking)")
+    args = parser.parse_args()
+    asyncio.run(run_scan(args.sources, args.pool, args.rate, block_requests=not args.no_block))
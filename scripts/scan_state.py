@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Per-source high-water marks for incremental FB scans.
+
+A routine scan only needs the posts published since the previous one. The
+scrapers load the group sorted by new posts, and stop scrolling once they
+run into posts the previous scan already saw. The mark for each source is
+kept in data/fb-scan-state.json:
+
+  {"axis_riders_group": {"newest_post_id": "...", "newest_post_url": "...",
+                         "marked_at": "...", "recent_keys": [...]}}
+
+recent_keys holds the keys (FB post id, else a 64-bit text fingerprint) of
+the newest posts, newest first. Several are kept because a pinned post or a
+deleted newest post must not make a scan stop early or run to the end.
+"""
+
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fb_archive import FB_ID_RE
+
+STATE_FILE = Path(__file__).parent.parent / "data" / "fb-scan-state.json"
+RECENT_KEYS = 50
+# Consecutive already-seen posts that mean we've reached the previous scan
+STOP_AFTER_KNOWN = 3
+FINGERPRINT_CHARS = 300
+
+def fingerprint(text) -> int:
+    """64-bit fingerprint of a post's text.
+
+    Only the head of the normalized text is hashed: article text ends with
+    reaction and comment counts that change between scans.
+    """
+    norm = ' '.join(re.sub(r'[^\w\s]', ' ', (text or '').lower()).split())[:FINGERPRINT_CHARS]
+    return int.from_bytes(hashlib.blake2b(norm.encode(), digest_size=8).digest(), 'big')
+
+def post_key(article) -> str:
+    """FB post id from the article permalink, else its text fingerprint."""
+    m = FB_ID_RE.search(article.get("post_url") or "")
+    if m:
+        return m.group(1)
+    return f"fp_{fingerprint(article.get('text')):016x}"
+
+class HighWaterMark:
+    def __init__(self, source, path=STATE_FILE):
+        self.source = source
+        self.path = Path(path)
+        self.state = {}
+        if self.path.exists():
+            with open(self.path) as f:
+                self.state = json.load(f)
+        mark = self.state.get(source, {})
+        self.known = set(mark.get("recent_keys", []))
+        self.new_keys = []
+        self.new_posts = []
+        self._known_run = 0
+
+    @property
+    def has_mark(self):
+        return bool(self.known)
+
+    def reached(self, article) -> bool:
+        """Record article; True once STOP_AFTER_KNOWN known posts arrive in a row.
+
+        Nested articles (comments) are ignored; they don't follow post order.
+        """
+        if article.get("nested"):
+            return False
+        key = post_key(article)
+        if key in self.known:
+            self._known_run += 1
+        else:
+            self._known_run = 0
+            if key not in self.new_keys:
+                self.new_keys.append(key)
+                self.new_posts.append(article)
+        return self.has_mark and self._known_run >= STOP_AFTER_KNOWN
+
+    def save(self):
+        """Move the mark to the newest posts seen in this scan."""
+        mark = self.state.get(self.source, {})
+        recent = self.new_keys + [k for k in mark.get("recent_keys", []) if k not in self.new_keys]
+        if self.new_posts:
+            newest = self.new_posts[0]
+            m = FB_ID_RE.search(newest.get("post_url") or "")
+            mark["newest_post_id"] = m.group(1) if m else None
+            mark["newest_post_url"] = newest.get("post_url")
+        mark["marked_at"] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        mark["recent_keys"] = recent[:RECENT_KEYS]
+        # Other sources may have saved their marks since this one was loaded
+        if self.path.exists():
+            with open(self.path) as f:
+                self.state = json.load(f)
+        self.state[self.source] = mark
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(self.state, f, indent=2)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Hot-path telemetry for the FB scrapers, summarized into the scan record.
+
+    telemetry = Telemetry()
+    with telemetry.timer("page_load"):
+        await page.goto(url)
+    telemetry.observe("new_posts_per_scroll", 3)
+    await telemetry.sample_page(page)          # DOM size, JS heap, in-page timers
+    stats["telemetry"] = telemetry.summary()
+
+Timings are kept as raw samples (a scan is a few hundred scrolls) and
+summarized as n/total/p50/p95/max plus counts per fixed log-scale bucket, so
+summaries from several sources can be merged and compared between scans.
+sample_page() reads the cumulative timers that fb_page's observer and drain
+keep in the page, which splits a drain's round-trip into DOM queries and
+innerText extraction without another round-trip per scroll.
+"""
+
+import time
+from contextlib import contextmanager
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+# Scrolls between page samples (each is one extra page.evaluate)
+SAMPLE_EVERY = 5
+
+SAMPLE_JS = """
+() => {
+    const state = window.__axisArticles;
+    const mem = performance.memory;
+    return {
+        dom_articles: document.querySelectorAll('[role="article"]').length,
+        dom_nodes: document.getElementsByTagName('*').length,
+        js_heap_bytes: mem ? mem.usedJSHeapSize : null,
+        in_page: state && state.timing ? state.timing : null,
+    };
+}
+"""
+
+def _percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def summarize(values, buckets=True):
+    if not values:
+        return {"n": 0}
+    ordered = sorted(values)
+    out = {"n": len(ordered), "total": round(sum(ordered), 1),
+           "p50": round(_percentile(ordered, 50), 1), "p95": round(_percentile(ordered, 95), 1),
+           "max": round(ordered[-1], 1)}
+    if buckets:
+        counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        for v in ordered:
+            i = 0
+            while i < len(BUCKET_BOUNDS_MS) and v > BUCKET_BOUNDS_MS[i]:
+                i += 1
+            counts[i] += 1
+        out["buckets"] = counts
+    return out
+
+class Telemetry:
+    def __init__(self, sample_every=SAMPLE_EVERY):
+        self.sample_every = sample_every
+        self.timings = {}
+        self.values = {}
+        self.samples = 0
+        self.peak = {}
+        self.last = {}
+
+    @contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.setdefault(name, []).append((time.perf_counter() - started) * 1000)
+
+    def observe(self, name, value):
+        self.values.setdefault(name, []).append(value)
+
+    async def sample_page(self, page, scroll=None):
+        """DOM size, JS heap and in-page timers; every sample_every scrolls when scroll is given."""
+        if scroll is not None and scroll % self.sample_every:
+            return
+        with self.timer("sample"):
+            sample = await page.evaluate(SAMPLE_JS)
+        self.samples += 1
+        self.observe("dom_articles", sample["dom_articles"])
+        in_page = sample.pop("in_page") or {}
+        for key, value in list(sample.items()) + [(f"in_page_{k}", v) for k, v in in_page.items()]:
+            if value is None:
+                continue
+            if isinstance(value, float):
+                value = round(value, 1)
+            self.last[key] = value
+            self.peak[key] = max(self.peak.get(key, value), value)
+
+    def summary(self, buckets=True):
+        """Compact dict for the scan record."""
+        out = {
+            "timings_ms": {name: summarize(v, buckets) for name, v in sorted(self.timings.items())},
+            "counts": {name: summarize(v, buckets=False) for name, v in sorted(self.values.items())},
+        }
+        if buckets:
+            out = {"bucket_bounds_ms": list(BUCKET_BOUNDS_MS), **out}
+        if self.samples:
+            out["page"] = {"samples": self.samples, "peak": dict(self.peak)}
+            if self.last:
+                out["page"]["last"] = dict(self.last)
+            if self.peak.get("js_heap_bytes"):
+                out["page"]["js_heap_mb_peak"] = round(self.peak["js_heap_bytes"] / 1e6, 1)
+        return out
+
+    @classmethod
+    def merged(cls, telemetries):
+        """One Telemetry holding the samples of several (e.g. one per source)."""
+        total = cls()
+        for t in telemetries:
+            for name, v in t.timings.items():
+                total.timings.setdefault(name, []).extend(v)
+            for name, v in t.values.items():
+                total.values.setdefault(name, []).extend(v)
+            total.samples += t.samples
+            for key, value in t.peak.items():
+                total.peak[key] = max(total.peak.get(key, value), value)
+        return total
@@ -2,9 +2,13 @@
 """
 AXIS Riders Facebook Scraper - STANDALONE VERSION
 Run this on your local machine while logged into Facebook
+
+Posts are saved to ~/axis-riders-data.jsonl as they are found. If the run
+is interrupted, just run the script again: it continues where it stopped.
 """
 
 import asyncio
+import hashlib
 import json
 import re
 from datetime import datetime
@@ -16,6 +20,44 @@ AXIS_RIDERS_GROUP = "https://www.facebook.com/groups/axisfoilriders"
 OUTPUT_FILE = Path.home() / "axis-riders-data.json"
 MAX_POSTS = 100
 SCROLL_ITERATIONS = 10
+POSTS_FILE = OUTPUT_FILE.with_suffix('.jsonl')
+CHECKPOINT_FILE = OUTPUT_FILE.with_name('axis-riders-data.checkpoint.json')
+
+# Returns only articles not returned before (marked in the page), in one call
+NEW_ARTICLES_JS = """
+() => Array.from(document.querySelectorAll('[role="article"]:not([data-axis-seen])')).map(el => {
+    el.setAttribute('data-axis-seen', '1');
+    return el.innerText || '';
+})
+"""
+
+def fingerprint(text: str) -> int:
+    """64-bit fingerprint of a post (head only: reaction counts change between loads)"""
+    norm = ' '.join(re.sub(r'[^\w\s]', ' ', text.lower()).split())[:300]
+    return int.from_bytes(hashlib.blake2b(norm.encode(), digest_size=8).digest(), 'big')
+
+def load_progress():
+    """Fingerprints, saved post count and scroll position of an interrupted run"""
+    seen, count, good_bytes = set(), 0, 0
+    if POSTS_FILE.exists():
+        with open(POSTS_FILE, 'rb') as f:
+            for line in f:
+                try:
+                    post = json.loads(line)
+                except ValueError:
+                    break  # partial last line from a crash
+                good_bytes += len(line)
+                count += 1
+                seen.add(fingerprint(post["text"]))
+        with open(POSTS_FILE, 'ab') as f:
+            f.truncate(good_bytes)
+    scroll = 0
+    if CHECKPOINT_FILE.exists():
+        with open(CHECKPOINT_FILE) as f:
+            checkpoint = json.load(f)
+        seen.update(checkpoint.get("seen", []))
+        scroll = checkpoint.get("scroll", 0)
+    return seen, count, scroll
 
 def extract_foil_mentions(text: str) -> list:
     """Extract AXIS foil model mentions"""
@@ -136,72 +178,85 @@ async def scrape():
         
         print("✅ On group page!\n")
         
-        print(f"📜 Scrolling to load posts (this takes ~{SCROLL_ITERATIONS * 2} seconds)...")
-        for i in range(SCROLL_ITERATIONS):
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(2)
-            if (i + 1) % 3 == 0:
-                print(f"   Scrolled {i+1}/{SCROLL_ITERATIONS} times...")
-        
-        print("\n🔍 Extracting posts...")
-        posts = await page.query_selector_all('[role="article"]')
-        print(f"   Found {len(posts)} post containers\n")
+        seen, processed, start_scroll = load_progress()
+        if processed or start_scroll:
+            print(f"♻️  Resuming: {processed} posts already saved, scroll {start_scroll}\n")
+            for _ in range(start_scroll):
+                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                await asyncio.sleep(1)
         
-        processed = 0
-        for i, post in enumerate(posts[:MAX_POSTS]):
-            try:
-                text = await post.inner_text()
-                
-                if len(text) < 50:
-                    continue
-                
-                foils = extract_foil_mentions(text)
-                weight = extract_weight(text)
-                use_case = extract_use_case(text)
-                sentiment = extract_sentiment(text)
+        print(f"📜 Scrolling and extracting posts (this takes ~{SCROLL_ITERATIONS * 2} seconds)...")
+        with open(POSTS_FILE, 'a') as posts_file:
+            for i in range(start_scroll, SCROLL_ITERATIONS):
+                if processed >= MAX_POSTS:
+                    break
+                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                await asyncio.sleep(2)
                 
-                if foils or weight or use_case:
-                    data["posts"].append({
-                        "id": f"post_{processed}",
-                        "text": text[:500],
-                        "foils_mentioned": foils,
-                        "rider_weight": weight,
-                        "use_case": use_case,
-                        "sentiment": sentiment,
-                        "scraped_at": datetime.now().isoformat()
-                    })
+                for text in await page.evaluate(NEW_ARTICLES_JS):
+                    if len(text) < 50 or processed >= MAX_POSTS:
+                        continue
+                    fp = fingerprint(text)
+                    if fp in seen:
+                        continue
+                    seen.add(fp)
                     
-                    for foil in foils:
-                        data["statistics"]["foil_mentions"][foil] = \
-                            data["statistics"]["foil_mentions"].get(foil, 0) + 1
+                    foils = extract_foil_mentions(text)
+                    weight = extract_weight(text)
+                    use_case = extract_use_case(text)
+                    sentiment = extract_sentiment(text)
                     
-                    if weight and foils:
-                        data["statistics"]["weight_recommendations"].append({
-                            "weight": weight,
-                            "foil": foils[0],
+                    if foils or weight or use_case:
+                        posts_file.write(json.dumps({
+                            "id": f"post_{processed}",
+                            "text": text[:500],
+                            "foils_mentioned": foils,
+                            "rider_weight": weight,
                             "use_case": use_case,
-                            "sentiment": sentiment
-                        })
-                    
-                    if use_case and foils:
-                        if use_case not in data["statistics"]["use_case_feedback"]:
-                            data["statistics"]["use_case_feedback"][use_case] = []
-                        data["statistics"]["use_case_feedback"][use_case].extend(foils)
-                    
-                    processed += 1
-                    if processed % 5 == 0:
-                        print(f"   Processed {processed} relevant posts...")
+                            "sentiment": sentiment,
+                            "scraped_at": datetime.now().isoformat()
+                        }) + "\n")
+                        posts_file.flush()
+                        processed += 1
+                        if processed % 5 == 0:
+                            print(f"   Processed {processed} relevant posts...")
                 
-            except Exception as e:
-                continue
-        
-        data["statistics"]["total_posts"] = len(data["posts"])
+                with open(CHECKPOINT_FILE, 'w') as f:
+                    json.dump({"scroll": i + 1, "seen": sorted(seen)}, f)
+                if (i + 1) % 3 == 0:
+                    print(f"   Scrolled {i+1}/{SCROLL_ITERATIONS} times...")
         
         await browser.close()
         
+        # Build the final file from the saved posts
+        with open(POSTS_FILE) as f:
+            data["posts"] = [json.loads(line) for line in f]
+        for post in data["posts"]:
+            foils = post["foils_mentioned"]
+            for foil in foils:
+                data["statistics"]["foil_mentions"][foil] = \
+                    data["statistics"]["foil_mentions"].get(foil, 0) + 1
+            
+            if post["rider_weight"] and foils:
+                data["statistics"]["weight_recommendations"].append({
+                    "weight": post["rider_weight"],
+                    "foil": foils[0],
+                    "use_case": post["use_case"],
+                    "sentiment": post["sentiment"]
+                })
+            
+            if post["use_case"] and foils:
+                if post["use_case"] not in data["statistics"]["use_case_feedback"]:
+                    data["statistics"]["use_case_feedback"][post["use_case"]] = []
+                data["statistics"]["use_case_feedback"][post["use_case"]].extend(foils)
+        
+        data["statistics"]["total_posts"] = len(data["posts"])
+        
         # Save data
         with open(OUTPUT_FILE, 'w') as f:
             json.dump(data, f, indent=2)
+        POSTS_FILE.unlink()
+        CHECKPOINT_FILE.unlink(missing_ok=True)
         
         print("\n" + "=" * 60)
         print("✅ SCRAPING COMPLETE!")
@@ -220,6 +275,7 @@ if __name__ == "__main__":
         asyncio.run(scrape())
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
+        print(f"   Posts so far are saved in {POSTS_FILE} - run again to continue")
     except Exception as e:
         print(f"\n❌ Error: {e}")
         import traceback
@@ -11,6 +11,10 @@ from datetime import datetime
 from pathlib import Path
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
+from fb_browser import LEAN_LAUNCH_ARGS, RequestBlocker, lean_context_options
+from fb_page import drain_articles, install_article_observer, restore_scroll
+from scrape_run import ScrapeRun
+
 # Facebook group URL
 AXIS_RIDERS_GROUP = "https://www.facebook.com/groups/axisfoilriders"
 
@@ -20,6 +24,8 @@ COOKIE_FILE = Path.home() / ".clawdbot/credentials/fb-cookies-axis-advisor.json"
 # Output file
 OUTPUT_DIR = Path(__file__).parent.parent / "data"
 OUTPUT_FILE = OUTPUT_DIR / "facebook-riders-feedback.json"
+SCROLLS = 10
+MAX_POSTS = 100
 
 def load_cookies():
     """Load Facebook cookies"""
@@ -122,33 +128,34 @@ async def scrape_axis_riders_group():
     print("🚀 AXIS Riders Facebook Group Scraper v2")
     print("=" * 50)
     
-    feedback_data = {
-        "meta": {
-            "scraped_at": datetime.now().isoformat(),
-            "source": AXIS_RIDERS_GROUP,
-            "version": "2.0"
-        },
-        "posts": [],
-        "statistics": {
-            "total_posts": 0,
-            "foil_mentions": {},
-            "weight_recommendations": [],
-            "use_case_feedback": {}
-        }
+    meta = {
+        "scraped_at": datetime.now().isoformat(),
+        "source": AXIS_RIDERS_GROUP,
+        "version": "2.0"
     }
     
+    # Posts are streamed to data/scrape-runs/riders-v2/ and survive a crash
+    run = ScrapeRun("riders-v2", checkpoint_every=1)
+    scroll = run.scroll_count
+    processed = run.state.get("processed", 0)
+    if run.resumed:
+        print(f"♻️  Resuming: {run.posts_written} posts already saved, scroll {scroll}")
+    
     async with async_playwright() as p:
         try:
             print("📱 Launching browser...")
             browser = await p.chromium.launch(
                 headless=False,  # Show browser for debugging
-                args=['--no-sandbox', '--disable-blink-features=AutomationControlled']
+                args=['--no-sandbox', '--disable-blink-features=AutomationControlled'] + LEAN_LAUNCH_ARGS
             )
             
-            context = await browser.new_context(
+            context = await browser.new_context(**lean_context_options(
                 viewport={'width': 1920, 'height': 1080},
                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
+            ))
+            # Only article text is read: skip images, video, fonts and trackers
+            blocker = RequestBlocker()
+            await blocker.install(context)
             
             # Load cookies
             print("🔑 Loading Facebook cookies...")
@@ -189,86 +196,67 @@ async def scrape_axis_riders_group():
             
             print("✅ On group page!")
             
-            # Scroll to load more posts
+            # Scroll to load more posts, extracting new articles in-page as they load
             print("📜 Scrolling to load posts...")
-            for i in range(10):
+            await install_article_observer(page)
+            if run.scroll_y:
+                await restore_scroll(page, run.scroll_y)
+            
+            while scroll < SCROLLS and processed < MAX_POSTS:
                 await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
                 await asyncio.sleep(2)
-                print(f"  Scroll {i+1}/10")
-            
-            # Extract posts
-            print("🔍 Extracting posts...")
-            
-            # Find all post containers
-            posts = await page.query_selector_all('[role="article"]')
-            print(f"  Found {len(posts)} posts")
-            
-            for i, post in enumerate(posts[:100]):  # Process up to 100 posts
-                try:
-                    text_content = await post.inner_text()
-                    
-                    # Skip if too short
-                    if len(text_content) < 50:
-                        continue
-                    
-                    # Extract metadata
-                    foils = extract_foil_mentions(text_content)
-                    weight = extract_weight(text_content)
-                    use_case = extract_use_case(text_content)
-                    skill_level = extract_skill_level(text_content)
-                    sentiment = extract_sentiment(text_content)
-                    
-                    # Only save posts with relevant data
-                    if foils or weight or use_case:
-                        post_data = {
-                            "id": f"post_{i}",
-                            "text": text_content[:500],
-                            "foils_mentioned": foils,
-                            "rider_weight": weight,
-                            "use_case": use_case,
-                            "skill_level": skill_level,
-                            "sentiment": sentiment,
-                            "scraped_at": datetime.now().isoformat()
-                        }
-                        
-                        feedback_data["posts"].append(post_data)
+                scroll += 1
+                posts = await drain_articles(page)
+                print(f"  Scroll {scroll}/{SCROLLS}: {len(posts)} new posts")
+                
+                for post in posts:
+                    if processed >= MAX_POSTS:  # Process up to 100 posts
+                        break
+                    try:
+                        text_content = post["text"]
+                        if run.seen(text_content):
+                            continue
+                        processed += 1
                         
-                        # Update statistics
-                        for foil in foils:
-                            if foil not in feedback_data["statistics"]["foil_mentions"]:
-                                feedback_data["statistics"]["foil_mentions"][foil] = 0
-                            feedback_data["statistics"]["foil_mentions"][foil] += 1
+                        # Extract metadata
+                        foils = extract_foil_mentions(text_content)
+                        weight = extract_weight(text_content)
+                        use_case = extract_use_case(text_content)
+                        skill_level = extract_skill_level(text_content)
+                        sentiment = extract_sentiment(text_content)
                         
-                        if weight and foils:
-                            feedback_data["statistics"]["weight_recommendations"].append({
-                                "weight": weight,
-                                "foil": foils[0],
+                        # Only save posts with relevant data
+                        if foils or weight or use_case:
+                            run.write_post({
+                                "id": f"post_{run.posts_written}",
+                                "text": text_content[:500],
+                                "post_url": post["post_url"],
+                                "foils_mentioned": foils,
+                                "rider_weight": weight,
                                 "use_case": use_case,
-                                "sentiment": sentiment
+                                "skill_level": skill_level,
+                                "sentiment": sentiment,
+                                "scraped_at": datetime.now().isoformat()
                             })
-                        
-                        if use_case:
-                            if use_case not in feedback_data["statistics"]["use_case_feedback"]:
-                                feedback_data["statistics"]["use_case_feedback"][use_case] = []
-                            if foils:
-                                feedback_data["statistics"]["use_case_feedback"][use_case].extend(foils)
+                    
+                    except Exception as e:
+                        print(f"  ⚠️  Error processing post: {e}")
+                        continue
                 
-                except Exception as e:
-                    print(f"  ⚠️  Error processing post {i}: {e}")
-                    continue
-            
-            feedback_data["statistics"]["total_posts"] = len(feedback_data["posts"])
+                run.state["processed"] = processed
+                run.checkpoint(scroll, await page.evaluate("window.scrollY"))
             
             # Save data
-            OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
-            with open(OUTPUT_FILE, 'w') as f:
-                json.dump(feedback_data, f, indent=2)
+            meta["network"] = await blocker.report()
+            stats = run.finalize(OUTPUT_FILE, meta)
             
             print(f"\n✅ Scraping complete!")
             print(f"📊 Statistics:")
-            print(f"  - Total posts with data: {feedback_data['statistics']['total_posts']}")
-            print(f"  - Unique foils mentioned: {len(feedback_data['statistics']['foil_mentions'])}")
-            print(f"  - Weight recommendations: {len(feedback_data['statistics']['weight_recommendations'])}")
+            print(f"  - Total posts with data: {stats['total_posts']}")
+            print(f"  - Unique foils mentioned: {len(stats['foil_mentions'])}")
+            print(f"  - Weight recommendations: {len(stats['weight_recommendations'])}")
+            print(f"  - Network: {meta['network']['bytes_transferred'] / 1e6:.1f} MB, "
+                  f"{meta['network']['blocked']}/{meta['network']['requests']} requests blocked")
             print(f"\n💾 Data saved to: {OUTPUT_FILE}")
             
             await browser.close()
@@ -279,6 +267,11 @@ async def scrape_axis_riders_group():
             print(f"❌ Error: {e}")
             import traceback
             traceback.print_exc()
+        finally:
+            if not run.closed:
+                run.checkpoint(scroll, run.scroll_y, force=True)
+                run.close()
+                print(f"💾 Progress checkpointed ({run.posts_written} posts); re-run to resume.")
 
 if __name__ == "__main__":
     asyncio.run(scrape_axis_riders_group())
@@ -11,6 +11,9 @@ from pathlib import Path
 from datetime import datetime
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
 
+from fb_page import DRAIN_JS, INSTALL_OBSERVER_JS, MAX_PENDING_DRAINS, MIN_TEXT_LENGTH
+from scrape_run import ScrapeRun
+
 # Facebook group URL
 AXIS_RIDERS_GROUP = "https://www.facebook.com/groups/axisfoilriders"
 
@@ -20,6 +23,8 @@ COOKIE_FILE = Path.home() / ".clawdbot/credentials/fb-cookies.json"
 # Output file
 OUTPUT_DIR = Path(__file__).parent.parent / "data"
 OUTPUT_FILE = OUTPUT_DIR / "facebook-riders-feedback.json"
+SCROLLS = 10
+MAX_POSTS = 50
 
 def load_cookies():
     """Load Facebook cookies"""
@@ -124,21 +129,19 @@ def scrape_axis_riders_group():
     print("🚀 AXIS Riders Facebook Group Scraper")
     print("=" * 50)
     
-    feedback_data = {
-        "meta": {
-            "scraped_at": datetime.now().isoformat(),
-            "source": AXIS_RIDERS_GROUP,
-            "version": "1.0"
-        },
-        "posts": [],
-        "statistics": {
-            "total_posts": 0,
-            "foil_mentions": {},
-            "weight_recommendations": [],
-            "use_case_feedback": {}
-        }
+    meta = {
+        "scraped_at": datetime.now().isoformat(),
+        "source": AXIS_RIDERS_GROUP,
+        "version": "1.0"
     }
     
+    # Posts are streamed to data/scrape-runs/riders-sync/ and survive a crash
+    run = ScrapeRun("riders-sync", checkpoint_every=1)
+    scroll = run.scroll_count
+    processed = run.state.get("processed", 0)
+    if run.resumed:
+        print(f"♻️  Resuming: {run.posts_written} posts already saved, scroll {scroll}")
+    
     with sync_playwright() as p:
         try:
             print("📱 Launching browser...")
@@ -181,86 +184,67 @@ def scrape_axis_riders_group():
             
             print("✅ Logged in successfully")
             
-            # Scroll to load more posts
+            # Scroll to load more posts; new articles are queued and serialized in-page
             print("📜 Scrolling to load posts...")
-            for i in range(10):  # Scroll 10 times
+            page.evaluate(INSTALL_OBSERVER_JS)
+            if run.scroll_y:
+                # Feed reloads at the top: scroll back to the checkpoint first
+                for _ in range(scroll):
+                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    time.sleep(1)
+            
+            while scroll < SCROLLS and processed < MAX_POSTS:
                 page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
                 time.sleep(2)
-                print(f"  Scroll {i+1}/10")
-            
-            # Extract posts
-            print("🔍 Extracting posts...")
-            
-            # Find all post containers (adjust selector based on Facebook's structure)
-            posts = page.query_selector_all('[role="article"]')
-            print(f"  Found {len(posts)} posts")
-            
-            for i, post in enumerate(posts[:50]):  # Limit to 50 posts for now
-                try:
-                    text_content = post.inner_text()
-                    
-                    # Skip if too short
-                    if len(text_content) < 50:
-                        continue
-                    
-                    # Extract metadata
-                    foils = extract_foil_mentions(text_content)
-                    weight = extract_weight(text_content)
-                    use_case = extract_use_case(text_content)
-                    skill_level = extract_skill_level(text_content)
-                    sentiment = extract_sentiment(text_content)
-                    
-                    # Only save posts with relevant data
-                    if foils or weight or use_case:
-                        post_data = {
-                            "id": f"post_{i}",
-                            "text": text_content[:500],  # First 500 chars
-                            "foils_mentioned": foils,
-                            "rider_weight": weight,
-                            "use_case": use_case,
-                            "skill_level": skill_level,
-                            "sentiment": sentiment,
-                            "scraped_at": datetime.now().isoformat()
-                        }
-                        
-                        feedback_data["posts"].append(post_data)
+                scroll += 1
+                posts = page.evaluate(DRAIN_JS, [MIN_TEXT_LENGTH, MAX_PENDING_DRAINS])
+                print(f"  Scroll {scroll}/{SCROLLS}: {len(posts)} new posts")
+                
+                for post in posts:
+                    if processed >= MAX_POSTS:  # Limit to 50 posts for now
+                        break
+                    try:
+                        text_content = post["text"]
+                        if run.seen(text_content):
+                            continue
+                        processed += 1
                         
-                        # Update statistics
-                        for foil in foils:
-                            if foil not in feedback_data["statistics"]["foil_mentions"]:
-                                feedback_data["statistics"]["foil_mentions"][foil] = 0
-                            feedback_data["statistics"]["foil_mentions"][foil] += 1
+                        # Extract metadata
+                        foils = extract_foil_mentions(text_content)
+                        weight = extract_weight(text_content)
+                        use_case = extract_use_case(text_content)
+                        skill_level = extract_skill_level(text_content)
+                        sentiment = extract_sentiment(text_content)
                         
-                        if weight and foils:
-                            feedback_data["statistics"]["weight_recommendations"].append({
-                                "weight": weight,
-                                "foil": foils[0],
+                        # Only save posts with relevant data
+                        if foils or weight or use_case:
+                            run.write_post({
+                                "id": f"post_{run.posts_written}",
+                                "text": text_content[:500],  # First 500 chars
+                                "post_url": post["post_url"],
+                                "foils_mentioned": foils,
+                                "rider_weight": weight,
                                 "use_case": use_case,
-                                "sentiment": sentiment
+                                "skill_level": skill_level,
+                                "sentiment": sentiment,
+                                "scraped_at": datetime.now().isoformat()
                             })
-                        
-                        if use_case:
-                            if use_case not in feedback_data["statistics"]["use_case_feedback"]:
-                                feedback_data["statistics"]["use_case_feedback"][use_case] = []
-                            if foils:
-                                feedback_data["statistics"]["use_case_feedback"][use_case].extend(foils)
+                    
+                    except Exception as e:
+                        print(f"  ⚠️  Error processing post: {e}")
+                        continue
                 
-                except Exception as e:
-                    print(f"  ⚠️  Error processing post {i}: {e}")
-                    continue
-            
-            feedback_data["statistics"]["total_posts"] = len(feedback_data["posts"])
+                run.state["processed"] = processed
+                run.checkpoint(scroll, page.evaluate("window.scrollY"))
             
             # Save data
-            OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
-            with open(OUTPUT_FILE, 'w') as f:
-                json.dump(feedback_data, f, indent=2)
+            stats = run.finalize(OUTPUT_FILE, meta)
             
             print(f"\n✅ Scraping complete!")
             print(f"📊 Statistics:")
-            print(f"  - Total posts with data: {feedback_data['statistics']['total_posts']}")
-            print(f"  - Unique foils mentioned: {len(feedback_data['statistics']['foil_mentions'])}")
-            print(f"  - Weight recommendations: {len(feedback_data['statistics']['weight_recommendations'])}")
+            print(f"  - Total posts with data: {stats['total_posts']}")
+            print(f"  - Unique foils mentioned: {len(stats['foil_mentions'])}")
+            print(f"  - Weight recommendations: {len(stats['weight_recommendations'])}")
             print(f"\n💾 Data saved to: {OUTPUT_FILE}")
             
             browser.close()
@@ -271,6 +255,11 @@ def scrape_axis_riders_group():
             print(f"❌ Error: {e}")
             import traceback
             traceback.print_exc()
+        finally:
+            if not run.closed:
+                run.checkpoint(scroll, run.scroll_y, force=True)
+                run.close()
+                print(f"💾 Progress checkpointed ({run.posts_written} posts); re-run to resume.")
 
 if __name__ == "__main__":
     scrape_axis_riders_group()
@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 """
 Smart AXIS Riders scraper - using proven fb-axis-monitor approach
+
+  python3 scripts/scrape-riders-smart.py                 # deep scrape (10-15 min)
+  python3 scripts/scrape-riders-smart.py --incremental   # new posts since the last scan
+
+Posts are streamed to data/scrape-runs/ as they are found (see scrape_run.py);
+re-running after a crash or timeout resumes from the last checkpoint.
 """
 
+import argparse
 import asyncio
 import json
 import re
@@ -11,11 +18,23 @@ from datetime import datetime
 from pathlib import Path
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
+from fb_browser import LEAN_LAUNCH_ARGS, RequestBlocker, lean_context_options
+from fb_page import drain_articles, install_article_observer, restore_scroll
+from scan_state import HighWaterMark, post_key
+from scan_telemetry import Telemetry
+from scrape_run import ScrapeRun
+
 # Config
 AXIS_RIDERS_GROUP = "https://www.facebook.com/groups/axisfoilriders"
 COOKIES_PATH = Path.home() / ".clawdbot/credentials/fb-cookies.json"
 OUTPUT_DIR = Path(__file__).parent.parent / "data"
 OUTPUT_FILE = OUTPUT_DIR / "facebook-riders-feedback.json"
+ARCHIVE_DIR = Path(__file__).parent.parent / "public" / "data" / "archives"
+SOURCE_KEY = "axis_riders_group"
+# "New posts" sort, so an incremental scan can stop at the previous scan's posts
+CHRONOLOGICAL_URL = AXIS_RIDERS_GROUP + "?sorting_setting=CHRONOLOGICAL"
+# Without a stored mark, an incremental scan seeds one from the newest posts only
+INITIAL_MARK_SCROLLS = 20
 
 def load_cookies():
     """Load saved cookies"""
@@ -95,27 +114,26 @@ async def human_delay(min_ms=500, max_ms=2000):
     """Random delay to mimic human behavior"""
     await asyncio.sleep(random.randint(min_ms, max_ms) / 1000.0)
 
-async def scrape_with_stealth():
+async def scrape_with_stealth(incremental=False, block_requests=True):
     """Scrape using stealth tactics from fb-axis-monitor"""
     
     print("🕵️  STEALTH AXIS Riders Scraper")
     print("=" * 50)
     
-    data = {
-        "meta": {
-            "scraped_at": datetime.now().isoformat(),
-            "source": AXIS_RIDERS_GROUP,
-            "version": "stealth-1.0"
-        },
-        "posts": [],
-        "statistics": {
-            "total_posts": 0,
-            "foil_mentions": {},
-            "weight_recommendations": [],
-            "use_case_feedback": {}
-        }
+    meta = {
+        "scraped_at": datetime.now().isoformat(),
+        "source": AXIS_RIDERS_GROUP,
+        "version": "stealth-1.0",
+        "mode": "incremental" if incremental else "deep"
     }
     
+    # Posts go straight to an append-only JSONL file; only fingerprints stay in memory
+    run = ScrapeRun(f"riders-smart-{meta['mode']}")
+    telemetry = Telemetry()
+    scroll_count = run.scroll_count
+    if run.resumed:
+        print(f"♻️  Resuming: {run.posts_written} posts already saved, scroll {scroll_count}")
+    
     async with async_playwright() as p:
         try:
             print("📱 Launching browser with ULTRA-STEALTH settings...")
@@ -131,16 +149,21 @@ async def scrape_with_stealth():
                     '--window-size=1920x1080',
                     '--disable-web-security',
                     '--disable-features=IsolateOrigins,site-per-process'
-                ]
+                ] + (LEAN_LAUNCH_ARGS if block_requests else [])
             )
             
-            # Create context with realistic settings
-            context = await browser.new_context(
+            # Create context with realistic settings (lean profile: no images/video/fonts/trackers)
+            context_options = dict(
                 viewport={'width': 1920, 'height': 1080},
                 user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
                 locale='en-US',
                 timezone_id='America/Los_Angeles'
             )
+            if block_requests:
+                context_options = lean_context_options(**context_options)
+            context = await browser.new_context(**context_options)
+            blocker = RequestBlocker(enabled=block_requests)
+            await blocker.install(context)
             
             # Load cookies
             print("🔑 Loading saved session...")
@@ -178,8 +201,11 @@ async def scrape_with_stealth():
             
             # Navigate to group
             print(f"📂 Navigating to AXIS Riders group...")
-            await page.goto(AXIS_RIDERS_GROUP, wait_until='domcontentloaded', timeout=60000)
-            await human_delay(3000, 5000)
+            group_url = CHRONOLOGICAL_URL if incremental else AXIS_RIDERS_GROUP
+            with telemetry.timer("page_load"):
+                await page.goto(group_url, wait_until='domcontentloaded', timeout=60000)
+            with telemetry.timer("load_settle"):
+                await human_delay(3000, 5000)
             
             print(f"📍 Current URL: {page.url}")
             
@@ -190,52 +216,76 @@ async def scrape_with_stealth():
             
             print("✅ On group page!\n")
             
-            # Scroll naturally and collect posts
-            print("📜 DEEP SCRAPE: Scrolling through entire group history (human-like)...")
-            print("    This will take 10-15 minutes to collect all posts...")
-            
-            seen_texts = set()  # Deduplicate
-            scroll_count = 0
             max_scrolls = 200  # Deep scrape - go back as far as possible
+            mark = None
+            reached_mark = False
+            
+            if incremental:
+                mark = HighWaterMark(SOURCE_KEY)
+                if not mark.has_mark:
+                    max_scrolls = INITIAL_MARK_SCROLLS
+                print(f"📜 INCREMENTAL SCAN: newest posts until the last scan's mark "
+                      f"({'set ' + mark.state[SOURCE_KEY]['marked_at'] if mark.has_mark else 'none yet'})...")
+            else:
+                # Scroll naturally and collect posts
+                print("📜 DEEP SCRAPE: Scrolling through entire group history (human-like)...")
+                print("    This will take 10-15 minutes to collect all posts...")
             no_new_articles_count = 0  # Track consecutive scrolls with no new articles at all
-            last_article_count = 0
             
-            while scroll_count < max_scrolls and no_new_articles_count < 10:
+            # Articles are queued in-page as they are inserted; each drain returns
+            # only the new ones, already serialized, in a single round-trip
+            await install_article_observer(page)
+            if run.scroll_y:
+                # Reloaded feed starts at the top; articles passed on the way are
+                # already fingerprinted and get skipped
+                print(f"⏩ Scrolling back to checkpoint (y={run.scroll_y})...")
+                await restore_scroll(page, run.scroll_y)
+            
+            while scroll_count < max_scrolls and no_new_articles_count < 10 and not reached_mark:
                 # Scroll down gradually
-                await page.evaluate(f"window.scrollBy(0, {random.randint(300, 600)})")
-                await human_delay(1500, 3000)  # Slower scrolling
+                with telemetry.timer("scroll"):
+                    await page.evaluate(f"window.scrollBy(0, {random.randint(300, 600)})")
+                with telemetry.timer("scroll_wait"):
+                    await human_delay(1500, 3000)  # Slower scrolling
                 
-                # Extract visible posts
-                articles = await page.query_selector_all('[role="article"]')
-                current_article_count = len(articles)
+                # Extract posts added since the last scroll
+                with telemetry.timer("drain"):
+                    articles = await drain_articles(page)
+                telemetry.observe("articles_per_drain", len(articles))
+                posts_before = run.posts_written
                 
                 # Check if we're getting new articles (not just new relevant posts)
-                if current_article_count == last_article_count:
+                if not articles:
                     no_new_articles_count += 1
                 else:
                     no_new_articles_count = 0
-                    last_article_count = current_article_count
                 
                 for article in articles:
+                    if mark:
+                        if mark.reached(article):
+                            reached_mark = True
+                            break
+                        if post_key(article) in mark.known:
+                            continue
                     try:
-                        text = await article.inner_text()
+                        text = article["text"]
                         
-                        # Skip if too short or already seen
-                        if len(text) < 50 or text in seen_texts:
+                        # Skip if already seen (64-bit fingerprint, also across resumed runs)
+                        if run.seen(text):
                             continue
                         
-                        seen_texts.add(text)
-                        
                         # Extract data
-                        foils = extract_foil_mentions(text)
-                        weight = extract_weight(text)
-                        use_case = extract_use_case(text)
-                        sentiment = extract_sentiment(text)
+                        with telemetry.timer("extract"):
+                            foils = extract_foil_mentions(text)
+                            weight = extract_weight(text)
+                            use_case = extract_use_case(text)
+                            sentiment = extract_sentiment(text)
                         
                         if foils or weight or use_case:
                             post_data = {
-                                "id": f"post_{len(data['posts'])}",
+                                "id": f"post_{run.posts_written}",
                                 "text": text[:500],
+                                "post_url": article["post_url"],
                                 "foils_mentioned": foils,
                                 "rider_weight": weight,
                                 "use_case": use_case,
@@ -243,48 +293,46 @@ async def scrape_with_stealth():
                                 "scraped_at": datetime.now().isoformat()
                             }
                             
-                            data["posts"].append(post_data)
-                            
-                            # Update stats
-                            for foil in foils:
-                                data["statistics"]["foil_mentions"][foil] = \
-                                    data["statistics"]["foil_mentions"].get(foil, 0) + 1
-                            
-                            if weight and foils:
-                                data["statistics"]["weight_recommendations"].append({
-                                    "weight": weight,
-                                    "foil": foils[0],
-                                    "use_case": use_case,
-                                    "sentiment": sentiment
-                                })
-                            
-                            if use_case and foils:
-                                if use_case not in data["statistics"]["use_case_feedback"]:
-                                    data["statistics"]["use_case_feedback"][use_case] = []
-                                data["statistics"]["use_case_feedback"][use_case].extend(foils)
+                            run.write_post(post_data)
                     
                     except Exception as e:
                         continue
                 
                 scroll_count += 1
+                telemetry.observe("new_posts_per_scroll", run.posts_written - posts_before)
+                await telemetry.sample_page(page, scroll_count)
+                with telemetry.timer("checkpoint"):
+                    run.checkpoint(scroll_count, await page.evaluate("window.scrollY"))
                 if scroll_count % 10 == 0:
-                    print(f"   Scrolled {scroll_count} times, collected {len(data['posts'])} relevant posts...")
-            
-            data["statistics"]["total_posts"] = len(data["posts"])
+                    print(f"   Scrolled {scroll_count} times, collected {run.posts_written} relevant posts...")
             
             # Save data
-            OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
-            with open(OUTPUT_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
+            output_file = OUTPUT_FILE
+            if incremental:
+                # Incremental results are one more scan archive, not a replacement feed
+                meta["scrolls"] = scroll_count
+                meta["reached_mark"] = reached_mark
+                mark.save()
+                meta["high_water_mark"] = mark.state[SOURCE_KEY]
+                stamp = datetime.now().strftime('%Y-%m-%dT%H-%M-%S')
+                output_file = ARCHIVE_DIR / f"fb-scan-{stamp}-incremental.json"
+            meta["network"] = await blocker.report()
+            await telemetry.sample_page(page)
+            meta["telemetry"] = telemetry.summary()
+            stats = run.finalize(output_file, meta)
             
             print("\n" + "=" * 50)
             print("✅ SCRAPING COMPLETE!")
             print("=" * 50)
             print(f"\n📊 Results:")
-            print(f"   Posts with data: {data['statistics']['total_posts']}")
-            print(f"   Unique foils mentioned: {len(data['statistics']['foil_mentions'])}")
-            print(f"   Weight recommendations: {len(data['statistics']['weight_recommendations'])}")
-            print(f"\n💾 Saved to: {OUTPUT_FILE}")
+            print(f"   Posts with data: {stats['total_posts']}")
+            print(f"   Unique foils mentioned: {len(stats['foil_mentions'])}")
+            print(f"   Weight recommendations: {len(stats['weight_recommendations'])}")
+            print(f"   Network: {meta['network']['bytes_transferred'] / 1e6:.1f} MB transferred, "
+                  f"{meta['network']['blocked']}/{meta['network']['requests']} requests blocked")
+            if incremental:
+                print(f"   Scrolls: {scroll_count} ({'stopped at last scan' if reached_mark else 'mark not reached'})")
+            print(f"\n💾 Saved to: {output_file}")
             
             await browser.close()
             
@@ -294,6 +342,17 @@ async def scrape_with_stealth():
             print(f"❌ Error: {e}")
             import traceback
             traceback.print_exc()
+        finally:
+            if not run.closed:
+                run.checkpoint(scroll_count, run.scroll_y, force=True)
+                run.close()
+                print(f"💾 Progress checkpointed ({run.posts_written} posts); re-run to resume.")
 
 if __name__ == "__main__":
-    asyncio.run(scrape_with_stealth())
+    parser = argparse.ArgumentParser(description="Scrape the AXIS Riders FB group")
+    parser.add_argument("--incremental", action="store_true",
+                        help="sort by new and stop at the previous scan's high-water mark")
+    parser.add_argument("--no-block", action="store_true",
+                        help="load images/video/fonts/trackers (disable request blocking)")
+    args = parser.parse_args()
+    asyncio.run(scrape_with_stealth(incremental=args.incremental, block_requests=not args.no_block))
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Checkpointed, streaming output for long scraper runs.
+
+Each run lives in data/scrape-runs/<name>/:
+  posts.jsonl       every extracted post, appended and flushed as it is found
+  seen.bin          64-bit fingerprints of every article already processed
+  checkpoint.json   scroll position + counters, rewritten every few scrolls
+
+If a run dies (timeout, crash, Ctrl-C) the next run with the same name
+resumes: posts already written are kept, their fingerprints are re-read so
+they are not extracted again, and the scraper scrolls back to the saved
+position before collecting. finalize() streams posts.jsonl into the usual
+{meta, posts, statistics} output file and removes the run directory.
+
+Only fingerprints are held in memory (not post texts), so memory stays
+bounded however deep the scrape goes.
+"""
+
+import json
+import os
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+from scan_state import fingerprint
+
+RUNS_DIR = Path(__file__).parent.parent / "data" / "scrape-runs"
+CHECKPOINT_EVERY = 10  # scrolls
+
+class ScrapeRun:
+    def __init__(self, name, runs_dir=RUNS_DIR, checkpoint_every=CHECKPOINT_EVERY):
+        self.dir = Path(runs_dir) / name
+        self.posts_path = self.dir / "posts.jsonl"
+        self.seen_path = self.dir / "seen.bin"
+        self.checkpoint_path = self.dir / "checkpoint.json"
+        self.checkpoint_every = checkpoint_every
+        self.fingerprints = set()
+        self._unsaved = array('Q')
+        self.state = {"started_at": datetime.now().isoformat(), "scroll_count": 0,
+                      "scroll_y": 0, "posts_written": 0, "checkpoints": 0}
+        self.resumed = self.checkpoint_path.exists() or self.posts_path.exists()
+        self.dir.mkdir(parents=True, exist_ok=True)
+        if self.resumed:
+            self._load()
+        self._posts = open(self.posts_path, 'a')
+
+    def _load(self):
+        if self.checkpoint_path.exists():
+            with open(self.checkpoint_path) as f:
+                self.state.update(json.load(f))
+        if self.seen_path.exists():
+            fps = array('Q')
+            with open(self.seen_path, 'rb') as f:
+                raw = f.read()
+            fps.frombytes(raw[:len(raw) - len(raw) % fps.itemsize])
+            self.fingerprints.update(fps)
+        # posts.jsonl is the source of truth: it may be ahead of the last checkpoint,
+        # and a crash mid-write can leave a partial last line
+        written = 0
+        good_bytes = 0
+        if self.posts_path.exists():
+            with open(self.posts_path, 'rb') as f:
+                for line in f:
+                    try:
+                        post = json.loads(line)
+                    except ValueError:
+                        break
+                    good_bytes += len(line)
+                    written += 1
+                    self.fingerprints.add(fingerprint(post.get("text")))
+            os.truncate(self.posts_path, good_bytes)
+        self.state["posts_written"] = written
+
+    @property
+    def scroll_count(self):
+        return self.state["scroll_count"]
+
+    @property
+    def scroll_y(self):
+        return self.state["scroll_y"]
+
+    @property
+    def posts_written(self):
+        return self.state["posts_written"]
+
+    def seen(self, text) -> bool:
+        """True if this article text was processed before; otherwise remember it."""
+        fp = fingerprint(text)
+        if fp in self.fingerprints:
+            return True
+        self.fingerprints.add(fp)
+        self._unsaved.append(fp)
+        return False
+
+    def write_post(self, post):
+        self._posts.write(json.dumps(post, ensure_ascii=False) + '\n')
+        self._posts.flush()
+        self.state["posts_written"] += 1
+
+    def checkpoint(self, scroll_count, scroll_y=0, force=False):
+        """Persist fingerprints and scroll position (every checkpoint_every scrolls)."""
+        if not force and scroll_count % self.checkpoint_every:
+            return
+        if self._unsaved:
+            with open(self.seen_path, 'ab') as f:
+                self._unsaved.tofile(f)
+            self._unsaved = array('Q')
+        self._posts.flush()
+        os.fsync(self._posts.fileno())
+        self.state.update(scroll_count=scroll_count, scroll_y=scroll_y,
+                          checkpoints=self.state["checkpoints"] + 1,
+                          checkpointed_at=datetime.now().isoformat())
+        tmp = self.checkpoint_path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.checkpoint_path)
+
+    def iter_posts(self):
+        self._posts.flush()
+        with open(self.posts_path) as f:
+            for line in f:
+                yield json.loads(line)
+
+    def finalize(self, output_file, meta):
+        """Stream the run's posts into output_file as {meta, posts, statistics}.
+
+        Returns the statistics block. The run directory is removed afterwards.
+        """
+        stats = {"total_posts": 0, "foil_mentions": {}, "weight_recommendations": [],
+                 "use_case_feedback": {}}
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = output_file.with_suffix('.tmp')
+        with open(tmp, 'w') as out:
+            out.write('{\n  "meta": ' + json.dumps(meta) + ',\n  "posts": [')
+            for i, post in enumerate(self.iter_posts()):
+                out.write((',' if i else '') + '\n    ' + json.dumps(post))
+                stats["total_posts"] += 1
+                foils = post.get("foils_mentioned") or []
+                for foil in foils:
+                    stats["foil_mentions"][foil] = stats["foil_mentions"].get(foil, 0) + 1
+                if post.get("rider_weight") and foils:
+                    stats["weight_recommendations"].append({
+                        "weight": post["rider_weight"],
+                        "foil": foils[0],
+                        "use_case": post.get("use_case"),
+                        "sentiment": post.get("sentiment"),
+                    })
+                if post.get("use_case") and foils:
+                    stats["use_case_feedback"].setdefault(post["use_case"], []).extend(foils)
+            out.write('\n  ],\n  "statistics": ' + json.dumps(stats, indent=2) + '\n}\n')
+        os.replace(tmp, output_file)
+        self.close()
+        for path in (self.posts_path, self.seen_path, self.checkpoint_path):
+            path.unlink(missing_ok=True)
+        try:
+            self.dir.rmdir()
+        except OSError:
+            pass
+        return stats
+
+    @property
+    def closed(self):
+        return self._posts.closed
+
+    def close(self):
+        if not self._posts.closed:
+            self._posts.close()
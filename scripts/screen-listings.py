@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Screen a marketplace listing export for likely counterfeits.
+
+Reads a .csv or .jsonl dump (columns title/name, price, description, id/url;
+other columns are ignored), scores every listing with listing_screen.Screener
+and writes one JSON line per listing, in input order, to the report:
+
+  python3 scripts/screen-listings.py listings.csv
+  python3 scripts/screen-listings.py listings.jsonl --output report.jsonl --min-level medium
+
+Rebuild the price index first if axis-products.json changed
+(build-price-index.py).
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from listing_screen import LEVELS, UNRESOLVED, Screener, read_listings
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk counterfeit screening of marketplace listings")
+    parser.add_argument("listings", help=".csv or .jsonl listing export")
+    parser.add_argument("--output", help="report path (default: <listings>.screened.jsonl, '-' for stdout)")
+    parser.add_argument("--min-level", choices=[level for level, _ in LEVELS], default="low",
+                        help="only report listings at or above this risk level")
+    args = parser.parse_args()
+
+    source = Path(args.listings)
+    output = args.output or str(source.with_suffix(".screened.jsonl"))
+    floor = dict(LEVELS)[args.min_level]
+
+    log = sys.stderr if output == "-" else sys.stdout
+    print(f"🛡️  Screening {source.name}", file=log)
+    print("=" * 50, file=log)
+    screener = Screener()
+    levels, flags = Counter(), Counter()
+    resolved = written = 0
+    started = time.perf_counter()
+    out = sys.stdout if output == "-" else open(output, 'w')
+    try:
+        for result in screener.screen_all(read_listings(source)):
+            levels[result["level"]] += 1
+            flags.update(result["flags"])
+            resolved += "product" in result
+            if result["score"] >= floor:
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                written += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+
+    total = sum(levels.values())
+    print(f"✅ {total:,} listings in {elapsed:.2f}s ({total / max(elapsed, 1e-9):,.0f}/s), "
+          f"{resolved:,} matched to an AXIS product", file=log)
+    print(f"   🚨 high {levels['high']:,}   ⚠️  medium {levels['medium']:,}   ✔️  low {levels['low']:,}   "
+          f"❔ unresolved {levels[UNRESOLVED]:,}", file=log)
+    for flag, count in flags.most_common(5):
+        print(f"   {flag:<26} {count:,}", file=log)
+    cache = screener.resolve.cache_info()
+    print(f"   title cache: {cache.hits:,} hits / {cache.misses:,} misses", file=log)
+    print(f"💾 {written:,} listings written to {output}", file=log)
+
+if __name__ == "__main__":
+    main()
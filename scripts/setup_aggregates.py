@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Normalized rider-setup table with incrementally maintained aggregations.
+
+community-setups.json used to grow one ad-hoc block per scan (riders,
+setups, new_setups_2026_03_31_PM, ...) with a different record shape in
+each. normalize_record() turns any of those shapes into flat setup rows
+(one per rider x discipline setup); SetupAggregates keeps the counters the
+insights need and updates them per row, so applying a scan delta costs
+O(delta) instead of a full recount.
+"""
+
+import hashlib
+import re
+
+from foil_catalog import get_catalog
+
+# Ordered: first match wins per discipline string, "parawing" before "wing"
+DISCIPLINE_RULES = [
+    ("parawing", ("parawing", "para wing", "para-wing")),
+    ("downwind", ("downwind", "down wind", "dw ")),
+    ("wing", ("wing",)),
+    ("prone", ("prone", "surf", "boogie")),
+    ("sup", ("sup",)),
+    ("pump", ("pump", "dock")),
+    ("kite", ("kite",)),
+    ("wake", ("wake",)),
+    ("tow", ("tow",)),
+    ("foil_assist", ("efoil", "e-foil", "foildrive", "foil drive", "foil_drive", "assist")),
+]
+
+# Raw keys folded into normalized row columns
+FRONT_WING_KEYS = ("front_wing", "frontWing", "front_wings", "primary_foil", "other_foils",
+                   "foil", "foils", "wings", "primary_wing", "front_wing_alt",
+                   "alternate_wing", "secondary_foils", "front_wings_owned", "extra_wing")
+REAR_WING_KEYS = ("rear_wing", "rearWing", "tail", "stab", "stabilizer")
+MAST_KEYS = ("mast",)
+FUSELAGE_KEYS = ("fuselage", "fuse")
+NESTED_SETUP_KEYS = ("setup", "current_setup")
+RIDER_KEYS = ("rider_name", "rider", "name")
+WEIGHT_RE = re.compile(r'(\d{2,3}(?:\.\d)?)\s*(kg|lbs?|pounds?)?', re.IGNORECASE)
+
+def normalize_disciplines(value) -> list:
+    """Canonical discipline tags from a string, list or dict-of-disciplines."""
+    if isinstance(value, dict):
+        value = list(value)
+    if isinstance(value, str):
+        value = re.split(r'[,/;]| and ', value)
+    tags = []
+    for raw in value or []:
+        text = re.sub(r'([a-z])([A-Z])', r'\1 \2', str(raw)).lower().replace('_', ' ') + ' '
+        for tag, needles in DISCIPLINE_RULES:
+            if any(n in text for n in needles):
+                tags.append(tag)
+                break
+    return list(dict.fromkeys(tags)) or ["other"]
+
+def parse_weight_kg(record):
+    """Rider weight in kg from the many weight fields.
+
+    Bands like '85-95 kg' give their midpoint; open-ended ones ('Under 65 kg',
+    'Over 105 kg') sit 5 kg past the edge.
+    """
+    for key in ("rider_weight_kg", "weight_kg"):
+        if isinstance(record.get(key), (int, float)):
+            return round(float(record[key]), 1)
+    if isinstance(record.get("weight_lbs"), (int, float)):
+        return round(record["weight_lbs"] / 2.20462, 1)
+    raw = record.get("weight") or record.get("rider_weight")
+    if isinstance(raw, (int, float)):
+        # Bare numbers above 140 are pounds in practice
+        return round(raw / 2.20462, 1) if raw > 140 else float(raw)
+    if isinstance(raw, str):
+        # Survey bands give both units ("75-85 kg / 165-187 lbs"); use the kg half
+        raw = next((part for part in raw.split('/') if re.search(r'kg', part, re.I)), raw)
+        nums = [float(m.group(1)) for m in WEIGHT_RE.finditer(raw)]
+        if not nums:
+            return None
+        kg = sum(nums[:2]) / len(nums[:2])
+        # Open-ended bands ("Under 65 kg", "Over 105 kg"): half a band past the edge
+        if re.search(r'under|<', raw, re.I):
+            kg -= 5
+        elif re.search(r'over|>', raw, re.I):
+            kg += 5
+        return round(kg / 2.20462, 1) if re.search(r'lb|pound', raw, re.I) else round(kg, 1)
+    return None
+
+def _strings(value):
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [str(v) for v in value if isinstance(v, (str, int))]
+    return []
+
+def _first_str(record, keys):
+    for k in keys:
+        vals = _strings(record.get(k))
+        if vals:
+            return ', '.join(vals)
+    return None
+
+def front_wings(record) -> list:
+    """Canonical front-wing ids mentioned in a (sub)setup's wing fields."""
+    catalog = get_catalog()
+    ids = []
+    for key in FRONT_WING_KEYS:
+        for mention in _strings(record.get(key)):
+            ids.extend(catalog.extract(mention, include_uncatalogued=True))
+    return list(dict.fromkeys(ids))
+
+def _row_id(base, index, rider, date, source):
+    """Stable row id, so re-applying the same scan delta is idempotent."""
+    if base is not None:
+        # Survey responses are numbered 1..N; keep them apart from FB ids
+        base = f"survey_{base}" if isinstance(base, int) else str(base)
+        return base if index == 0 else f"{base}_{index}"
+    seed = f"{rider}|{date}|{source}|{index}"
+    return "setup_" + hashlib.blake2b(seed.encode(), digest_size=6).hexdigest()
+
+def normalize_record(record, default_source=None, default_date=None) -> list:
+    """Flatten one legacy rider/setup record into normalized setup rows."""
+    rider = _first_str(record, RIDER_KEYS)
+    date = record.get("date") or record.get("scan_date") or default_date
+    source = record.get("source") or default_source
+    weight = parse_weight_kg(record)
+    base_id = record.get("id")
+
+    # (disciplines, setup fields) pairs
+    parts = []
+    if isinstance(record.get("disciplines"), dict):
+        for disc, setup in record["disciplines"].items():
+            parts.append(([disc], setup if isinstance(setup, dict) else {}))
+    if isinstance(record.get("setups"), list):
+        for setup in record["setups"]:
+            if isinstance(setup, dict):
+                parts.append((_strings(setup.get("discipline")) or
+                              _strings(record.get("discipline")), setup))
+    if not parts:
+        setup = dict(record)
+        for key in NESTED_SETUP_KEYS:
+            if isinstance(record.get(key), dict):
+                setup.update(record[key])
+        parts.append((record.get("disciplines") or record.get("discipline"), setup))
+
+    rows = []
+    for i, (disciplines, setup) in enumerate(parts):
+        rows.append({
+            "id": _row_id(base_id, i, rider, date, source),
+            "rider": rider,
+            "rider_key": (rider or f"anon_{base_id}").strip().lower(),
+            "date": date,
+            "source": source,
+            "disciplines": normalize_disciplines(disciplines),
+            "weight_kg": weight,
+            "experience": record.get("experience"),
+            "location": record.get("location"),
+            "front_wings": front_wings(setup),
+            "front_wing_text": _first_str(setup, FRONT_WING_KEYS),
+            "rear_wing": _first_str(setup, REAR_WING_KEYS),
+            "mast": _first_str(setup, MAST_KEYS),
+            "fuselage": _first_str(setup, FUSELAGE_KEYS),
+            "board": _first_str(setup, ("board",)),
+            "sentiment": record.get("sentiment"),
+            "notes": setup.get("notes") or record.get("notes"),
+        })
+    return rows
+
+def _bump(counter, key, delta):
+    counter[key] = counter.get(key, 0) + delta
+    if counter[key] <= 0:
+        del counter[key]
+
+class SetupAggregates:
+    """Materialized counters over the setup table, updated row by row."""
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.setup_count = state.get("setup_count", 0)
+        self.setups_by_discipline = dict(state.get("setups_by_discipline", {}))
+        self.front_wings = dict(state.get("front_wings", {}))
+        self.front_wings_by_discipline = {d: dict(c) for d, c in
+                                          state.get("front_wings_by_discipline", {}).items()}
+        self.rider_setups = dict(state.get("rider_setups", {}))
+
+    def _apply(self, row, sign):
+        self.setup_count += sign
+        _bump(self.rider_setups, row["rider_key"], sign)
+        for disc in row["disciplines"]:
+            _bump(self.setups_by_discipline, disc, sign)
+            per_disc = self.front_wings_by_discipline.setdefault(disc, {})
+            for wing in row["front_wings"]:
+                _bump(per_disc, wing, sign)
+            if not per_disc:
+                del self.front_wings_by_discipline[disc]
+        for wing in row["front_wings"]:
+            _bump(self.front_wings, wing, sign)
+
+    def upsert(self, table, row):
+        """Insert or replace row in table (id -> row), adjusting only its own counts."""
+        old = table.get(row["id"])
+        if old is not None:
+            self._apply(old, -1)
+        table[row["id"]] = row
+        self._apply(row, +1)
+        return old is None
+
+    @property
+    def rider_count(self):
+        return len(self.rider_setups)
+
+    def to_state(self):
+        return {
+            "setup_count": self.setup_count,
+            "rider_count": self.rider_count,
+            "setups_by_discipline": dict(sorted(self.setups_by_discipline.items(),
+                                                key=lambda kv: -kv[1])),
+            "front_wings": dict(sorted(self.front_wings.items(), key=lambda kv: -kv[1])),
+            "front_wings_by_discipline": {
+                d: dict(sorted(c.items(), key=lambda kv: -kv[1]))
+                for d, c in sorted(self.front_wings_by_discipline.items())},
+            "rider_setups": self.rider_setups,
+        }
+
+    def summary(self, top_n=10):
+        """Fixed-size view for /insights: top-N lists only, independent of table size."""
+        catalog = get_catalog()
+
+        def top(counter):
+            return [{"id": k, "label": catalog.label(k), "count": v} for k, v in
+                    sorted(counter.items(), key=lambda kv: (-kv[1], kv[0]))[:top_n]]
+        return {
+            "setup_count": self.setup_count,
+            "rider_count": self.rider_count,
+            "setups_by_discipline": dict(sorted(self.setups_by_discipline.items(),
+                                                key=lambda kv: -kv[1])),
+            "top_front_wings": top(self.front_wings),
+            "top_front_wings_by_discipline": {d: top(c) for d, c in
+                                              sorted(self.front_wings_by_discipline.items())},
+        }
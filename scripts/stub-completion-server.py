@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the completion endpoint used by extract-youtube-feedback.py.
+
+  python3 scripts/stub-completion-server.py --port 8765 --latency-ms 200
+
+Answers both /v1/messages (Anthropic) and /v1/chat/completions (OpenAI)
+with one deterministic entry per catalog foil found in the transcript part of
+the prompt. GET /stats returns how many completions were served, so a test
+can check what the cache saved.
+"""
+
+import argparse
+import json
+import re
+import threading
+import zlib
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from foil_catalog import get_catalog
+
+def fake_entries(prompt):
+    catalog = get_catalog()
+    header, _, transcript = prompt.rpartition("Transcript (part")
+    video = f"{zlib.crc32(header.encode()):08x}"
+    entries = []
+    for foil_id in catalog.extract(transcript):
+        sentence = next((s for s in re.split(r'(?<=[.!?])\s+', transcript)
+                         if foil_id.split('-')[-1] in s), transcript[:200])
+        entries.append({
+            "id": f"yt_stub_{video}_{foil_id.replace('-', '_')}",
+            "source": "youtube",
+            "rider": "Unknown Reviewer",
+            "rider_authority": "community",
+            "text": " ".join(sentence.split())[:300],
+            "foils_mentioned": [foil_id],
+            "key_insight": "stub",
+            "sentiment": "neutral",
+            "use_case": "allround",
+        })
+    return entries
+
+def make_handler(latency_ms, counter):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._send({"completions": counter["n"]})
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            text = json.dumps(fake_entries(request["messages"][-1]["content"]))
+            if latency_ms:
+                time.sleep(latency_ms / 1000)
+            with counter["lock"]:
+                counter["n"] += 1
+            if self.path == "/v1/messages":
+                self._send({"type": "message", "role": "assistant",
+                            "content": [{"type": "text", "text": text}]})
+            elif self.path == "/v1/chat/completions":
+                self._send({"choices": [{"message": {"role": "assistant", "content": text}}]})
+            else:
+                self.send_error(404)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+def serve(port=8765, latency_ms=0):
+    """Start the stub on a background thread; port 0 picks a free port."""
+    counter = {"n": 0, "lock": threading.Lock()}
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(latency_ms, counter))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub completion endpoint for offline extraction runs")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    args = parser.parse_args()
+    server = serve(args.port, args.latency_ms)
+    print(f"🧪 Stub completion server on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Setup cube over the community survey, for slice-and-dice on /insights.
+
+Every survey setup is one fact along seven dimensions: discipline, weight
+band, experience, age, front wing series, rear wing line and mast type.
+Each dimension has a fixed list of values (free-text answers are bucketed,
+front wings through the foil alias registry), so a cell is addressed by a
+mixed-radix index, like a dense count array of shape DIMS. Nearly all of
+the ~3M cells of that array are empty for a few hundred setups, so only
+non-empty cells are stored: sorted linear indices with their counts
+(public/data/survey-cube.json). Any roll-up or slice is one pass over
+those cells and returns a dense array over the dimensions kept.
+
+A setup naming several disciplines or front wings counts once in each, so
+counts are setup mentions, not riders.
+
+    from survey_cube import Cube
+    cube = Cube.load()
+    cube.breakdown("front_wing", where={"discipline": ["Wing Foiling"]})
+    cube.rollup(["discipline", "weight"])
+"""
+
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+
+from foil_catalog import SERIES_IDS, get_catalog
+from survey_stats import DISCIPLINES, WEIGHT_NUM_RE, discipline_for, weight_band
+
+PUBLIC_DIR = Path(__file__).parent.parent / "public" / "data"
+CUBE_FILE = PUBLIC_DIR / "survey-cube.json"
+SETUPS_FILE = PUBLIC_DIR / "community-setups.json"
+CUBE_VERSION = 1
+NOT_ANSWERED = "Not answered"
+
+# Ordered: first pattern found wins
+REAR_WING_RULES = [
+    ("Surf Skinny", re.compile(r'surf\s*skinny|skinny\s*surf|\bsurf\b', re.I)),
+    ("Skinny", re.compile(r'skinny', re.I)),
+    ("Progressive", re.compile(r'progressive|\bprog\b', re.I)),
+    ("Freeride", re.compile(r'freeride', re.I)),
+    ("Speed", re.compile(r'speed', re.I)),
+    ("Pump", re.compile(r'pump', re.I)),
+]
+MAST_RULES = [
+    ("UHM Carbon", re.compile(r'uhm|ultra|\bpro\b', re.I)),
+    ("Power Carbon", re.compile(r'fatty', re.I)),
+    ("HM Carbon", re.compile(r'\bhm|high\s*mod', re.I)),
+    ("Power Carbon", re.compile(r'power\s*carbon|\bpc\b', re.I)),
+    ("Aluminium", re.compile(r'\bal+u|alumin', re.I)),
+]
+# Just a length ("75", "82cm"): a mast or rear wing with no line named
+SIZE_ONLY_RE = re.compile(r'^[\d.,/\s]*(?:cm|mm)?\s*$', re.I)
+
+DIMS = [
+    ("discipline", DISCIPLINES + ["Other"]),
+    ("weight", ["<65kg", "65-75kg", "75-85kg", "85-95kg", "95-105kg", ">105kg", NOT_ANSWERED]),
+    ("experience", ["Less than 1 year", "1-2 years", "2-4 years", "4+ years", NOT_ANSWERED]),
+    ("age", ["Under 25", "25-35", "36-45", "46-55", "56-65", "65+", NOT_ANSWERED]),
+    ("front_wing", list(SERIES_IDS) + ["Other", NOT_ANSWERED]),
+    ("rear_wing", [name for name, _ in REAR_WING_RULES] + ["Unspecified", "Other", NOT_ANSWERED]),
+    ("mast", ["UHM Carbon", "HM Carbon", "Power Carbon", "Aluminium", "Unspecified", "Other",
+              NOT_ANSWERED]),
+]
+
+SERIES_BY_PREFIX = {prefix: series for series, prefix in SERIES_IDS.items()}
+
+def band_for_kg(kg):
+    if kg is None:
+        return NOT_ANSWERED
+    for upper, band in ((65, "<65kg"), (75, "65-75kg"), (85, "75-85kg"), (95, "85-95kg"), (105, "95-105kg")):
+        if kg < upper:
+            return band
+    return ">105kg"
+
+def _weight(label):
+    """Form weight answer -> band; a bare number ("82") is banded as kg."""
+    band = weight_band(label)
+    if band in DIMS[1][1]:
+        return band
+    nums = WEIGHT_NUM_RE.findall(label or "")
+    return band_for_kg(int(nums[0])) if nums else NOT_ANSWERED
+
+def _labelled(value, values):
+    """Form answer -> one of the dimension's labels ("1-2 years (...)" -> "1-2 years")."""
+    value = (value or "").strip()
+    return next((v for v in values if v != NOT_ANSWERED and value.startswith(v)), NOT_ANSWERED)
+
+def _family(text, rules):
+    text = (text or "").strip()
+    if not text:
+        return NOT_ANSWERED
+    for name, rx in rules:
+        if rx.search(text):
+            return name
+    return "Unspecified" if SIZE_ONLY_RE.match(text) else "Other"
+
+def wing_series(ids=(), text=None):
+    """Front wing series for canonical ids, else for the free-text answer."""
+    catalog = get_catalog()
+    if not ids and text:
+        ids = catalog.extract(text, include_uncatalogued=True)
+    series = [SERIES_BY_PREFIX.get(fid.rsplit('-', 1)[0]) for fid in ids]
+    series = [s for s in series if s]
+    if not series and text:
+        series = catalog.series_mentions(text) or ["Other"]
+    return list(dict.fromkeys(series)) or [NOT_ANSWERED]
+
+def facts_from_responses(table):
+    """Cube facts from survey_stats response rows (build-community-stats.py state)."""
+    for row in table.values():
+        experience = _labelled(row.get("experience"), DIMS[2][1])
+        age = _labelled(row.get("age"), DIMS[3][1])
+        weight = _weight(row.get("weight"))
+        for discipline, setup in row["setups"].items():
+            for series in wing_series(text=setup.get("front_wing")):
+                yield (discipline, weight, experience, age, series,
+                       _family(setup.get("rear_wing"), REAR_WING_RULES),
+                       _family(setup.get("mast"), MAST_RULES))
+
+def facts_from_setups(doc):
+    """Cube facts from the survey rows of community-setups.json (no age asked there)."""
+    for row in doc["setups"]:
+        if "survey" not in (row.get("source") or "").lower():
+            continue
+        experience = _labelled(row.get("experience"), DIMS[2][1])
+        weight = band_for_kg(row.get("weight_kg"))
+        series_list = wing_series(row.get("front_wings") or (), row.get("front_wing_text"))
+        for tag in row["disciplines"]:
+            discipline = discipline_for(tag) or "Other"
+            for series in series_list:
+                yield (discipline, weight, experience, NOT_ANSWERED, series,
+                       _family(row.get("rear_wing"), REAR_WING_RULES),
+                       _family(row.get("mast"), MAST_RULES))
+
+def build_cube(facts, source):
+    shape = [len(values) for _, values in DIMS]
+    positions = [{v: i for i, v in enumerate(values)} for _, values in DIMS]
+    cells = {}
+    records = 0
+    for fact in facts:
+        index = 0
+        for value, size, pos in zip(fact, shape, positions):
+            index = index * size + pos[value]
+        cells[index] = cells.get(index, 0) + 1
+        records += 1
+    order = sorted(cells)
+    return {
+        "meta": {
+            "version": CUBE_VERSION,
+            "built_at": datetime.now().isoformat(),
+            "source": source,
+            "facts": records,
+            "layout": "cell index = mixed radix over dims (last dim fastest); only non-empty cells stored",
+        },
+        "dims": [{"name": name, "values": values} for name, values in DIMS],
+        "cells": order,
+        "counts": [cells[i] for i in order],
+    }
+
+def save_cube(data, path=CUBE_FILE):
+    """Compact JSON: the page fetches this whole file."""
+    with open(path, 'w') as f:
+        json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+
+class Cube:
+    def __init__(self, data):
+        self.meta = data["meta"]
+        self.names = [d["name"] for d in data["dims"]]
+        self.values = [d["values"] for d in data["dims"]]
+        self.shape = [len(v) for v in self.values]
+        self.cells = data["cells"]
+        self.counts = data["counts"]
+        self.strides = [1] * len(self.shape)
+        for i in range(len(self.shape) - 2, -1, -1):
+            self.strides[i] = self.strides[i + 1] * self.shape[i + 1]
+
+    @classmethod
+    def load(cls, path=CUBE_FILE):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def rollup(self, keep, where=None):
+        """Dense counts over the kept dims (row-major), summing out the rest; where filters cells.
+
+        where maps a dim name to the values allowed, e.g. {"discipline": ["Wing Foiling"]};
+        an empty list leaves that dim unfiltered. Returns (shape, flat counts).
+        """
+        axes = [self.names.index(name) for name in keep]
+        filters = [(self.names.index(name), {self.values[self.names.index(name)].index(v) for v in allowed})
+                   for name, allowed in (where or {}).items() if allowed]
+        out_shape = [self.shape[a] for a in axes]
+        out = [0] * max(1, _product(out_shape))
+        for cell, count in zip(self.cells, self.counts):
+            coords = [(cell // stride) % size for stride, size in zip(self.strides, self.shape)]
+            if any(coords[axis] not in allowed for axis, allowed in filters):
+                continue
+            index = 0
+            for axis in axes:
+                index = index * self.shape[axis] + coords[axis]
+            out[index] += count
+        return out_shape, out
+
+    def breakdown(self, dim, where=None):
+        """[(value, count)] along one dim for the slice, largest first, empty values dropped."""
+        _, counts = self.rollup([dim], where)
+        values = self.values[self.names.index(dim)]
+        return sorted(((v, c) for v, c in zip(values, counts) if c), key=lambda vc: -vc[1])
+
+def _product(sizes):
+    n = 1
+    for size in sizes:
+        n *= size
+    return n
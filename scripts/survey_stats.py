@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Community survey aggregation: raw form responses -> community-stats.json.
+
+Responses come from a Google Forms export, either the sheet as CSV or JSONL
+(one response per line, flat sheet columns or already-structured records).
+normalize_response() maps the form's columns onto one row per respondent:
+demographics plus a setup (front wing, rear wing, mast, fuselage) per
+discipline ridden. SurveyAggregates keeps every count the stats file needs,
+keyed so each group-by is one counter update per row, and updates them per
+response the same way SetupAggregates does for community setups: a new or
+edited response touches only its own counts.
+
+    from survey_stats import SurveyAggregates, normalize_response
+    aggs = SurveyAggregates()
+    table = {}
+    for raw in responses:
+        aggs.upsert(table, normalize_response(raw))
+    stats = aggs.community_stats(meta)
+"""
+
+import csv
+import hashlib
+import json
+import re
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+# Canonical discipline names as in community-stats.json, in display order
+DISCIPLINES = [
+    "Downwind SUP Foiling", "Prone Foiling (Surf)", "Wing Foiling", "Kite Foiling",
+    "Wake Foiling", "Tow-In Foiling", "Windsurf Foiling", "Long Distance Pump / Flat Water",
+    "Dock Start", "SUP Foiling (Non-Downwind)", "Parawing", "Foil Assist", "Efoil",
+]
+
+# Ordered: first needle found wins ("non-downwind" before "downwind", "windsurf" before "surf")
+DISCIPLINE_RULES = [
+    ("non-downwind", "SUP Foiling (Non-Downwind)"), ("downwind", "Downwind SUP Foiling"),
+    ("parawing", "Parawing"), ("para wing", "Parawing"), ("windsurf", "Windsurf Foiling"),
+    ("wing", "Wing Foiling"), ("prone", "Prone Foiling (Surf)"), ("surf", "Prone Foiling (Surf)"),
+    ("kite", "Kite Foiling"), ("wake", "Wake Foiling"), ("tow", "Tow-In Foiling"),
+    ("pump", "Long Distance Pump / Flat Water"), ("flat water", "Long Distance Pump / Flat Water"),
+    ("dock", "Dock Start"), ("sup", "SUP Foiling (Non-Downwind)"), ("assist", "Foil Assist"),
+    ("efoil", "Efoil"), ("e-foil", "Efoil"),
+]
+
+DEMOGRAPHICS = ("weight", "experience", "age", "gender")
+
+# Sheet header -> field; matched as whole words, case-insensitive
+DEMOGRAPHIC_COLUMNS = {
+    "weight": re.compile(r'\bweight\b', re.I),
+    "experience": re.compile(r'\bexperience\b|how long|years (?:of )?foiling', re.I),
+    "age": re.compile(r'\bage\b', re.I),
+    "gender": re.compile(r'\bgender\b', re.I),
+}
+COMPONENT_COLUMNS = {
+    "front_wing": re.compile(r'front\s*wing', re.I),
+    "rear_wing": re.compile(r'rear\s*wing|stabili[sz]er|\btail\b', re.I),
+    "mast": re.compile(r'\bmast\b', re.I),
+    "fuselage": re.compile(r'\bfuse(?:lage)?\b', re.I),
+}
+COMPONENT_LISTS = {"front_wing": "top_front_wings", "rear_wing": "top_rear_wings",
+                   "mast": "top_masts", "fuselage": "top_fuselages"}
+DISCIPLINES_COLUMN = re.compile(r'discipline|what do you ride|which .*ride', re.I)
+ID_COLUMNS = ("response_id", "responseid", "id")
+TIME_COLUMNS = ("submitted_at", "timestamp", "lastsubmittedtime", "createtime")
+WEIGHT_NUM_RE = re.compile(r'\d+')
+# Sheet timestamp formats (US-locale sheets write M/D/YYYY)
+TIME_FORMATS = ("%m/%d/%Y %H:%M:%S", "%Y/%m/%d %H:%M:%S", "%m/%d/%Y %H:%M")
+
+def read_responses(path):
+    """Yield raw responses from a sheet .csv export or a .jsonl file."""
+    path = Path(path)
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.suffix.lower() == ".csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def discipline_for(text):
+    """Canonical discipline named in a header or answer, or None."""
+    text = str(text).lower()
+    for needle, discipline in DISCIPLINE_RULES:
+        if needle in text:
+            return discipline
+    return None
+
+def weight_band(label):
+    """Form weight answer -> /recommend band key: "75-85 kg / 165-187 lbs" -> "75-85kg"."""
+    if not label:
+        return None
+    nums = WEIGHT_NUM_RE.findall(label)
+    if not nums:
+        return None
+    lowered = label.lower()
+    if "under" in lowered or label.lstrip().startswith("<"):
+        return f"<{nums[0]}kg"
+    if "over" in lowered or label.lstrip().startswith(">"):
+        return f">{nums[0]}kg"
+    return f"{nums[0]}-{nums[1]}kg" if len(nums) > 1 else f"{nums[0]}kg"
+
+def _clean(value):
+    if value is None:
+        return None
+    text = ' '.join(str(value).split())
+    return text or None
+
+def _iso_time(value):
+    """Submit time as ISO 8601 so responses sort by it; unparseable values kept as-is."""
+    value = str(value).strip()
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).isoformat()
+    except ValueError:
+        pass
+    for fmt in TIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).isoformat()
+        except ValueError:
+            continue
+    return value
+
+def _response_id(raw, submitted_at):
+    for key in ID_COLUMNS:
+        if raw.get(key):
+            return str(raw[key])
+    # Sheet exports carry no response id; the submit timestamp is unique per response
+    seed = submitted_at or repr(sorted(raw.items()))
+    return "resp_" + hashlib.blake2b(seed.encode(), digest_size=8).hexdigest()
+
+def _structured(raw):
+    """Already-structured record: {"disciplines": {name: {front_wing, ...}} or [names]}."""
+    setups = {}
+    disciplines = raw.get("disciplines") or raw.get("setups") or {}
+    if isinstance(disciplines, list):
+        disciplines = {d: {} for d in disciplines}
+    for name, setup in disciplines.items():
+        discipline = discipline_for(name)
+        if discipline:
+            setups[discipline] = {c: _clean((setup or {}).get(c)) for c in COMPONENT_COLUMNS}
+    return {f: _clean(raw.get(f)) for f in DEMOGRAPHIC_COLUMNS}, setups
+
+@lru_cache(maxsize=64)
+def column_plan(headers):
+    """Classify a sheet's columns once: [(header, kind, discipline, field)].
+
+    kind is "setup" (field = component), "disciplines" (the multi-select)
+    or "demographic" (field = demographic); other columns are left out.
+    """
+    plan, claimed = [], set()
+    for header in headers:
+        component = next((c for c, rx in COMPONENT_COLUMNS.items() if rx.search(header)), None)
+        if component:
+            # "Kite Foiling - Front wing": the component's own "wing" must not pick Wing Foiling
+            discipline = discipline_for(COMPONENT_COLUMNS[component].sub('', header))
+            if discipline:
+                plan.append((header, "setup", discipline, component))
+            continue
+        if DISCIPLINES_COLUMN.search(header):
+            plan.append((header, "disciplines", None, None))
+            continue
+        field = next((f for f, rx in DEMOGRAPHIC_COLUMNS.items() if rx.search(header)), None)
+        if field and field not in claimed:
+            claimed.add(field)
+            plan.append((header, "demographic", None, field))
+    return plan
+
+def _flat(raw):
+    """Sheet row: one column per question, setup questions named after their discipline."""
+    demographics, setups = {}, {}
+    for header, kind, discipline, field in column_plan(tuple(raw)):
+        value = _clean(raw[header])
+        if not value:
+            continue
+        if kind == "setup":
+            setups.setdefault(discipline, {})[field] = value
+        elif kind == "disciplines":
+            for answer in re.split(r',\s+|;\s*', value):
+                selected = discipline_for(answer)
+                if selected:
+                    setups.setdefault(selected, {})
+        else:
+            demographics[field] = value
+    return demographics, setups
+
+def normalize_response(raw):
+    """One raw response (sheet row or structured record) -> normalized row."""
+    raw = {str(k).strip(): v for k, v in raw.items() if k is not None}
+    lowered = {k.lower(): v for k, v in raw.items()}
+    submitted_at = next((_iso_time(lowered[k]) for k in TIME_COLUMNS if lowered.get(k)), None)
+    if isinstance(raw.get("disciplines") or raw.get("setups"), (dict, list)):
+        demographics, setups = _structured(raw)
+    else:
+        demographics, setups = _flat(raw)
+    row = {
+        "id": _response_id(lowered, submitted_at),
+        "submitted_at": submitted_at,
+        **{f: demographics.get(f) for f in DEMOGRAPHIC_COLUMNS},
+        "setups": {d: {c: setup.get(c) for c in COMPONENT_COLUMNS}
+                   for d, setup in sorted(setups.items())},
+    }
+    row["hash"] = hashlib.blake2b(repr(sorted((k, v) for k, v in row.items() if k != "setups")
+                                       + sorted(row["setups"].items())).encode(),
+                                  digest_size=8).hexdigest()
+    return row
+
+def _bump(counter, key, delta):
+    counter[key] = counter.get(key, 0) + delta
+    if counter[key] <= 0:
+        del counter[key]
+
+def _top(counter, key="wing", limit=None):
+    items = sorted(counter.items(), key=lambda kv: -kv[1])
+    return [{key: k, "count": v} for k, v in items[:limit]]
+
+class SurveyAggregates:
+    """Materialized survey counters, updated response by response.
+
+    counts maps a group-by key tuple to a counter, e.g.
+    ("demographics", "weight") -> {band: n},
+    ("discipline", d, "front_wing") -> {answer: n},
+    ("by_weight", d, band) -> {front wing: n}.
+    """
+
+    def __init__(self, state=None):
+        state = state or {}
+        self.responses = state.get("responses", 0)
+        self.counts = {tuple(k.split("\x1f")): dict(v) for k, v in state.get("counts", {}).items()}
+
+    def _counter(self, *key):
+        return self.counts.setdefault(key, {})
+
+    def _apply(self, row, sign):
+        self.responses += sign
+        for field in DEMOGRAPHICS:
+            if row.get(field):
+                _bump(self._counter("demographics", field), row[field], sign)
+        if row.get("submitted_at"):
+            _bump(self._counter("submitted"), row["submitted_at"], sign)
+        band = weight_band(row.get("weight"))
+        for discipline, setup in row["setups"].items():
+            _bump(self._counter("setups"), discipline, sign)
+            if row.get("gender"):
+                _bump(self._counter("gender_by_discipline", discipline), row["gender"], sign)
+            if band:
+                _bump(self._counter("weight_by_discipline", discipline), band, sign)
+            for component, answer in setup.items():
+                if answer:
+                    _bump(self._counter("discipline", discipline, component), answer, sign)
+            if band and setup.get("front_wing"):
+                _bump(self._counter("by_weight", discipline, band), setup["front_wing"], sign)
+        for key in [k for k, c in self.counts.items() if not c]:
+            del self.counts[key]
+
+    def upsert(self, table, row):
+        """Insert or replace a response in table (id -> row); returns "added", "updated" or None."""
+        old = table.get(row["id"])
+        if old is not None and old.get("hash") == row["hash"]:
+            return None
+        if old is not None:
+            self._apply(old, -1)
+        table[row["id"]] = row
+        self._apply(row, +1)
+        return "updated" if old is not None else "added"
+
+    def remove(self, table, response_id):
+        old = table.pop(response_id, None)
+        if old is not None:
+            self._apply(old, -1)
+        return old is not None
+
+    def to_state(self):
+        return {"responses": self.responses,
+                "counts": {"\x1f".join(k): c for k, c in sorted(self.counts.items())}}
+
+    def community_stats(self, meta=None):
+        """The community-stats.json document (/recommend)."""
+        get = lambda *key: self.counts.get(key, {})
+        submitted = sorted(get("submitted"))
+        disciplines = {}
+        for discipline in DISCIPLINES:
+            total = get("setups").get(discipline)
+            if not total:
+                continue
+            entry = {"total_setups": total}
+            for component, name in COMPONENT_LISTS.items():
+                entry[name] = _top(get("discipline", discipline, component))
+            entry["by_weight"] = {
+                band: {"count": count, "top_wings": _top(get("by_weight", discipline, band), limit=10)}
+                for band, count in sorted(get("weight_by_discipline", discipline).items())
+            }
+            entry["gender"] = dict(sorted(get("gender_by_discipline", discipline).items(),
+                                          key=lambda kv: -kv[1]))
+            disciplines[discipline] = entry
+        return {
+            "meta": {
+                "total_responses": self.responses,
+                "respondents": self.responses,
+                "date": submitted[-1][:10] if submitted else None,
+                "first_response": submitted[0] if submitted else None,
+                "last_response": submitted[-1] if submitted else None,
+                **(meta or {}),
+            },
+            "demographics": {field: get("demographics", field) for field in DEMOGRAPHICS},
+            "disciplines": disciplines,
+        }
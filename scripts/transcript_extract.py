@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Chunked, cached LLM extraction of foil feedback from cleaned YouTube transcripts.
+
+Each transcript in data-sources/youtube-transcripts/cleaned/ is split into
+chunks of CHUNK_MIN_TOKENS..CHUNK_MAX_TOKENS (estimated as chars/4, like the
+chat context packs). Boundaries are content-defined: a chunk may only end
+after a line whose hash hits BOUNDARY_MASK. An edit to a transcript therefore
+changes the chunks around it and leaves the rest byte-identical.
+
+Responses are cached in data/extraction-cache/ under
+hash(prompt version, chunk hash). The prompt version is the hash of the
+prompt template in data-sources/EXTRACTION-PROMPT.md plus the model, so
+tweaking the prompt re-calls every chunk and nothing else does.
+
+Chunks are sent concurrently, at most `concurrency` at a time, to a
+pluggable completion client (CLIENTS). Entries are validated against the
+youtube-feedback.json schema, stamped with the chunk's video timestamp
+(the cleaned transcript's .times.json), and merged by id.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import re
+import time
+import urllib.error
+import urllib.request
+from collections import namedtuple
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+PROMPT_FILE = ROOT / "data-sources" / "EXTRACTION-PROMPT.md"
+TRANSCRIPTS_DIR = ROOT / "data-sources" / "youtube-transcripts" / "cleaned"
+CACHE_DIR = ROOT / "data" / "extraction-cache"
+
+DEFAULT_MODEL = "claude-sonnet-4-20250514"
+CHUNK_MIN_TOKENS = 1500
+CHUNK_MAX_TOKENS = 3000
+# A line can end a chunk when the low bits of its hash are zero (1 in 8 lines)
+BOUNDARY_MASK = 0x7
+MAX_RETRIES = 3
+
+REQUIRED_FIELDS = ("id", "text", "foils_mentioned", "sentiment")
+SENTIMENTS = {"positive", "neutral", "negative", "mixed"}
+USE_CASES = {"downwind", "winging", "prone", "pumping", "kite", "tow", "allround"}
+AUTHORITIES = {"designer", "experienced", "community"}
+VIDEO_ID_RE = re.compile(r'\[([\w-]{11})\]$|^([\w-]{11})$')
+
+Chunk = namedtuple('Chunk', 'index text hash first_word')
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / 4)
+
+def load_prompt(path=PROMPT_FILE) -> str:
+    """The prompt template: the first fenced block under '## Prompt'."""
+    text = Path(path).read_text()
+    m = re.search(r'## Prompt\s*```\w*\n(.*?)```', text, re.S)
+    if not m:
+        raise ValueError(f"no prompt block in {path}")
+    return m.group(1).strip()
+
+def prompt_version(template: str, model: str) -> str:
+    return hashlib.blake2b(f"{model}\n{template}".encode(), digest_size=6).hexdigest()
+
+def _line_hash(line: str) -> int:
+    return int.from_bytes(hashlib.blake2b(line.encode(), digest_size=4).digest(), 'big')
+
+def chunk_transcript(text, min_tokens=CHUNK_MIN_TOKENS, max_tokens=CHUNK_MAX_TOKENS):
+    """Content-defined chunks of whole lines; returns [Chunk]."""
+    chunks, lines = [], []
+    tokens = words = first_word = 0
+
+    def close():
+        body = "\n".join(lines)
+        chunks.append(Chunk(len(chunks), body,
+                            hashlib.blake2b(body.encode(), digest_size=12).hexdigest(), first_word))
+
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        lines.append(line)
+        tokens += estimate_tokens(line) + 1
+        words += len(line.split())
+        if tokens >= max_tokens or (tokens >= min_tokens and not _line_hash(line) & BOUNDARY_MASK):
+            close()
+            lines, tokens, first_word = [], 0, words
+    if lines:
+        close()
+    return chunks
+
+def load_transcripts(names=None, directory=TRANSCRIPTS_DIR):
+    """([(name, text)], [(skipped name, same as name)]); identical transcripts are kept once."""
+    paths = ([Path(directory) / f"{n}.txt" for n in names] if names
+             else sorted(Path(directory).glob("*.txt")))
+    seen = {}
+    out, duplicates = [], []
+    for path in paths:
+        text = path.read_text()
+        digest = hashlib.blake2b(text.encode(), digest_size=12).hexdigest()
+        if digest in seen:
+            duplicates.append((path.stem, seen[digest]))
+            continue
+        seen[digest] = path.stem
+        out.append((path.stem, text))
+    return out, duplicates
+
+def load_times(name):
+    path = TRANSCRIPTS_DIR / f"{name}.times.json"
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def time_at_word(times, index):
+    if not times or not times["times"]:
+        return None
+    return times["times"][min(index // times["step"], len(times["times"]) - 1)]
+
+def video_for(name, videos):
+    """youtube-feedback.json meta.videos entry for a transcript name."""
+    m = VIDEO_ID_RE.search(name)
+    video_id = m and (m.group(1) or m.group(2))
+    if video_id:
+        for video in videos:
+            if video_id in (video.get("url") or ""):
+                return video
+        return {"title": re.sub(r'\s*\[[\w-]{11}\]$', '', name),
+                "url": f"https://www.youtube.com/watch?v={video_id}"}
+    m = re.match(r'^(\d{2})-', name)
+    if m and 0 < int(m.group(1)) <= len(videos):
+        return videos[int(m.group(1)) - 1]
+    return {"title": name, "url": None}
+
+def build_prompt(template, video, chunk, n_chunks, start_s):
+    header = (template.replace("[TITLE]", video.get("title") or "Unknown")
+              .replace("[DATE]", video.get("date") or "unknown date")
+              .replace("[REVIEWER]", video.get("reviewer") or "Unknown Reviewer")
+              .replace("[URL]", video.get("url") or "unknown URL"))
+    at = f", starts at {int(start_s // 60)}:{int(start_s % 60):02d}" if start_s is not None else ""
+    return (f"{header}\n\nTranscript (part {chunk.index + 1} of {n_chunks}{at}):\n\n{chunk.text}\n\n"
+            "Respond with a JSON array of entries only ([] if no specific foil is discussed).")
+
+class ResponseCache:
+    def __init__(self, root=CACHE_DIR):
+        self.root = Path(root)
+
+    def _path(self, key):
+        return self.root / key[:2] / f"{key}.json"
+
+    @staticmethod
+    def key(version, chunk_hash):
+        return hashlib.blake2b(f"{version}:{chunk_hash}".encode(), digest_size=16).hexdigest()
+
+    def get(self, key):
+        path = self._path(key)
+        if path.exists():
+            with open(path) as f:
+                return json.load(f)["response"]
+        return None
+
+    def put(self, key, response, meta=None):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({"response": response, **(meta or {})}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+class _HTTPClient:
+    path = ""
+
+    def __init__(self, base_url, model=DEFAULT_MODEL, api_key=None, max_tokens=4096, timeout=120):
+        self.url = base_url.rstrip("/") + self.path
+        self.model = model
+        self.api_key = api_key
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+
+    def _post(self, payload, headers):
+        request = urllib.request.Request(self.url, data=json.dumps(payload).encode(),
+                                         headers={"content-type": "application/json", **headers})
+        for attempt in range(MAX_RETRIES):
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return json.load(response)
+            except urllib.error.HTTPError as e:
+                if e.code not in (429, 500, 502, 503, 529) or attempt == MAX_RETRIES - 1:
+                    raise
+            except urllib.error.URLError:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+            time.sleep(2 ** attempt)
+
+class AnthropicClient(_HTTPClient):
+    """Messages API (the provider app/api/chat/route.ts uses)."""
+    path = "/v1/messages"
+
+    def complete(self, prompt):
+        data = self._post({"model": self.model, "max_tokens": self.max_tokens,
+                           "messages": [{"role": "user", "content": prompt}]},
+                          {"x-api-key": self.api_key or "", "anthropic-version": "2023-06-01"})
+        return "".join(block.get("text", "") for block in data.get("content", []))
+
+class OpenAIClient(_HTTPClient):
+    """OpenAI-compatible chat completions (most local model servers)."""
+    path = "/v1/chat/completions"
+
+    def complete(self, prompt):
+        data = self._post({"model": self.model, "max_tokens": self.max_tokens,
+                           "messages": [{"role": "user", "content": prompt}]},
+                          {"authorization": f"Bearer {self.api_key or ''}"})
+        return data["choices"][0]["message"]["content"]
+
+CLIENTS = {"anthropic": AnthropicClient, "openai": OpenAIClient}
+
+def parse_entries(response):
+    """The JSON array in a completion, tolerating code fences and surrounding prose."""
+    text = re.sub(r'```(?:json)?', '', response)
+    start, end = text.find('['), text.rfind(']')
+    if start < 0 or end <= start:
+        return []
+    data = json.loads(text[start:end + 1])
+    return data if isinstance(data, list) else []
+
+def validate_entry(entry):
+    """Normalized entry, or None if it doesn't fit the youtube-feedback.json schema."""
+    if not isinstance(entry, dict) or any(not entry.get(k) for k in REQUIRED_FIELDS):
+        return None
+    if not isinstance(entry["foils_mentioned"], list):
+        return None
+    entry = dict(entry)
+    entry["sentiment"] = str(entry["sentiment"]).lower()
+    if entry["sentiment"] not in SENTIMENTS:
+        return None
+    if entry.get("use_case") not in USE_CASES:
+        entry.pop("use_case", None)
+    if entry.get("rider_authority") not in AUTHORITIES:
+        entry["rider_authority"] = "community"
+    entry["id"] = re.sub(r'[^a-z0-9_]+', '_', str(entry["id"]).lower()).strip('_')
+    return entry
+
+def merge_entries(entries):
+    """One entry per id: the longest text wins, foils are unioned, the earliest timestamp kept."""
+    merged = {}
+    for entry in entries:
+        have = merged.get(entry["id"])
+        if have is None:
+            merged[entry["id"]] = entry
+            continue
+        best = dict(entry if len(entry["text"]) > len(have["text"]) else have)
+        best["foils_mentioned"] = list(dict.fromkeys(have["foils_mentioned"] + entry["foils_mentioned"]))
+        stamps = [t for t in (have.get("source_timestamp_s"), entry.get("source_timestamp_s")) if t is not None]
+        if stamps:
+            best["source_timestamp_s"] = min(stamps)
+        merged[entry["id"]] = best
+    return list(merged.values())
+
+async def extract_transcript(name, text, video, client, cache, version, template,
+                             semaphore, stats):
+    """Entries for one transcript; cached chunks are not sent."""
+    chunks = chunk_transcript(text)
+    times = load_times(name)
+
+    async def run(chunk):
+        key = ResponseCache.key(version, chunk.hash)
+        response = cache.get(key)
+        start_s = time_at_word(times, chunk.first_word)
+        if response is None:
+            prompt = build_prompt(template, video, chunk, len(chunks), start_s)
+            async with semaphore:
+                stats["calls"] += 1
+                response = await asyncio.to_thread(client.complete, prompt)
+            cache.put(key, response, {"transcript": name, "chunk": chunk.index, "version": version})
+        else:
+            stats["cache_hits"] += 1
+        try:
+            raw = parse_entries(response)
+        except ValueError:
+            stats["unparseable"] += 1
+            return []
+        entries = []
+        for entry in raw:
+            entry = validate_entry(entry)
+            if entry is None:
+                stats["invalid"] += 1
+                continue
+            entry.setdefault("source", "youtube")
+            entry.setdefault("source_label", video.get("title"))
+            entry.setdefault("source_url", video.get("url"))
+            if video.get("date"):
+                entry.setdefault("date", video["date"])
+            if start_s is not None:
+                entry["source_timestamp_s"] = int(start_s)
+            entries.append(entry)
+        return entries
+
+    stats["chunks"] += len(chunks)
+    results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+    return merge_entries([e for chunk_entries in results for e in chunk_entries])
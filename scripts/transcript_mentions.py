@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Foil × video × timestamp index over the cleaned YouTube transcripts.
+
+Every transcript is scanned once with the catalog extractor. Each mention
+becomes a hit (foil, video, seconds, snippet); repeat mentions of a foil
+within MERGE_WINDOW_S of a kept hit are folded into it. The serialized index
+(public/data/transcript-mentions.json) stores the hits as parallel columns
+sorted by (foil, video, seconds), with `foils` the sorted distinct foil ids
+and `offsets` where each foil's run starts. A lookup is a binary search
+over `foils` and, for one video, a second one inside the foil's run.
+
+    from transcript_mentions import MentionIndex
+    index = MentionIndex.load()
+    for hit in index.lookup("Fireball 1500"):
+        print(hit["t"], hit["title"], hit["snippet"])
+"""
+
+import json
+import re
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+
+from foil_catalog import get_catalog
+from transcript_extract import (TRANSCRIPTS_DIR, load_times, load_transcripts, time_at_word,
+                                video_for)
+
+PUBLIC_DIR = Path(__file__).parent.parent / "public" / "data"
+INDEX_FILE = PUBLIC_DIR / "transcript-mentions.json"
+FEEDBACK_FILE = PUBLIC_DIR / "youtube-feedback.json"
+INDEX_VERSION = 1
+MERGE_WINDOW_S = 30
+SNIPPET_CHARS = 220
+
+AREA_RE = re.compile(r'(\d{3,4})\D*$')
+
+def _mention_offset(text, fid, start=0):
+    """Char offset of the foil's size in text, at or after start."""
+    m = AREA_RE.search(fid)
+    pos = text.find(m.group(1), start) if m else -1
+    return pos if pos >= 0 else start
+
+def _snippet(text, offset, width=SNIPPET_CHARS):
+    lo = max(0, offset - width // 2)
+    hi = min(len(text), offset + width // 2)
+    if lo > 0:
+        lo = text.find(' ', lo) + 1 or lo
+    if hi < len(text) and text.rfind(' ', offset, hi) > offset:
+        hi = text.rfind(' ', offset, hi)
+    body = ' '.join(text[lo:hi].split())
+    return ('…' if lo > 0 else '') + body + ('…' if hi < len(text) else '')
+
+def scan_transcript(text, catalog=None):
+    """[(foil id, char offset)] for every mention, line by line.
+
+    The cleaned transcripts are wrapped at ~100 chars, so a mention can
+    straddle two lines; ids found only in a line joined with the next are
+    placed at their size in the next line.
+    """
+    catalog = catalog or get_catalog()
+    lines = text.split('\n')
+    starts = []
+    pos = 0
+    for line in lines:
+        starts.append(pos)
+        pos += len(line) + 1
+    ids = [catalog.extract(line) for line in lines]
+    mentions = []
+    for i, line in enumerate(lines):
+        cursor = 0
+        for fid in ids[i]:
+            cursor = _mention_offset(line, fid, cursor)
+            mentions.append((fid, starts[i] + cursor))
+        if i + 1 < len(lines):
+            joined = line + '\n' + lines[i + 1]
+            for fid in catalog.extract(joined):
+                if fid not in ids[i] and fid not in ids[i + 1]:
+                    mentions.append((fid, starts[i + 1] + _mention_offset(lines[i + 1], fid)))
+    return sorted(mentions, key=lambda m: m[1])
+
+def _word_index(text, offsets):
+    """Index of the word at each char offset."""
+    starts = [m.start() for m in re.finditer(r'\S+', text)]
+    return [max(bisect_right(starts, offset) - 1, 0) for offset in offsets]
+
+def build_index(transcripts_dir=TRANSCRIPTS_DIR, feedback_file=FEEDBACK_FILE):
+    catalog = get_catalog()
+    with open(feedback_file) as f:
+        known_videos = json.load(f)["meta"].get("videos", [])
+    transcripts, duplicates = load_transcripts(directory=transcripts_dir)
+
+    videos, rows = [], []
+    for name, text in transcripts:
+        video = video_for(name, known_videos)
+        times = load_times(name)
+        mentions = scan_transcript(text, catalog)
+        word_at = _word_index(text, [offset for _, offset in mentions])
+        kept = {}
+        for (fid, offset), word in zip(mentions, word_at):
+            t = time_at_word(times, word)
+            t = int(t) if t is not None else None
+            last = kept.get(fid)
+            if last is not None and t is not None and t - last < MERGE_WINDOW_S:
+                continue
+            kept[fid] = t if t is not None else last
+            rows.append((fid, len(videos), t, _snippet(text, offset)))
+        videos.append({"name": name, "title": video.get("title"), "url": video.get("url")})
+
+    rows.sort(key=lambda r: (r[0], r[1], r[2] if r[2] is not None else -1))
+    foils, offsets = [], []
+    for i, row in enumerate(rows):
+        if not foils or foils[-1] != row[0]:
+            foils.append(row[0])
+            offsets.append(i)
+    offsets.append(len(rows))
+
+    return {
+        "meta": {
+            "version": INDEX_VERSION,
+            "built_at": datetime.now().isoformat(),
+            "transcripts": len(transcripts),
+            "duplicates_skipped": [name for name, _ in duplicates],
+            "hit_count": len(rows),
+            "merge_window_s": MERGE_WINDOW_S,
+            "layout": "hits sorted by (foil, video, t); foils[i] owns hits[offsets[i]:offsets[i+1]]",
+        },
+        "videos": videos,
+        "foils": foils,
+        "offsets": offsets,
+        "hits": {
+            "video": [r[1] for r in rows],
+            "t": [r[2] for r in rows],
+            "snippet": [r[3] for r in rows],
+        },
+        # Shopify product id -> foil id, so /compare can look up by product
+        "products": {str(w["product_id"]): fid for fid, w in catalog.wings.items()
+                     if w.get("product_id") is not None and fid in foils},
+    }
+
+def video_link(url, t):
+    if not url or t is None:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}t={t}s"
+
+class MentionIndex:
+    def __init__(self, data):
+        self.meta = data["meta"]
+        self.videos = data["videos"]
+        self.foils = data["foils"]
+        self.offsets = data["offsets"]
+        self.hit_video = data["hits"]["video"]
+        self.hit_t = data["hits"]["t"]
+        self.hit_snippet = data["hits"]["snippet"]
+        self.products = data.get("products", {})
+
+    @classmethod
+    def load(cls, path=INDEX_FILE):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def _run(self, fid):
+        i = bisect_left(self.foils, fid)
+        if i == len(self.foils) or self.foils[i] != fid:
+            return 0, 0
+        return self.offsets[i], self.offsets[i + 1]
+
+    def lookup(self, foil, video=None, limit=None):
+        """Hits for a foil id or free-text mention ("FB1500"), optionally in one video (index or name)."""
+        lo, hi = self._run(foil)
+        fid = foil
+        if lo == hi:
+            fid = get_catalog().resolve(foil)
+            lo, hi = self._run(fid) if fid else (0, 0)
+        if video is not None:
+            if not isinstance(video, int):
+                video = next((i for i, v in enumerate(self.videos) if v["name"] == video), -1)
+            lo, hi = (bisect_left(self.hit_video, video, lo, hi),
+                      bisect_right(self.hit_video, video, lo, hi))
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        hits = []
+        for i in range(lo, hi):
+            v = self.videos[self.hit_video[i]]
+            t = self.hit_t[i]
+            hits.append({"foil": fid, "video": v["name"], "title": v["title"],
+                         "t": t, "url": video_link(v["url"], t), "snippet": self.hit_snippet[i]})
+        return hits
+
+    def counts(self):
+        """{foil id: hit count}."""
+        return {fid: self.offsets[i + 1] - self.offsets[i] for i, fid in enumerate(self.foils)}
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Maintain community-setups.json as a normalized setup table plus
+materialized aggregations, and apply scan deltas incrementally.
+
+Usage:
+  python3 scripts/update-community-setups.py                     # migrate legacy layout / rewrite summary
+  python3 scripts/update-community-setups.py --delta new-setups.json [--delta ...]
+
+A delta file is either a list of setup records (any of the legacy shapes)
+or {"scan": {...}, "setups": [...]}. Only the delta rows touch the
+aggregations; nothing is recounted.
+
+Outputs:
+  public/data/community-setups.json          setups table + aggregations
+  public/data/community-setups-summary.json  fixed-size top-N view for /insights
+"""
+
+import argparse
+import json
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+
+from setup_aggregates import SetupAggregates, normalize_record
+
+PUBLIC_DIR = Path(__file__).parent.parent / "public" / "data"
+SETUPS_FILE = PUBLIC_DIR / "community-setups.json"
+SUMMARY_FILE = PUBLIC_DIR / "community-setups-summary.json"
+SCHEMA_VERSION = 2
+
+# Survey-level fields kept from the legacy metadata blocks
+SURVEY_META_KEYS = ("generated", "totalResponses", "formId", "reportWeek")
+
+def _key_date(key):
+    m = re.search(r'(\d{4})_(\d{2})_(\d{2})', key)
+    return f"{m.group(1)}-{m.group(2)}-{m.group(3)}" if m else None
+
+def migrate(legacy):
+    """Convert the legacy ad-hoc layout (riders/setups/new_setups_* blocks)."""
+    table = {}
+    aggs = SetupAggregates()
+    for key, value in legacy.items():
+        if key == "aggregations" or not isinstance(value, list):
+            continue
+        for record in value:
+            if isinstance(record, dict):
+                for row in normalize_record(record, default_date=_key_date(key)):
+                    aggs.upsert(table, row)
+
+    # metadata and meta were written by different scans; latest scan wins
+    blocks = [b for b in (legacy.get("metadata"), legacy.get("meta")) if isinstance(b, dict)]
+    scans = [b["latest_scan"] for b in blocks if isinstance(b.get("latest_scan"), dict)]
+    latest = max(scans, key=lambda s: s.get("timestamp", ""), default=None)
+    survey = {k: blocks[0][k] for k in SURVEY_META_KEYS if blocks and k in blocks[0]}
+
+    return {
+        "meta": {
+            "schema_version": SCHEMA_VERSION,
+            "last_updated": latest.get("timestamp") if latest else None,
+            "survey": survey,
+            "latest_scan": latest,
+            "scans_applied": [s["archive"] for s in sorted(scans, key=lambda s: s.get("timestamp", ""))
+                              if s.get("archive")],
+        },
+        "setups": list(table.values()),
+        "survey_aggregations": legacy.get("aggregations", {}),
+        "aggregations": aggs.to_state(),
+    }
+
+def apply_delta(doc, delta):
+    table = {row["id"]: row for row in doc["setups"]}
+    aggs = SetupAggregates(doc["aggregations"])
+    records = delta if isinstance(delta, list) else delta.get("setups", [])
+    scan = delta.get("scan") if isinstance(delta, dict) else None
+    default_date = (scan or {}).get("timestamp", "")[:10] or None
+    added = updated = 0
+    for record in records:
+        for row in normalize_record(record, default_source=(scan or {}).get("archive"),
+                                    default_date=default_date):
+            if aggs.upsert(table, row):
+                added += 1
+            else:
+                updated += 1
+    doc["setups"] = list(table.values())
+    doc["aggregations"] = aggs.to_state()
+    if scan:
+        scan = dict(scan, new_setups_added=added)
+        doc["meta"]["latest_scan"] = scan
+        # Re-applying a delta is idempotent, including the scan log
+        if scan.get("archive") and scan["archive"] not in doc["meta"]["scans_applied"]:
+            doc["meta"]["scans_applied"].append(scan["archive"])
+    doc["meta"]["last_updated"] = (scan or {}).get("timestamp") or \
+        datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    return added, updated
+
+def write_summary(doc):
+    aggs = SetupAggregates(doc["aggregations"])
+    summary = {
+        "meta": {
+            "last_updated": doc["meta"]["last_updated"],
+            "latest_scan": doc["meta"].get("latest_scan"),
+        },
+        **aggs.summary(),
+    }
+    with open(SUMMARY_FILE, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize community setups and apply scan deltas")
+    parser.add_argument("--delta", action="append", default=[], help="JSON file of new setup records")
+    args = parser.parse_args()
+
+    with open(SETUPS_FILE) as f:
+        doc = json.load(f)
+
+    if doc.get("meta", {}).get("schema_version") != SCHEMA_VERSION:
+        doc = migrate(doc)
+        print(f"✅ Migrated legacy layout: {len(doc['setups'])} setup rows")
+
+    for path in args.delta:
+        with open(path) as f:
+            delta = json.load(f)
+        added, updated = apply_delta(doc, delta)
+        print(f"✅ Delta {Path(path).name}: {added} new, {updated} updated setups")
+
+    with open(SETUPS_FILE, 'w') as f:
+        json.dump(doc, f, indent=2)
+    write_summary(doc)
+
+    aggs = doc["aggregations"]
+    print(f"\n📊 {aggs['setup_count']} setups from {aggs['rider_count']} riders")
+    top = list(aggs["front_wings"].items())[:5]
+    print(f"  - Top front wings: {', '.join(f'{k} ({v})' for k, v in top)}")
+    print(f"💾 Saved to {SETUPS_FILE} and {SUMMARY_FILE}")
+
+if __name__ == "__main__":
+    main()